@@ -2,10 +2,11 @@
 Main window for PyPulse application.
 """
 
+import time
 from pathlib import Path
 from typing import Any
 
-from PySide6.QtCore import QSettings, QSize, Qt, Signal, Slot
+from PySide6.QtCore import QSettings, QSize, Qt, QTimer, Signal, Slot
 from PySide6.QtGui import QAction, QIcon
 from PySide6.QtWidgets import (
     QApplication,
@@ -21,7 +22,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from .processing.processor import ProcessingThread
+from .processing.processor import LiveMonitor, ProcessingThread, sifast_arguments
 from .utils.icons import IconManager
 from .widgets.log_dock import LogDock
 from .widgets.parameter_panel import ParameterPanel
@@ -34,13 +35,25 @@ class PyPulseMainWindow(QMainWindow):
     # Signals
     pulseProcessed = Signal(object)
 
+    # Quiet time after the last parameter edit before reprocessing (ms)
+    REPROCESS_DELAY = 300
+
     def __init__(self):
         super().__init__()
         self.settings = QSettings("PyPulse", "MainWindow")
         self.pulse = None
         self.processing_thread = None
+        self._cancelled_threads = []  # Kept alive until they return
+        self.live_monitor = None
+        self._last_live_display = 0.0
         self.icon_manager = IconManager()
 
+        # Parameter edits are coalesced into one reprocessing
+        self.reprocess_timer = QTimer(self)
+        self.reprocess_timer.setSingleShot(True)
+        self.reprocess_timer.setInterval(self.REPROCESS_DELAY)
+        self.reprocess_timer.timeout.connect(self.reprocess)
+
         self.init_ui()
         self.setup_connections()
         self.load_settings()
@@ -199,6 +212,7 @@ class PyPulseMainWindow(QMainWindow):
         # Visualization actions
         self.visualization_panel.exportRequested.connect(self.export_plots)
         self.visualization_panel.saveRequested.connect(self.save_results)
+        self.visualization_panel.status.connect(self.log_dock.log)
 
         # Processing signals
         self.pulseProcessed.connect(self.on_pulse_processed)
@@ -242,6 +256,9 @@ class PyPulseMainWindow(QMainWindow):
 
     def on_processing_finished(self, pulse):
         """Handle processing completion."""
+        # Results of a superseded reprocessing are dropped
+        if self.sender() is not self.processing_thread:
+            return
         self.set_ui_enabled(True)
 
         if pulse is not None:
@@ -259,13 +276,51 @@ class PyPulseMainWindow(QMainWindow):
         self.visualization_panel.set_pulse(pulse)
 
     def acquire_data(self):
-        """Acquire data from spectrometer."""
+        """Acquire data and process it live."""
+        # A second click stops the running acquisition
+        if self.live_monitor is not None and self.live_monitor.running:
+            self.live_monitor.stop()
+            self.acquire_action.setText("Acquire")
+            return
+
         self.log_dock.log("Starting data acquisition...", "INFO")
-        # TODO: Implement spectrometer SDK integration
-        QMessageBox.information(self, "Acquisition", "Spectrometer SDK integration pending.")
+        # TODO: Implement spectrometer SDK integration, recorded measurements are replayed meanwhile
+        folder = QFileDialog.getExistingDirectory(self, "Select Measurement Folder to Replay", str(Path.cwd() / "data"))
+        if not folder:
+            return
+
+        try:
+            self.live_monitor = LiveMonitor(self.parameter_panel.get_all_parameters(), [folder])
+        except Exception as e:
+            self.log_dock.log(f"Error: {str(e)}", "ERROR")
+            return
+
+        self.live_monitor.result.connect(self.on_live_result)
+        self.live_monitor.status.connect(self.log_dock.log)
+        self.live_monitor.start()
+        self.acquire_action.setText("Stop")
+
         # After acquisition, enable save
         self.save_data_action.setEnabled(True)
 
+    @Slot(object)
+    def on_live_result(self, result):
+        """Show the latest live result."""
+        stats = self.live_monitor.pipeline.stats
+        self.status_bar.showMessage(
+            f"Live: {stats.fps:.1f} fps, latency {result.latency_ms:.0f} ms, {stats.frames_dropped} dropped"
+        )
+        if result.error is not None:
+            self.log_dock.log(f"Frame {result.index} failed: {result.error}", "WARNING")
+            return
+
+        # Redraw at most twice per second, the plots are slower than the camera
+        now = time.monotonic()
+        if now - self._last_live_display >= 0.5:
+            self._last_live_display = now
+            self.pulse = result.pulse
+            self.pulseProcessed.emit(result.pulse)
+
     def save_data(self):
         """Save acquired data."""
         folder = QFileDialog.getExistingDirectory(self, "Select Save Directory", str(Path.cwd() / "data"))
@@ -317,7 +372,32 @@ class PyPulseMainWindow(QMainWindow):
 
         if folder:
             self.log_dock.log(f"Processing scan data from: {folder}", "INFO")
-            # TODO: Implement scan data processing with merge_spatial_scans
+            self.process_scan_measurement(folder)
+
+    def process_scan_measurement(self, folder_path: str):
+        """Process and merge all positions of a scan folder."""
+        try:
+            # Get parameters
+            params = self.parameter_panel.get_all_parameters()
+            params["folder_path"] = folder_path
+
+            # Disable UI during processing
+            self.set_ui_enabled(False)
+            self.status_bar.showMessage("Processing scan...")
+
+            # Create and start processing thread
+            self.processing_thread = ProcessingThread(params, mode="scan")
+            self.processing_thread.progress.connect(
+                lambda value: self.status_bar.showMessage(f"Processing scan... {value}%")
+            )
+            self.processing_thread.status.connect(self.log_dock.log)
+            self.processing_thread.error.connect(lambda e: self.log_dock.log(e, "ERROR"))
+            self.processing_thread.finished.connect(self.on_processing_finished)
+            self.processing_thread.start()
+
+        except Exception as e:
+            self.log_dock.log(f"Error: {str(e)}", "ERROR")
+            self.set_ui_enabled(True)
 
     def save_results(self):
         """Save processed results (axes and Et)."""
@@ -345,6 +425,51 @@ class PyPulseMainWindow(QMainWindow):
         # Log parameter changes for debugging
         self.log_dock.log("Parameters updated", "DEBUG")
 
+        # Restarting the timer coalesces a burst of edits
+        if self.pulse is not None:
+            self.reprocess_timer.start()
+
+    def reprocess(self):
+        """Reprocess the current pulse with the panel parameters, rerunning only the affected stages."""
+        if self.pulse is None or self.pulse.params.get("spatial_scan"):
+            return
+        if self.live_monitor is not None and self.live_monitor.running:
+            return
+
+        arguments = sifast_arguments(self.parameter_panel.get_all_parameters())
+        changes = {k: v for k, v in arguments.items() if self.pulse.params.get(k) != v}
+        if not changes:
+            return
+
+        # Live and plan results keep no processing stages, a measurement read from a folder is processed anew
+        if not self.pulse.updatable:
+            folder_path = self.pulse.params.get("folder_path")
+            if self.pulse.params.get("mode_input") == "read" and folder_path:
+                self.cancel_processing()
+                self.process_single_measurement(str(folder_path))
+            else:
+                self.log_dock.log("Acquired pulse is not reprocessed, its processing stages were not kept", "DEBUG")
+            return
+
+        # A reprocessing of older parameters is cancelled, the last one wins
+        self.cancel_processing()
+        self.log_dock.log(f"Reprocessing with {', '.join(f'{k}={v}' for k, v in changes.items())}", "INFO")
+        self.status_bar.showMessage("Reprocessing...")
+
+        self.processing_thread = ProcessingThread(changes, mode="update", pulse=self.pulse)
+        self.processing_thread.status.connect(self.log_dock.log)
+        self.processing_thread.error.connect(lambda e: self.log_dock.log(e, "ERROR"))
+        self.processing_thread.finished.connect(self.on_processing_finished)
+        self.processing_thread.start()
+
+    def cancel_processing(self):
+        """Cancel the running processing thread, its results are dropped."""
+        self._cancelled_threads = [thread for thread in self._cancelled_threads if thread.isRunning()]
+        if self.processing_thread is not None and self.processing_thread.isRunning():
+            self.processing_thread.cancel()
+            self._cancelled_threads.append(self.processing_thread)
+        self.processing_thread = None
+
     def set_ui_enabled(self, enabled: bool):
         """Enable/disable UI during processing."""
         self.parameter_panel.setEnabled(enabled)
@@ -391,5 +516,12 @@ class PyPulseMainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event."""
+        if self.live_monitor is not None and self.live_monitor.running:
+            self.live_monitor.stop()
+        self.reprocess_timer.stop()
+        if self.processing_thread is not None and self.processing_thread.mode == "update":
+            self.cancel_processing()
+        for thread in self._cancelled_threads:
+            thread.wait()
         self.save_settings()
         event.accept()
@@ -1,5 +1,6 @@
 """Processing components for PyPulse GUI."""
 
-from .processor import ProcessingThread
+from .field_worker import FieldTask, compute_isosurface_mesh, compute_temporal_profile
+from .processor import LiveMonitor, ProcessingThread
 
-__all__ = ["ProcessingThread"]
+__all__ = ["ProcessingThread", "LiveMonitor", "FieldTask", "compute_isosurface_mesh", "compute_temporal_profile"]
@@ -0,0 +1,145 @@
+"""
+Background evaluation of the time-domain field for the 3D visualization tab.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from pypulse.visualization.mesh import IsosurfaceMeshEngine
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task that was cancelled."""
+
+
+class FieldTaskSignals(QObject):
+    """Signals of a field task, delivered on the GUI thread."""
+
+    finished = Signal(object)  # Task result
+    preview = Signal(object)  # Intermediate result of a progressive task
+    error = Signal(str)
+
+
+class FieldTask(QRunnable):
+    """
+    Runs a field computation on a ``QThreadPool``.
+
+    The computation receives a ``check`` callable and calls it between its
+    stages; once the task is cancelled, ``check`` raises ``TaskCancelled``
+    so the remaining stages are skipped. A cancelled task emits nothing.
+    A progressive computation also receives a ``preview`` callable for its
+    intermediate results.
+    """
+
+    def __init__(self, function: Callable[..., Any], progressive: bool = False, **kwargs):
+        super().__init__()
+        self.function = function
+        self.kwargs = kwargs | ({"preview": self.preview} if progressive else {})
+        self.signals = FieldTaskSignals()
+        self.cancelled = False
+        # Kept alive by the panel that started it, so the result can be matched to the task
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        """Stop the task at its next stage and drop its result."""
+        self.cancelled = True
+
+    def check(self):
+        """Raise ``TaskCancelled`` if the task was cancelled."""
+        if self.cancelled:
+            raise TaskCancelled
+
+    def preview(self, result: Any):
+        """Emit an intermediate result unless the task was cancelled."""
+        if not self.cancelled:
+            self.signals.preview.emit(result)
+
+    def run(self):
+        """Run the computation in a pool thread."""
+        try:
+            result = self.function(check=self.check, **self.kwargs)
+            self.check()
+        except TaskCancelled:
+            return
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+def _no_check():
+    pass
+
+
+def compute_temporal_profile(
+    engine: IsosurfaceMeshEngine, check: Callable[[], None] = _no_check
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Spatially averaged temporal intensity of a pulse.
+
+    Parameters
+    ----------
+    engine : IsosurfaceMeshEngine
+        Mesh engine of the pulse, whose time-domain field is shared with the isosurface
+    check : callable
+        Called between stages, raises to cancel
+
+    Returns
+    -------
+    tuple or None
+        Time axis and intensity, None if the pulse has no time-domain field
+    """
+    pulse = engine.sifast
+    if not (hasattr(pulse, "Et_packed") and hasattr(pulse, "t_axis")):
+        return None
+
+    field = engine.field
+    check()
+    # Average over the grid, cells without a fiber have zero field
+    return pulse.t_axis, np.sum(np.abs(field) ** 2, axis=0) / np.prod(pulse.shape)
+
+
+def compute_isosurface_mesh(
+    engine: IsosurfaceMeshEngine,
+    t_min: float,
+    t_max: float,
+    frequency_scale: float,
+    isovalue: float,
+    check: Callable[[], None] = _no_check,
+    preview: Callable[[dict[str, np.ndarray]], None] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Triangle mesh of the isosurface of a pulse.
+
+    Unless the full resolution mesh is cached, the mesh of the coarsest
+    pyramid level is passed to ``preview`` first.
+
+    Parameters
+    ----------
+    engine : IsosurfaceMeshEngine
+        Mesh engine of the pulse
+    t_min, t_max : float
+        Time range
+    frequency_scale : float
+        Frequency scaling factor
+    isovalue : float
+        Isosurface value
+    check : callable
+        Called between stages, raises to cancel
+    preview : callable, optional
+        Receives the coarse mesh
+
+    Returns
+    -------
+    dict
+        Vertex coordinates 'x', 'y' (mm) and 'z' (fs) and the vertex indices
+        'i', 'j', 'k' of each triangle, empty if the surface is not in the range
+    """
+    if preview is not None and not engine.has_mesh(t_min, t_max, frequency_scale, isovalue):
+        preview(engine.mesh(t_min, t_max, frequency_scale, isovalue, level=-1, check=check).to_plotly())
+        check()
+    return engine.mesh(t_min, t_max, frequency_scale, isovalue, check=check).to_plotly()
@@ -2,12 +2,49 @@
 Processing thread for PyPulse calculations.
 """
 
+import copy
 from typing import Any
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, QThread, Signal
 
 import pypulse
 
+# Parameters of the scan panel that are not SIFAST arguments
+SCAN_PARAMETER_KEYS = ["x_offset", "y_offset", "x_position", "y_position", "unwrap_before_merge", "n_neighbors"]
+
+
+class ProcessingCancelled(Exception):
+    """Raised inside a processing thread that was cancelled."""
+
+
+def sifast_arguments(params: dict[str, Any]) -> dict[str, Any]:
+    """
+    SIFAST arguments of the parameter panel values for folder processing.
+
+    Parameters
+    ----------
+    params : dict
+        Parameter panel values
+
+    Returns
+    -------
+    dict
+        Arguments without ``folder_path`` and ``reference_pulse``
+    """
+    config_params = {
+        k: v for k, v in params.items() if k not in ["folder_path", "reference_pulse"] + SCAN_PARAMETER_KEYS
+    }
+
+    # Always set mode_input to "read" for folder processing
+    config_params["mode_input"] = "read"
+    config_params["dx"] = params.get("x_offset", 0.0)
+    config_params["dy"] = params.get("y_offset", 0.0)
+
+    # Optional fields are left out of the panel values when unset
+    config_params.setdefault("delay_min", None)
+    config_params.setdefault("config_folder_path", None)
+    return config_params
+
 
 class ProcessingThread(QThread):
     """Thread for running pypulse processing without blocking UI."""
@@ -17,12 +54,34 @@ class ProcessingThread(QThread):
     error = Signal(str)
     finished = Signal(object)  # Returns processed pulse object
 
-    def __init__(self, params: dict[str, Any], mode: str = "single"):
+    def __init__(self, params: dict[str, Any], mode: str = "single", pulse=None):
+        """
+        Initialize processing thread.
+
+        Parameters
+        ----------
+        params : dict
+            Parameter panel values
+        mode : str
+            'single', 'scan', or 'update' to reprocess ``pulse`` with the changed parameters
+        pulse : SIFAST, optional
+            Processed pulse to update, left unchanged
+        """
         super().__init__()
         self.params = params
         self.mode = mode
+        self.previous_pulse = pulse
         self.pulse = None
 
+    def cancel(self):
+        """Stop the processing at its next stage, nothing is emitted afterwards."""
+        self.requestInterruption()
+
+    def _check(self):
+        """Raise ``ProcessingCancelled`` if the processing was cancelled."""
+        if self.isInterruptionRequested():
+            raise ProcessingCancelled
+
     def run(self):
         """Run the processing in a separate thread."""
         try:
@@ -30,10 +89,17 @@ class ProcessingThread(QThread):
                 self._process_single()
             elif self.mode == "scan":
                 self._process_scan()
+            elif self.mode == "update":
+                self._process_update()
 
+            self._check()
             self.finished.emit(self.pulse)
 
+        except ProcessingCancelled:
+            return
         except Exception as e:
+            if self.isInterruptionRequested():
+                return
             self.error.emit(str(e))
             self.finished.emit(None)
 
@@ -42,10 +108,7 @@ class ProcessingThread(QThread):
         self.status.emit("Processing single measurement...", "INFO")
 
         # Create processing config
-        config_params = {k: v for k, v in self.params.items() if k not in ["folder_path", "reference_pulse"]}
-
-        # Always set mode_input to "read" for folder processing
-        config_params["mode_input"] = "read"
+        config_params = sifast_arguments(self.params)
 
         # Check if we need reference pulse
         if self.params.get("mode_acquire") == "triple":
@@ -58,18 +121,95 @@ class ProcessingThread(QThread):
         folder_path = self.params.get("folder_path")
         if folder_path:
             self.pulse = pypulse.SIFAST(folder_path=folder_path, reference_pulse=reference_pulse, **config_params)
+            self._emit_timings(self.pulse.timings)
             self.status.emit("Processing completed successfully", "SUCCESS")
         else:
             raise ValueError("No folder path provided")
 
+    def _process_update(self):
+        """Reprocess a pulse, rerunning only the stages downstream of the changed parameters."""
+        # The displayed pulse stays untouched, stages replace the arrays they compute
+        self.pulse = copy.copy(self.previous_pulse)
+        stages = self.pulse.update(check=self._check, **self.params)
+        self._emit_timings(self.pulse.timings)
+        self.status.emit(f"Reprocessed stages: {', '.join(stages) or 'none'}", "INFO")
+
+    def _emit_timings(self, timings):
+        """Forward the stage timings of a profiled run to the log."""
+        if timings:
+            for line in pypulse.format_timings(timings).splitlines():
+                self.status.emit(line, "DEBUG")
+
     def _process_scan(self):
         """Process scan data with spatial merging."""
         self.status.emit("Processing scan data...", "INFO")
 
-        # TODO: Implement scan processing
-        # This would involve:
-        # 1. Finding all measurement folders in scan directory
-        # 2. Processing each one individually
-        # 3. Using pypulse.merge_spatial_scans to combine them
+        folder_path = self.params.get("folder_path")
+        if not folder_path:
+            raise ValueError("No folder path provided")
 
-        raise NotImplementedError("Scan processing not yet implemented")
+        # Create processing config
+        excluded = ["folder_path", "reference_pulse", "config_folder_path", "mode_input"] + SCAN_PARAMETER_KEYS
+        config = pypulse.ProcessingConfig.from_dict({k: v for k, v in self.params.items() if k not in excluded})
+
+        # Calibrate at the default point of the merge unless a position is set
+        calibration_point = None
+        if self.params.get("x_position") is not None and self.params.get("y_position") is not None:
+            calibration_point = (self.params["x_position"], self.params["y_position"])
+
+        # Process all positions in parallel and merge them
+        self.pulse = pypulse.process_scan(
+            folder_path,
+            config,
+            config_folder_path=self.params.get("config_folder_path"),
+            calibration_point=calibration_point,
+            unwrap_before_merge=self.params.get("unwrap_before_merge", False),
+            n_neighbors=self.params.get("n_neighbors", 3),
+            progress_callback=self.progress.emit,
+            status_callback=self.status.emit,
+        )
+
+
+class LiveMonitor(QObject):
+    """Runs a live pipeline and forwards its results to the UI thread."""
+
+    result = Signal(object)  # LiveResult
+    status = Signal(str, str)  # message, level
+
+    def __init__(self, params: dict[str, Any], folder_paths: list[str], frame_rate: float | None = None):
+        super().__init__()
+        excluded = ["folder_path", "reference_pulse", "config_folder_path", "mode_input"] + SCAN_PARAMETER_KEYS
+        config = pypulse.ProcessingConfig.from_dict({k: v for k, v in params.items() if k not in excluded})
+
+        # Replay recorded measurements until a spectrometer source is available
+        source = pypulse.FileReplaySource(folder_paths, config.mode_acquire, frame_rate=frame_rate, loop=True)
+        self.pipeline = pypulse.LivePipeline(
+            source,
+            config,
+            config_folder_path=params.get("config_folder_path"),
+            drop_frames=frame_rate is not None,
+            result_callback=self.result.emit,
+        )
+
+    @property
+    def running(self) -> bool:
+        """Whether the pipeline is running."""
+        return self.pipeline.running
+
+    def start(self):
+        """Start live processing."""
+        self.pipeline.start()
+        self.status.emit("Live processing started", "INFO")
+
+    def stop(self):
+        """Stop live processing."""
+        try:
+            self.pipeline.stop()
+        except Exception as e:
+            self.status.emit(f"Live acquisition failed: {type(e).__name__}: {e}", "ERROR")
+        stats = self.pipeline.stats
+        self.status.emit(
+            f"Live processing stopped: {stats.frames_processed} frames, {stats.frames_dropped} dropped, "
+            f"mean latency {stats.latency_mean_ms:.0f} ms",
+            "INFO",
+        )
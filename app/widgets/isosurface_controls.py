@@ -14,6 +14,8 @@ class IsosurfaceControls(QWidget):
     """Compact control panel for isosurface parameters."""
 
     reconstructRequested = Signal()
+    parametersChanged = Signal()  # A parameter of the mesh changed
+    opacityChanged = Signal(float)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -142,6 +144,15 @@ class IsosurfaceControls(QWidget):
 
         self.setLayout(layout)
 
+        for spinbox in [
+            self.t_min_spinbox,
+            self.t_max_spinbox,
+            self.freq_scale_spinbox,
+            self.isovalue_spinbox,
+        ]:
+            spinbox.valueChanged.connect(self.parametersChanged.emit)
+        self.opacity_spinbox.valueChanged.connect(self.opacityChanged.emit)
+
         # Set up tooltips
         self.t_min_spinbox.setToolTip("Minimum time value for isosurface")
         self.t_max_spinbox.setToolTip("Maximum time value for isosurface")
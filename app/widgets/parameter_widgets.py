@@ -27,6 +27,9 @@ from PySide6.QtWidgets import (
 from ..styles import INPUT_STYLE, OUTLINE_BUTTON_STYLE
 from .collapsible_group import CollapsibleGroupBox
 
+# Smallest FFT size, the spin box value 0 stands for "auto"
+MIN_N_FFT = 1024
+
 
 class ProcessingParametersWidget(QWidget):
     """Widget for processing parameters."""
@@ -107,11 +110,21 @@ class ProcessingParametersWidget(QWidget):
 
         fft_layout.addWidget(QLabel("n_fft:"), 1, 0)
         self.n_fft = QSpinBox()
-        self.n_fft.setRange(1024, 131072)
+        self.n_fft.setRange(0, 131072)
         self.n_fft.setSingleStep(1024)
         self.n_fft.setValue(65536)
+        self.n_fft.setSpecialValueText("Auto")
+        self.n_fft.editingFinished.connect(self.clamp_n_fft)
         fft_layout.addWidget(self.n_fft, 1, 1)
 
+        fft_layout.addWidget(QLabel("Time Step:"), 2, 0)
+        self.time_resolution = QDoubleSpinBox()
+        self.time_resolution.setRange(0.1, 20)
+        self.time_resolution.setValue(2.0)
+        self.time_resolution.setSingleStep(0.5)
+        self.time_resolution.setSuffix(" fs")
+        fft_layout.addWidget(self.time_resolution, 2, 1)
+
         fft_group.setLayout(fft_layout)
         layout.addWidget(fft_group)
 
@@ -141,6 +154,9 @@ class ProcessingParametersWidget(QWidget):
         self.as_calibration = QCheckBox("As Calibration")
         proc_layout.addWidget(self.as_calibration, 3, 0, 1, 2)
 
+        self.profile = QCheckBox("Profile Stages")
+        proc_layout.addWidget(self.profile, 4, 0, 1, 2)
+
         proc_group.setLayout(proc_layout)
         layout.addWidget(proc_group)
 
@@ -181,11 +197,13 @@ class ProcessingParametersWidget(QWidget):
         self.wavelength_center.setToolTip("Center wavelength of the pulse")
         self.wavelength_width.setToolTip("Spectral width to analyze")
         self.n_omega.setToolTip("Number of frequency points")
-        self.n_fft.setToolTip("FFT size for processing")
+        self.n_fft.setToolTip(f"FFT size for processing, at least {MIN_N_FFT} (set to 0 for auto)")
+        self.time_resolution.setToolTip("Largest time step when the FFT size is auto")
         self.mode_fiber_position.setToolTip("Method for fiber position detection")
         self.method.setToolTip("Interpolation method for resampling")
         self.delay_min.setToolTip("Minimum delay for peak detection (set to 0 for auto)")
         self.as_calibration.setToolTip("Use this measurement for calibration")
+        self.profile.setToolTip("Log the time and memory of each processing stage")
         self.fiber_array_id.setToolTip("Fiber array configuration")
         self.config_folder_path.setToolTip("Optional custom configuration folder")
 
@@ -198,10 +216,12 @@ class ProcessingParametersWidget(QWidget):
             self.wavelength_width,
             self.n_omega,
             self.n_fft,
+            self.time_resolution,
             self.mode_fiber_position,
             self.method,
             self.delay_min,
             self.as_calibration,
+            self.profile,
             self.fiber_array_id,
             self.config_folder_path,
         ]
@@ -226,19 +246,27 @@ class ProcessingParametersWidget(QWidget):
         if folder:
             self.config_folder_path.setText(folder)
 
+    def clamp_n_fft(self):
+        """Raise a typed FFT size below the minimum to it, 0 stays auto."""
+        if 0 < self.n_fft.value() < MIN_N_FFT:
+            self.n_fft.setValue(MIN_N_FFT)
+
     def get_parameters(self) -> dict[str, Any]:
         """Get all parameters as dictionary."""
+        n_fft = self.n_fft.value()
         params = {
             "mode_acquire": self.mode_acquire.currentText(),
             "gate_noise_intensity": self.gate_noise.value(),
             "wavelength_center": self.wavelength_center.value(),
             "wavelength_width": self.wavelength_width.value(),
             "n_omega": self.n_omega.value(),
-            "n_fft": self.n_fft.value(),
+            "n_fft": max(n_fft, MIN_N_FFT) if n_fft else "auto",
+            "time_resolution": self.time_resolution.value(),
             "mode_fiber_position": self.mode_fiber_position.currentText(),
             "method": self.method.currentText(),
             "fiber_array_id": self.fiber_array_id.currentText(),
             "as_calibration": self.as_calibration.isChecked(),
+            "profile": self.profile.isChecked(),
         }
 
         if self.delay_min.value() != 0:
@@ -262,7 +290,9 @@ class ProcessingParametersWidget(QWidget):
         if "n_omega" in params:
             self.n_omega.setValue(params["n_omega"])
         if "n_fft" in params:
-            self.n_fft.setValue(params["n_fft"])
+            self.n_fft.setValue(0 if params["n_fft"] == "auto" else params["n_fft"])
+        if "time_resolution" in params:
+            self.time_resolution.setValue(params["time_resolution"])
         if "mode_fiber_position" in params:
             self.mode_fiber_position.setCurrentText(params["mode_fiber_position"])
         if "method" in params:
@@ -273,6 +303,8 @@ class ProcessingParametersWidget(QWidget):
             self.fiber_array_id.setCurrentText(params["fiber_array_id"])
         if "as_calibration" in params:
             self.as_calibration.setChecked(params["as_calibration"])
+        if "profile" in params:
+            self.profile.setChecked(params["profile"])
         if "config_folder_path" in params:
             self.config_folder_path.setText(params["config_folder_path"])
 
@@ -318,21 +350,27 @@ class ScanParametersWidget(QWidget):
         self.y_offset.setDecimals(2)
         pos_layout.addWidget(self.y_offset, 1, 1)
 
-        pos_layout.addWidget(QLabel("X Position:"), 2, 0)
+        self.calibrate_at_position = QCheckBox("Calibrate phase at position")
+        self.calibrate_at_position.setChecked(False)
+        pos_layout.addWidget(self.calibrate_at_position, 2, 0, 1, 2)
+
+        pos_layout.addWidget(QLabel("X Position:"), 3, 0)
         self.x_position = QDoubleSpinBox()
         self.x_position.setRange(-100, 100)
         self.x_position.setValue(0.0)
         self.x_position.setSuffix(" mm")
         self.x_position.setDecimals(2)
-        pos_layout.addWidget(self.x_position, 2, 1)
+        self.x_position.setEnabled(False)
+        pos_layout.addWidget(self.x_position, 3, 1)
 
-        pos_layout.addWidget(QLabel("Y Position:"), 3, 0)
+        pos_layout.addWidget(QLabel("Y Position:"), 4, 0)
         self.y_position = QDoubleSpinBox()
         self.y_position.setRange(-100, 100)
         self.y_position.setValue(0.0)
         self.y_position.setSuffix(" mm")
         self.y_position.setDecimals(2)
-        pos_layout.addWidget(self.y_position, 3, 1)
+        self.y_position.setEnabled(False)
+        pos_layout.addWidget(self.y_position, 4, 1)
 
         pos_group.setLayout(pos_layout)
         layout.addWidget(pos_group)
@@ -368,6 +406,7 @@ class ScanParametersWidget(QWidget):
         """Set up helpful tooltips."""
         self.x_offset.setToolTip("X-axis offset for fiber array position")
         self.y_offset.setToolTip("Y-axis offset for fiber array position")
+        self.calibrate_at_position.setToolTip("Calibrate the merged phase at a given position instead of the default")
         self.x_position.setToolTip("X position for phase calibration")
         self.y_position.setToolTip("Y position for phase calibration")
         self.unwrap_before_merge.setToolTip("Apply 2D phase unwrapping before merging scans")
@@ -378,6 +417,7 @@ class ScanParametersWidget(QWidget):
         widgets = [
             self.x_offset,
             self.y_offset,
+            self.calibrate_at_position,
             self.x_position,
             self.y_position,
             self.unwrap_before_merge,
@@ -390,6 +430,9 @@ class ScanParametersWidget(QWidget):
             elif isinstance(widget, QCheckBox):
                 widget.toggled.connect(self.on_parameter_changed)
 
+        self.calibrate_at_position.toggled.connect(self.x_position.setEnabled)
+        self.calibrate_at_position.toggled.connect(self.y_position.setEnabled)
+
     def on_parameter_changed(self):
         """Emit signal when any parameter changes."""
         self.parametersChanged.emit()
@@ -399,8 +442,9 @@ class ScanParametersWidget(QWidget):
         return {
             "x_offset": self.x_offset.value(),
             "y_offset": self.y_offset.value(),
-            "x_position": self.x_position.value(),
-            "y_position": self.y_position.value(),
+            # None keeps the default calibration of the merge
+            "x_position": self.x_position.value() if self.calibrate_at_position.isChecked() else None,
+            "y_position": self.y_position.value() if self.calibrate_at_position.isChecked() else None,
             "unwrap_before_merge": self.unwrap_before_merge.isChecked(),
             "n_neighbors": self.n_neighbors.value(),
         }
@@ -411,10 +455,12 @@ class ScanParametersWidget(QWidget):
             self.x_offset.setValue(params["x_offset"])
         if "y_offset" in params:
             self.y_offset.setValue(params["y_offset"])
-        if "x_position" in params:
-            self.x_position.setValue(params["x_position"])
-        if "y_position" in params:
-            self.y_position.setValue(params["y_position"])
+        if "x_position" in params and "y_position" in params:
+            calibrate = params["x_position"] is not None and params["y_position"] is not None
+            self.calibrate_at_position.setChecked(calibrate)
+            if calibrate:
+                self.x_position.setValue(params["x_position"])
+                self.y_position.setValue(params["y_position"])
         if "unwrap_before_merge" in params:
             self.unwrap_before_merge.setChecked(params["unwrap_before_merge"])
         if "n_neighbors" in params:
@@ -2,68 +2,184 @@
 Individual plot widgets for PyPulse visualization.
 """
 
+import base64
 import json
+from pathlib import Path
 from typing import Any
 
 import numpy as np
-from PySide6.QtCore import Qt
+import plotly
+from PySide6.QtCore import QObject, Qt, QUrl, Signal, Slot
 from PySide6.QtWebChannel import QWebChannel
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
 
+# plotly.js bundled with the plotly package, so plots also work offline
+PLOTLY_JS = Path(plotly.__file__).parent / "package_data" / "plotly.min.js"
+
+PLOT_PAGE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <script src="plotly.min.js"></script>
+    <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+    <style>
+        body {
+            margin: 0;
+            padding: 0;
+            background: white;
+        }
+        #plot {
+            width: 100%;
+            height: 100vh;
+        }
+    </style>
+</head>
+<body>
+    <div id="plot"></div>
+    <script>
+        var config = {
+            responsive: true,
+            toImageButtonOptions: {
+                format: 'png',
+                filename: 'pypulse_plot',
+                height: 800,
+                width: 1200,
+                scale: 2
+            },
+            modeBarButtonsToAdd: ['hovercompare', 'hoverclosest']
+        };
+
+        // Arrays arrive as base64 encoded buffers, see encode_array
+        var ARRAY_TYPES = {f4: Float32Array, f8: Float64Array, i4: Int32Array, u1: Uint8Array};
+        function decodeArrays(value) {
+            if (value === null || typeof value !== 'object') {
+                return value;
+            }
+            if (typeof value.bdata === 'string' && value.dtype in ARRAY_TYPES) {
+                var binary = atob(value.bdata);
+                var bytes = new Uint8Array(binary.length);
+                for (var i = 0; i < binary.length; i++) {
+                    bytes[i] = binary.charCodeAt(i);
+                }
+                var array = new ARRAY_TYPES[value.dtype](bytes.buffer);
+                if (value.shape.length < 2) {
+                    return array;
+                }
+                // 2D arrays become rows sharing the same buffer
+                var rows = [];
+                var n = value.shape[1];
+                for (var row = 0; row < value.shape[0]; row++) {
+                    rows.push(array.subarray(row * n, (row + 1) * n));
+                }
+                return rows;
+            }
+            for (var key in value) {
+                value[key] = decodeArrays(value[key]);
+            }
+            return value;
+        }
+
+        new QWebChannel(qt.webChannelTransport, function (channel) {
+            var bridge = channel.objects.bridge;
+            bridge.figureChanged.connect(function (payload) {
+                var figure = decodeArrays(JSON.parse(payload));
+                Plotly.react('plot', figure.data, figure.layout, config);
+            });
+            bridge.pageReady();
+        });
+    </script>
+</body>
+</html>
+"""
+
+
+def encode_array(values: Any, dtype: type = np.float32) -> dict[str, Any]:
+    """
+    Encode an array as a base64 buffer, decoded into a typed array by the page.
+
+    Parameters
+    ----------
+    values : array_like
+        Array of at most two dimensions
+    dtype : type
+        Transport type (float32 by default)
+
+    Returns
+    -------
+    dict
+        ``dtype``, base64 ``bdata`` and ``shape`` of the array
+    """
+    array = np.ascontiguousarray(values, dtype=dtype)
+    return {
+        "dtype": array.dtype.str[1:],
+        "bdata": base64.b64encode(array.data).decode("ascii"),
+        "shape": list(array.shape),
+    }
+
+
+class FigureEncoder(json.JSONEncoder):
+    """JSON encoder sending NumPy arrays as typed-array buffers."""
+
+    def default(self, obj):
+        if isinstance(obj, np.ndarray):
+            return encode_array(obj, np.int32 if obj.dtype.kind in "iu" else np.float32)
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return super().default(obj)
+
+
+class PlotBridge(QObject):
+    """Pushes figures to the plot page over the web channel."""
+
+    figureChanged = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ready = False
+        self.payload = None
+
+    @Slot()
+    def pageReady(self):
+        """Called by the page once plotly.js and the channel are loaded."""
+        self.ready = True
+        if self.payload is not None:
+            self.figureChanged.emit(self.payload)
+
+    def send(self, payload: str):
+        """Send a serialized figure, or keep it until the page is ready."""
+        self.payload = payload
+        if self.ready:
+            self.figureChanged.emit(payload)
+
 
 class PlotlyWidget(QWebEngineView):
-    """Base widget for displaying Plotly plots."""
+    """
+    Base widget for displaying Plotly plots.
+
+    The page and plotly.js are loaded once; figures are then sent over the
+    web channel and drawn with ``Plotly.react``, which only updates what
+    changed.
+    """
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.bridge = PlotBridge(self)
         self.channel = QWebChannel()
+        self.channel.registerObject("bridge", self.bridge)
         self.page().setWebChannel(self.channel)
 
+        # A reloaded page announces itself again through pageReady
+        self.loadStarted.connect(self._on_load_started)
+        self.setHtml(PLOT_PAGE, QUrl.fromLocalFile(str(PLOTLY_JS)))
+
+    def _on_load_started(self):
+        self.bridge.ready = False
+
     def plot_data(self, fig_dict: dict[str, Any]):
-        """Display a plotly figure dictionary."""
-        html = self._generate_plotly_html(fig_dict)
-        self.setHtml(html)
-
-    def _generate_plotly_html(self, fig_dict: dict[str, Any]) -> str:
-        """Generate HTML with Plotly plot."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-            <style>
-                body {{
-                    margin: 0;
-                    padding: 0;
-                    background: white;
-                }}
-                #plot {{
-                    width: 100%;
-                    height: 100vh;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="plot"></div>
-            <script>
-                var figure = {json.dumps(fig_dict)};
-                var config = {{
-                    responsive: true,
-                    toImageButtonOptions: {{
-                        format: 'png',
-                        filename: 'pypulse_plot',
-                        height: 800,
-                        width: 1200,
-                        scale: 2
-                    }},
-                    modeBarButtonsToAdd: ['hovercompare', 'hoverclosest']
-                }};
-                Plotly.newPlot('plot', figure.data, figure.layout, config);
-            </script>
-        </body>
-        </html>
-        """
+        """Display a plotly figure dictionary, NumPy arrays are sent as float32 buffers."""
+        self.bridge.send(json.dumps(fig_dict, cls=FigureEncoder))
 
 
 class PulseFrontPlot(QWidget):
@@ -100,17 +216,17 @@ class PulseFrontPlot(QWidget):
             "data": [
                 {
                     "type": "heatmap",
-                    "z": pulse.pulse_front.tolist() if hasattr(pulse, "pulse_front") else [[0]],
-                    "x": pulse.x_axis.tolist() if hasattr(pulse, "x_axis") else [0],
-                    "y": pulse.y_axis.tolist() if hasattr(pulse, "y_axis") else [0],
+                    "z": pulse.pulse_front if hasattr(pulse, "pulse_front") else [[0]],
+                    "x": pulse.x_axis if hasattr(pulse, "x_axis") else [0],
+                    "y": pulse.y_axis if hasattr(pulse, "y_axis") else [0],
                     "colorscale": "Viridis",
-                    "colorbar": {"title": "Time (fs)", "titleside": "right"},
+                    "colorbar": {"title": {"text": "Time (fs)", "side": "right"}},
                     "hovertemplate": "X: %{x:.2f} mm<br>Y: %{y:.2f} mm<br>Time: %{z:.2f} fs<extra></extra>",
                 }
             ],
             "layout": {
-                "xaxis": {"title": "X (mm)", "showgrid": True, "gridcolor": "#e9ecef"},
-                "yaxis": {"title": "Y (mm)", "showgrid": True, "gridcolor": "#e9ecef"},
+                "xaxis": {"title": {"text": "X (mm)"}, "showgrid": True, "gridcolor": "#e9ecef"},
+                "yaxis": {"title": {"text": "Y (mm)"}, "showgrid": True, "gridcolor": "#e9ecef"},
                 "plot_bgcolor": "white",
                 "paper_bgcolor": "white",
                 "font": {"family": "Arial, sans-serif"},
@@ -161,17 +277,17 @@ class PhasePlot(QWidget):
             "data": [
                 {
                     "type": "heatmap",
-                    "z": phase_data.tolist(),
-                    "x": pulse.x_axis.tolist() if hasattr(pulse, "x_axis") else list(range(10)),
-                    "y": pulse.y_axis.tolist() if hasattr(pulse, "y_axis") else list(range(10)),
+                    "z": phase_data,
+                    "x": pulse.x_axis if hasattr(pulse, "x_axis") else list(range(10)),
+                    "y": pulse.y_axis if hasattr(pulse, "y_axis") else list(range(10)),
                     "colorscale": "RdBu",
-                    "colorbar": {"title": "Phase (rad)", "titleside": "right"},
+                    "colorbar": {"title": {"text": "Phase (rad)", "side": "right"}},
                     "hovertemplate": "X: %{x:.2f} mm<br>Y: %{y:.2f} mm<br>Phase: %{z:.3f} rad<extra></extra>",
                 }
             ],
             "layout": {
-                "xaxis": {"title": "X (mm)", "showgrid": True, "gridcolor": "#e9ecef"},
-                "yaxis": {"title": "Y (mm)", "showgrid": True, "gridcolor": "#e9ecef"},
+                "xaxis": {"title": {"text": "X (mm)"}, "showgrid": True, "gridcolor": "#e9ecef"},
+                "yaxis": {"title": {"text": "Y (mm)"}, "showgrid": True, "gridcolor": "#e9ecef"},
                 "plot_bgcolor": "white",
                 "paper_bgcolor": "white",
                 "font": {"family": "Arial, sans-serif"},
@@ -227,8 +343,8 @@ class SpectralProfilePlot(QWidget):
             "data": [
                 {
                     "type": "scatter",
-                    "x": wavelength.tolist(),
-                    "y": spectral_data.tolist(),
+                    "x": wavelength,
+                    "y": spectral_data,
                     "mode": "lines",
                     "line": {"color": "#0d6efd", "width": 2},
                     "fill": "tozeroy",
@@ -237,8 +353,8 @@ class SpectralProfilePlot(QWidget):
                 }
             ],
             "layout": {
-                "xaxis": {"title": "Wavelength (nm)", "showgrid": True, "gridcolor": "#e9ecef"},
-                "yaxis": {"title": "Intensity (a.u.)", "showgrid": True, "gridcolor": "#e9ecef"},
+                "xaxis": {"title": {"text": "Wavelength (nm)"}, "showgrid": True, "gridcolor": "#e9ecef"},
+                "yaxis": {"title": {"text": "Intensity (a.u.)"}, "showgrid": True, "gridcolor": "#e9ecef"},
                 "plot_bgcolor": "white",
                 "paper_bgcolor": "white",
                 "font": {"family": "Arial, sans-serif"},
@@ -273,17 +389,18 @@ class TemporalProfilePlot(QWidget):
 
         self.setLayout(layout)
 
-    def update_plot(self, pulse):
-        """Update plot with pulse data."""
-        if pulse is None:
-            return
+    def update_plot(self, profile):
+        """
+        Update plot with a temporal profile.
 
-        # Get temporal data
-        if hasattr(pulse, "Et") and hasattr(pulse, "t_axis"):
-            Et = pulse.Et
-            # Average over spatial dimensions
-            temporal_data = np.nanmean(np.abs(Et) ** 2, axis=(0, 1))
-            t_axis = pulse.t_axis
+        Parameters
+        ----------
+        profile : tuple or None
+            Time axis and intensity from ``compute_temporal_profile``, None
+            shows a placeholder
+        """
+        if profile is not None:
+            t_axis, temporal_data = profile
         else:
             t_axis = np.linspace(-500, 500, 1000)
             temporal_data = np.exp(-(((t_axis) / 100) ** 2))
@@ -292,8 +409,8 @@ class TemporalProfilePlot(QWidget):
             "data": [
                 {
                     "type": "scatter",
-                    "x": t_axis.tolist(),
-                    "y": temporal_data.tolist(),
+                    "x": t_axis,
+                    "y": temporal_data,
                     "mode": "lines",
                     "line": {"color": "#dc3545", "width": 2},
                     "fill": "tozeroy",
@@ -302,8 +419,8 @@ class TemporalProfilePlot(QWidget):
                 }
             ],
             "layout": {
-                "xaxis": {"title": "Time (fs)", "showgrid": True, "gridcolor": "#e9ecef"},
-                "yaxis": {"title": "Intensity (a.u.)", "showgrid": True, "gridcolor": "#e9ecef"},
+                "xaxis": {"title": {"text": "Time (fs)"}, "showgrid": True, "gridcolor": "#e9ecef"},
+                "yaxis": {"title": {"text": "Intensity (a.u.)"}, "showgrid": True, "gridcolor": "#e9ecef"},
                 "plot_bgcolor": "white",
                 "paper_bgcolor": "white",
                 "font": {"family": "Arial, sans-serif"},
@@ -319,6 +436,7 @@ class IsosurfacePlot(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.mesh = None
         self.init_ui()
 
     def init_ui(self):
@@ -338,44 +456,51 @@ class IsosurfacePlot(QWidget):
 
         self.setLayout(layout)
 
-    def update_plot(self, pulse, t_min=-250, t_max=700, frequency_scale=0, isovalue=0.05, opacity=0.9):
-        """Update plot with pulse data and parameters."""
-        if pulse is None:
+    def update_plot(self, mesh, opacity=0.9):
+        """
+        Update plot with an isosurface mesh.
+
+        Parameters
+        ----------
+        mesh : dict
+            Vertex coordinates 'x', 'y', 'z' and triangle indices 'i', 'j',
+            'k' from ``compute_isosurface_mesh``
+        opacity : float
+            Surface opacity
+        """
+        if mesh is None:
             return
-
-        # For now, create a placeholder 3D visualization
-        # In real implementation, this would use pulse.Et data
-        x = np.linspace(-5, 5, 20)
-        y = np.linspace(-5, 5, 20)
-        z = np.linspace(t_min, t_max, 50)
-
-        X, Y, Z = np.meshgrid(x, y, z)
-        values = np.exp(-(X**2 + Y**2) / 10) * np.exp(-((Z / 200) ** 2))
+        self.mesh = mesh
 
         fig = {
             "data": [
                 {
-                    "type": "isosurface",
-                    "x": X.flatten().tolist(),
-                    "y": Y.flatten().tolist(),
-                    "z": Z.flatten().tolist(),
-                    "value": values.flatten().tolist(),
-                    "isomin": isovalue * 0.8,
-                    "isomax": isovalue * 1.2,
+                    "type": "mesh3d",
+                    **mesh,
+                    "intensity": mesh["z"],
                     "opacity": opacity,
-                    "surface": {"show": True},
                     "colorscale": "Viridis",
                     "showscale": True,
-                    "colorbar": {"title": "Intensity", "titleside": "right"},
-                    "caps": {"x": {"show": False}, "y": {"show": False}, "z": {"show": False}},
+                    "colorbar": {"title": {"text": "Time (fs)", "side": "right"}},
+                    "hovertemplate": "x: %{x:.2f} mm<br>y: %{y:.2f} mm<br>t: %{z:.1f} fs<extra></extra>",
                 }
             ],
             "layout": {
                 "scene": {
-                    "xaxis": {"title": "X (mm)", "showgrid": True, "gridcolor": "#e9ecef", "backgroundcolor": "white"},
-                    "yaxis": {"title": "Y (mm)", "showgrid": True, "gridcolor": "#e9ecef", "backgroundcolor": "white"},
+                    "xaxis": {
+                        "title": {"text": "X (mm)"},
+                        "showgrid": True,
+                        "gridcolor": "#e9ecef",
+                        "backgroundcolor": "white",
+                    },
+                    "yaxis": {
+                        "title": {"text": "Y (mm)"},
+                        "showgrid": True,
+                        "gridcolor": "#e9ecef",
+                        "backgroundcolor": "white",
+                    },
                     "zaxis": {
-                        "title": "Time (fs)",
+                        "title": {"text": "Time (fs)"},
                         "showgrid": True,
                         "gridcolor": "#e9ecef",
                         "backgroundcolor": "white",
@@ -386,7 +511,13 @@ class IsosurfacePlot(QWidget):
                 "paper_bgcolor": "white",
                 "font": {"family": "Arial, sans-serif"},
                 "margin": {"l": 0, "r": 0, "t": 0, "b": 0},
+                # Keep the camera when a refined mesh or another opacity is drawn
+                "uirevision": "isosurface",
             },
         }
 
         self.plot_widget.plot_data(fig)
+
+    def set_opacity(self, opacity):
+        """Redraw the current mesh with another opacity."""
+        self.update_plot(self.mesh, opacity=opacity)
@@ -2,9 +2,12 @@
 Visualization panel containing all plots and controls.
 """
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QThreadPool, Signal
 from PySide6.QtWidgets import QHBoxLayout, QPushButton, QSplitter, QTabWidget, QVBoxLayout, QWidget
 
+from pypulse.visualization.mesh import IsosurfaceMeshEngine
+
+from ..processing.field_worker import FieldTask, compute_isosurface_mesh, compute_temporal_profile
 from ..styles import BUTTON_STYLE, SECONDARY_BUTTON_STYLE
 from .isosurface_controls import IsosurfaceControls
 from .plot_widgets import IsosurfacePlot, PhasePlot, PulseFrontPlot, SpectralProfilePlot, TemporalProfilePlot
@@ -15,10 +18,15 @@ class VisualizationPanel(QWidget):
 
     exportRequested = Signal()
     saveRequested = Signal()
+    status = Signal(str, str)  # message, level
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.pulse = None
+        self.mesh_engine = None
+        # Field computations run off the GUI thread, at most one in flight per plot
+        self.thread_pool = QThreadPool.globalInstance()
+        self._tasks: dict[str, FieldTask] = {}
         self.init_ui()
 
     def init_ui(self):
@@ -148,6 +156,8 @@ class VisualizationPanel(QWidget):
         # Isosurface controls (compact)
         self.isosurface_controls = IsosurfaceControls()
         self.isosurface_controls.reconstructRequested.connect(self._reconstruct_isosurface)
+        self.isosurface_controls.parametersChanged.connect(lambda: self._cancel_task("isosurface"))
+        self.isosurface_controls.opacityChanged.connect(self.isosurface_plot.set_opacity)
         right_layout.addWidget(self.isosurface_controls, 1)
 
         right_widget.setLayout(right_layout)
@@ -164,6 +174,8 @@ class VisualizationPanel(QWidget):
     def set_pulse(self, pulse):
         """Set the pulse object and update all plots."""
         self.pulse = pulse
+        # Shares the time-domain field of the pulse between the plots and caches its meshes
+        self.mesh_engine = IsosurfaceMeshEngine(pulse) if pulse is not None else None
         self.update_plots()
 
     def update_plots(self):
@@ -175,17 +187,57 @@ class VisualizationPanel(QWidget):
         self.pulse_front_plot.update_plot(self.pulse)
         self.phase_plot.update_plot(self.pulse)
 
-        # Update profile plots
+        # Update profile plots, the temporal profile needs the time-domain field
         self.spectral_profile_plot.update_plot(self.pulse)
-        self.temporal_profile_plot.update_plot(self.pulse)
+        self._submit_task("temporal_profile", compute_temporal_profile, self.temporal_profile_plot.update_plot)
 
         # Update isosurface
         self._reconstruct_isosurface()
 
     def _reconstruct_isosurface(self):
-        """Reconstruct isosurface with current parameters."""
+        """Reconstruct isosurface with current parameters in the background."""
         if self.pulse is None:
             return
 
         params = self.isosurface_controls.get_parameters()
-        self.isosurface_plot.update_plot(self.pulse, **params)
+        del params["opacity"]
+        # A coarse mesh is shown while the full resolution one is extracted
+        self._submit_task(
+            "isosurface",
+            compute_isosurface_mesh,
+            self._show_isosurface,
+            progressive=True,
+            **params,
+        )
+
+    def _show_isosurface(self, mesh):
+        """Show a mesh with the current opacity."""
+        self.isosurface_plot.update_plot(mesh, opacity=self.isosurface_controls.get_parameters()["opacity"])
+
+    def _submit_task(self, name, function, on_finished, progressive=False, **kwargs):
+        """Start a field computation for the current pulse, cancelling the previous one of the same plot."""
+        self._cancel_task(name)
+        task = FieldTask(function, progressive=progressive, engine=self.mesh_engine, **kwargs)
+        task.signals.finished.connect(lambda result: self._on_task_finished(name, task, on_finished, result))
+        task.signals.preview.connect(lambda result: self._on_task_preview(name, task, on_finished, result))
+        task.signals.error.connect(lambda message: self.status.emit(f"Failed to compute {name}: {message}", "ERROR"))
+        self._tasks[name] = task
+        self.thread_pool.start(task)
+
+    def _cancel_task(self, name):
+        """Cancel the in-flight computation of a plot."""
+        task = self._tasks.pop(name, None)
+        if task is not None:
+            task.cancel()
+
+    def _on_task_preview(self, name, task, on_finished, result):
+        """Show an intermediate result of the in-flight computation."""
+        if self._tasks.get(name) is task:
+            on_finished(result)
+
+    def _on_task_finished(self, name, task, on_finished, result):
+        """Show the result of a computation unless it was superseded."""
+        if self._tasks.get(name) is not task:
+            return
+        del self._tasks[name]
+        on_finished(result)
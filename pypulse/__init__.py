@@ -1,20 +1,84 @@
 """PyPulse - A Python package for spatiotemporal pulse characterization."""
 
-from . import io
-from .config.settings import ProcessingConfig
-from .fiber.registry import register_fiber_array
-from .processing.sifast import SIFAST
-from .processing.spatial_scan import merge_spatial_scans
-from .processing.srsi import SRSI
+import importlib
+from typing import TYPE_CHECKING
+
+# Modules defining the public names, imported on first access (PEP 562) so that
+# ``import pypulse`` loads neither SciPy nor the plotting backends
+_LAZY_IMPORTS = {
+    "SRSI": ".processing.srsi",
+    "SIFAST": ".processing.sifast",
+    "SIFASTPlan": ".processing.plan",
+    "ProcessingConfig": ".config.settings",
+    "register_fiber_array": ".fiber.registry",
+    "merge_spatial_scans": ".processing.spatial_scan",
+    "process_scan": ".processing.scan",
+    "discover_scan_positions": ".processing.scan",
+    "precision_report": ".processing.precision",
+    "find_logged_runs": ".processing.reproduce",
+    "reproduce_logged_runs": ".processing.reproduce",
+    "sweep_parameters": ".processing.sweep",
+    "fit_reference_sphere": ".processing.calibration",
+    "fit_reference_sphere_batch": ".processing.calibration",
+    "LivePipeline": ".processing.live",
+    "FileReplaySource": ".processing.live",
+    "StageTiming": ".utils.profiling",
+    "format_timings": ".utils.profiling",
+}
+
+if TYPE_CHECKING:
+    from . import io
+    from .config.settings import ProcessingConfig
+    from .fiber.registry import register_fiber_array
+    from .processing.calibration import fit_reference_sphere, fit_reference_sphere_batch
+    from .processing.live import FileReplaySource, LivePipeline
+    from .processing.plan import SIFASTPlan
+    from .processing.precision import precision_report
+    from .processing.reproduce import find_logged_runs, reproduce_logged_runs
+    from .processing.scan import discover_scan_positions, process_scan
+    from .processing.sifast import SIFAST
+    from .processing.spatial_scan import merge_spatial_scans
+    from .processing.srsi import SRSI
+    from .processing.sweep import sweep_parameters
+    from .utils.profiling import StageTiming, format_timings
 
 __all__ = [
     "SRSI",
     "SIFAST",
+    "SIFASTPlan",
     "ProcessingConfig",
     "register_fiber_array",
     "io",
     "merge_spatial_scans",
+    "process_scan",
+    "discover_scan_positions",
+    "precision_report",
+    "find_logged_runs",
+    "reproduce_logged_runs",
+    "sweep_parameters",
+    "fit_reference_sphere",
+    "fit_reference_sphere_batch",
+    "LivePipeline",
+    "FileReplaySource",
+    "StageTiming",
+    "format_timings",
 ]
 __version__ = "0.1.2"
 __author__ = "Xu Yilin"
 __email__ = "xuyilin@siom.ac.cn"
+
+
+def __getattr__(name: str):
+    """Import a public name on first access."""
+    if name == "io":
+        return importlib.import_module(".io", __name__)
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    # Later accesses find the name without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
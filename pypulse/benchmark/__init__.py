@@ -0,0 +1,48 @@
+"""Benchmarks of the SIFAST/SRSI pipeline on synthetic data."""
+
+from .harness import (
+    DEFAULT_SWEEP,
+    STAGES,
+    BenchmarkCase,
+    BenchmarkResult,
+    compare_to_baseline,
+    format_comparison,
+    format_results,
+    load_baseline,
+    run_case,
+    run_sweep,
+    save_baseline,
+    sweep_cases,
+)
+from .imports import DEFAULT_IMPORT_MODULES, ImportTiming, format_import_times, measure_import_time
+from .synthetic import (
+    SyntheticDataset,
+    SyntheticField,
+    generate_sifast_data,
+    synthetic_fiber_array,
+    write_srsi_data,
+)
+
+__all__ = [
+    "STAGES",
+    "DEFAULT_SWEEP",
+    "BenchmarkCase",
+    "BenchmarkResult",
+    "run_case",
+    "run_sweep",
+    "sweep_cases",
+    "save_baseline",
+    "load_baseline",
+    "compare_to_baseline",
+    "format_results",
+    "format_comparison",
+    "DEFAULT_IMPORT_MODULES",
+    "ImportTiming",
+    "measure_import_time",
+    "format_import_times",
+    "SyntheticField",
+    "SyntheticDataset",
+    "generate_sifast_data",
+    "synthetic_fiber_array",
+    "write_srsi_data",
+]
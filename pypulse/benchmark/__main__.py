@@ -0,0 +1,71 @@
+"""Command line entry point: ``python -m pypulse.benchmark``."""
+
+import argparse
+import sys
+
+from .harness import (
+    DEFAULT_SWEEP,
+    compare_to_baseline,
+    format_comparison,
+    format_results,
+    load_baseline,
+    run_sweep,
+    save_baseline,
+)
+from .imports import DEFAULT_IMPORT_MODULES, format_import_times, measure_import_time
+
+
+def _n_fft(value: str) -> int | str:
+    return value if value == "auto" else int(value)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a benchmark sweep, optionally saving it or comparing it with a baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the SIFAST/SRSI pipeline on synthetic data")
+    parser.add_argument("--n-omega", type=int, nargs="+", default=DEFAULT_SWEEP["n_omega"])
+    parser.add_argument("--n-fft", type=_n_fft, nargs="+", default=DEFAULT_SWEEP["n_fft"])
+    parser.add_argument("--array-size", type=int, nargs="+", default=DEFAULT_SWEEP["array_size"])
+    parser.add_argument(
+        "--mode", nargs="+", default=DEFAULT_SWEEP["mode_acquire"], choices=["single", "double", "triple"]
+    )
+    parser.add_argument("--dtype", default="float64", choices=["float64", "float32"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--save", metavar="FILE", help="store the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare with a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as regression")
+    parser.add_argument(
+        "--import-time",
+        metavar="MODULE",
+        nargs="*",
+        help="time the import of modules in fresh interpreters instead of the pipeline",
+    )
+    args = parser.parse_args(argv)
+
+    if args.import_time is not None:
+        modules = args.import_time or DEFAULT_IMPORT_MODULES
+        print(format_import_times([measure_import_time(module, args.repeats) for module in modules]))
+        return 0
+
+    sweep = {"n_omega": args.n_omega, "n_fft": args.n_fft, "array_size": args.array_size, "mode_acquire": args.mode}
+
+    def progress(index, n_cases, result):
+        print(f"[{index + 1}/{n_cases}] {result.case.name}: {result.total:.3f} s", file=sys.stderr)
+
+    results = run_sweep(sweep, args.repeats, args.dtype, progress)
+    print(format_results(results))
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        rows = compare_to_baseline(results, load_baseline(args.compare), args.threshold)
+        print(format_comparison(rows))
+        if any(row["status"] == "regression" for row in rows):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,481 @@
+"""Stage timings of the SIFAST/SRSI pipeline, parameter sweeps and baseline comparison."""
+
+import copy
+import itertools
+import json
+import platform
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import scipy
+
+from ..processing.sifast import SIFAST
+from ..processing.spatial_scan import merge_spatial_scans
+from ..processing.srsi import SRSI
+from ..utils.math import wrap_phase
+from .synthetic import SyntheticField, dataset_summary, generate_sifast_data, synthetic_fiber_array, write_srsi_data
+
+STAGES = [
+    "read",
+    "fiber_detection",
+    "resampling",
+    "ftsi",
+    "delay_extraction",
+    "filtering",
+    "pulse_front",
+    "compensation",
+    "Et",
+    "merging",
+    "visualization_prep",
+    "srsi",
+]
+
+DEFAULT_SWEEP = {
+    "n_omega": [1024, 2048],
+    "n_fft": [16384, 65536],
+    "array_size": [14],
+    "mode_acquire": ["single", "triple"],
+}
+
+
+class StageTimer:
+    """Accumulates wall-clock time per named stage."""
+
+    def __init__(self):
+        self.times: dict[str, float] = {}
+        self._active: list[str] = []
+
+    @contextmanager
+    def __call__(self, stage: str) -> Iterator[None]:
+        # Nested stages are subtracted from the enclosing one
+        self._active.append(stage)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._active.pop()
+            self.times[stage] = self.times.get(stage, 0.0) + elapsed
+            if self._active:
+                parent = self._active[-1]
+                self.times[parent] = self.times.get(parent, 0.0) - elapsed
+
+
+class _TimedSIFAST(SIFAST):
+    """SIFAST recording the time of each processing stage."""
+
+    _timer: StageTimer
+
+    def _process_read_mode(self, *args, **kwargs):
+        with self._timer("read"):
+            return super()._process_read_mode(*args, **kwargs)
+
+    def _process_fiber_positions(self, *args, **kwargs):
+        with self._timer("fiber_detection"):
+            return super()._process_fiber_positions(*args, **kwargs)
+
+    def _resample_and_process_spectra(self, *args, **kwargs):
+        with self._timer("resampling"):
+            return super()._resample_and_process_spectra(*args, **kwargs)
+
+    def time_domain_signal(self, *args, **kwargs):
+        with self._timer("ftsi"):
+            return super().time_domain_signal(*args, **kwargs)
+
+    def _extract_delays(self, *args, **kwargs):
+        with self._timer("delay_extraction"):
+            return super()._extract_delays(*args, **kwargs)
+
+    def _apply_filters(self, *args, **kwargs):
+        with self._timer("filtering"):
+            return super()._apply_filters(*args, **kwargs)
+
+    def _calculate_pulse_fronts(self, *args, **kwargs):
+        with self._timer("pulse_front"):
+            return super()._calculate_pulse_fronts(*args, **kwargs)
+
+    def compensate_phase(self, *args, **kwargs):
+        with self._timer("compensation"):
+            return super().compensate_phase(*args, **kwargs)
+
+
+@dataclass
+class BenchmarkCase:
+    """One point of a benchmark sweep."""
+
+    n_omega: int = 2048
+    n_fft: int | str = 65536
+    array_size: int = 14
+    mode_acquire: str = "triple"
+    dtype: str = "float64"
+
+    @property
+    def name(self) -> str:
+        """Stable identifier used to match cases against a baseline."""
+        return f"{self.mode_acquire}-{self.array_size}x{self.array_size}-w{self.n_omega}-fft{self.n_fft}-{self.dtype}"
+
+
+@dataclass
+class BenchmarkResult:
+    """Stage timings of one benchmark case (best of the repeats, in seconds)."""
+
+    case: BenchmarkCase
+    stages: dict[str, float]
+    total: float
+    repeats: int
+    dataset: dict[str, Any] = field(default_factory=dict)
+    accuracy: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        result = asdict(self)
+        result["name"] = self.case.name
+        return result
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BenchmarkResult":
+        """Create from dictionary."""
+        data = {key: value for key, value in data.items() if key != "name"}
+        data["case"] = BenchmarkCase(**data["case"])
+        return cls(**data)
+
+
+def sweep_cases(sweep: dict[str, list[Any]] | None = None, dtype: str = "float64") -> list[BenchmarkCase]:
+    """
+    Cartesian product of sweep values.
+
+    Parameters
+    ----------
+    sweep : dict, optional
+        Values of 'n_omega', 'n_fft', 'array_size' and 'mode_acquire';
+        missing keys use :data:`DEFAULT_SWEEP`
+    dtype : str
+        Working precision of all cases
+
+    Returns
+    -------
+    list of BenchmarkCase
+        Cases, skipping those with n_fft smaller than n_omega
+    """
+    sweep = {**DEFAULT_SWEEP, **(sweep or {})}
+    unknown = set(sweep) - set(DEFAULT_SWEEP)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    cases = []
+    for n_omega, n_fft, array_size, mode_acquire in itertools.product(
+        sweep["n_omega"], sweep["n_fft"], sweep["array_size"], sweep["mode_acquire"]
+    ):
+        if n_fft != "auto" and n_fft < n_omega:
+            continue
+        cases.append(BenchmarkCase(n_omega, n_fft, array_size, mode_acquire, dtype))
+    return cases
+
+
+def _accuracy(pulse: SIFAST, dataset) -> dict[str, float]:
+    """Errors of the recovered pulse front and spectral phase against the synthetic field."""
+    row, col = pulse.row, pulse.col
+
+    # Pulse fronts are compared up to a constant, which depends on the time axis convention
+    pulse_front_error = pulse.pulse_front[row, col] - dataset.pulse_front[row, col]
+    pulse_front_error -= np.nanmean(pulse_front_error)
+
+    # Spectral phase with the pulse front delay, where the unknown spectrum is significant, up to a constant per fiber
+    truth = dataset.field.phase_difference(pulse.omega_axis) + np.outer(dataset.pulse_front[row, col], pulse.omega_axis)
+    phase_error = wrap_phase(pulse.phase_diff_packed - truth)
+    significant = pulse.Sw_unknown_packed > 0.1 * np.nanmax(pulse.Sw_unknown_packed, axis=1, keepdims=True)
+    phase_error = np.where(significant, phase_error, np.nan)
+    phase_error -= np.nanmean(phase_error, axis=1, keepdims=True)
+
+    return {
+        "pulse_front_rms_fs": float(np.sqrt(np.nanmean(pulse_front_error**2))),
+        "phase_rms_rad": float(np.sqrt(np.nanmean(phase_error**2))),
+        "fibers_detected": int(len(row)),
+    }
+
+
+def run_case(
+    case: BenchmarkCase,
+    repeats: int = 3,
+    synthetic_field: SyntheticField | None = None,
+    work_dir: str | Path | None = None,
+) -> BenchmarkResult:
+    """
+    Time every stage of the pipeline on synthetic data.
+
+    The data are generated once, written to disk and processed ``repeats``
+    times in read mode; the fastest time of each stage is kept.
+
+    Parameters
+    ----------
+    case : BenchmarkCase
+        Parameters of the run
+    repeats : int
+        Number of repetitions
+    synthetic_field : SyntheticField, optional
+        Field to generate
+    work_dir : str or Path, optional
+        Folder for the generated files, defaults to a temporary folder
+
+    Returns
+    -------
+    BenchmarkResult
+        Stage timings, dataset description and accuracy against the field
+    """
+    synthetic_field = synthetic_field or SyntheticField()
+    fiber_array_id = synthetic_fiber_array(case.array_size)
+    dataset = generate_sifast_data(synthetic_field, fiber_array_id, case.mode_acquire)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = Path(work_dir or temp_dir)
+        data_folder = dataset.write(folder / case.name)
+        # The reference pulse is a separate calibration measurement, always acquired with all three spectra
+        srsi_folder = write_srsi_data(folder / f"{case.name}-srsi", synthetic_field, "triple")
+
+        kwargs = {
+            "mode_input": "read",
+            "mode_acquire": case.mode_acquire,
+            "gate_noise_intensity": 1000.0,
+            "wavelength_center": synthetic_field.wavelength_center,
+            "wavelength_width": 100.0,
+            "n_omega": case.n_omega,
+            "n_fft": case.n_fft,
+            "fiber_array_id": fiber_array_id,
+            "delay_min": 1000.0,
+            "dtype": case.dtype,
+        }
+
+        best: dict[str, float] = {}
+        totals = []
+        for _ in range(repeats):
+            timer = StageTimer()
+            start = time.perf_counter()
+
+            with timer("srsi"):
+                reference = SRSI(
+                    srsi_folder,
+                    "triple",
+                    synthetic_field.wavelength_center,
+                    100.0,
+                    case.n_omega,
+                    case.n_fft,
+                    3,
+                    dtype=case.dtype,
+                )
+
+            pulse = _TimedSIFAST.__new__(_TimedSIFAST)
+            pulse._timer = timer
+            pulse.__init__(folder_path=data_folder, reference_pulse=reference, **kwargs)
+
+            with timer("Et"):
+                pulse.Et_packed
+
+            with timer("merging"):
+                shifted = copy.copy(pulse)
+                shifted.x_axis = pulse.x_axis + np.diff(pulse.x_axis[:2]).item() / 2
+                shifted.x_matrix = pulse.x_matrix + np.diff(pulse.x_axis[:2]).item() / 2
+                merge_spatial_scans([pulse, shifted])
+
+            try:
+                with timer("visualization_prep"):
+                    _visualization_prep(pulse)
+            except ImportError:
+                timer.times.pop("visualization_prep", None)
+
+            totals.append(time.perf_counter() - start)
+            for stage, elapsed in timer.times.items():
+                best[stage] = min(best.get(stage, np.inf), elapsed)
+
+    return BenchmarkResult(
+        case=case,
+        stages={stage: best[stage] for stage in STAGES if stage in best},
+        total=min(totals),
+        repeats=repeats,
+        dataset=dataset_summary(dataset),
+        accuracy=_accuracy(pulse, dataset),
+    )
+
+
+def _visualization_prep(pulse: SIFAST) -> None:
+    """Isosurface extraction done before rendering the field, as in plotting and the GUI."""
+    from ..visualization.mesh import IsosurfaceMeshEngine
+
+    # Only the mesh is timed, so no rendering backend is needed
+    IsosurfaceMeshEngine(pulse).mesh(-200, 200, 0, 0.5)
+
+
+def run_sweep(
+    sweep: dict[str, list[Any]] | None = None,
+    repeats: int = 3,
+    dtype: str = "float64",
+    progress_callback: Callable[[int, int, BenchmarkResult], None] | None = None,
+) -> list[BenchmarkResult]:
+    """
+    Run a benchmark sweep.
+
+    Parameters
+    ----------
+    sweep : dict, optional
+        Sweep values, see :func:`sweep_cases`
+    repeats : int
+        Repetitions per case
+    dtype : str
+        Working precision
+    progress_callback : callable, optional
+        Called with (index, n_cases, result) after each case
+
+    Returns
+    -------
+    list of BenchmarkResult
+        One result per case
+    """
+    cases = sweep_cases(sweep, dtype)
+    results = []
+    for i, case in enumerate(cases):
+        results.append(run_case(case, repeats))
+        if progress_callback is not None:
+            progress_callback(i, len(cases), results[-1])
+    return results
+
+
+def environment() -> dict[str, str]:
+    """Versions and machine information stored with a baseline."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "platform": platform.platform(),
+    }
+
+
+def save_baseline(results: list[BenchmarkResult], file_path: str | Path) -> None:
+    """
+    Store benchmark results as a baseline.
+
+    Parameters
+    ----------
+    results : list of BenchmarkResult
+        Results to store
+    file_path : str or Path
+        JSON file
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "environment": environment(),
+        "results": [result.to_dict() for result in results],
+    }
+    with open(file_path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_baseline(file_path: str | Path) -> list[BenchmarkResult]:
+    """Load benchmark results stored with :func:`save_baseline`."""
+    with open(file_path) as f:
+        data = json.load(f)
+    return [BenchmarkResult.from_dict(result) for result in data["results"]]
+
+
+def compare_to_baseline(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    threshold: float = 0.2,
+    min_time: float = 1e-3,
+) -> list[dict[str, Any]]:
+    """
+    Compare stage timings with a baseline.
+
+    Parameters
+    ----------
+    results : list of BenchmarkResult
+        Current results
+    baseline : list of BenchmarkResult
+        Baseline results, matched by case name
+    threshold : float
+        Relative slowdown reported as a regression (0.2 = 20%)
+    min_time : float
+        Stages faster than this (s) in both runs are not flagged
+
+    Returns
+    -------
+    list of dict
+        One row per case and stage with the baseline and current times,
+        their ratio and a status ('regression', 'improvement', 'ok' or 'new')
+    """
+    baseline_by_name = {result.case.name: result for result in baseline}
+    rows = []
+    for result in results:
+        reference = baseline_by_name.get(result.case.name)
+        for stage, current in [*result.stages.items(), ("total", result.total)]:
+            previous = None
+            if reference is not None:
+                previous = reference.total if stage == "total" else reference.stages.get(stage)
+
+            if previous is None:
+                ratio, status = None, "new"
+            else:
+                ratio = current / previous if previous > 0 else np.inf
+                if max(current, previous) < min_time:
+                    status = "ok"
+                elif ratio > 1 + threshold:
+                    status = "regression"
+                elif ratio < 1 / (1 + threshold):
+                    status = "improvement"
+                else:
+                    status = "ok"
+            rows.append(
+                {
+                    "case": result.case.name,
+                    "stage": stage,
+                    "baseline_s": previous,
+                    "current_s": current,
+                    "ratio": ratio,
+                    "status": status,
+                }
+            )
+    return rows
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    """Format stage timings as a table, one column per case (ms)."""
+    if not results:
+        return "No benchmark results"
+
+    names = [result.case.name for result in results]
+    width = max(14, *(len(name) for name in names))
+    stage_width = max(len(stage) for stage in STAGES)
+    lines = [" " * stage_width + "  " + "  ".join(f"{name:>{width}s}" for name in names)]
+    for stage in [*STAGES, "total"]:
+        values = []
+        for result in results:
+            value = result.total if stage == "total" else result.stages.get(stage)
+            values.append(f"{1e3 * value:>{width}.1f}" if value is not None else " " * (width - 1) + "-")
+        lines.append(f"{stage:<{stage_width}s}  " + "  ".join(values))
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list[dict[str, Any]], only_changes: bool = False) -> str:
+    """Format a baseline comparison as a regression report."""
+    lines = [f"{'case':<40s} {'stage':<20s} {'baseline ms':>12s} {'current ms':>12s} {'ratio':>7s}  status"]
+    n_regressions = 0
+    for row in rows:
+        n_regressions += row["status"] == "regression"
+        if only_changes and row["status"] == "ok":
+            continue
+        baseline = f"{1e3 * row['baseline_s']:.1f}" if row["baseline_s"] is not None else "-"
+        ratio = f"{row['ratio']:.2f}" if row["ratio"] is not None else "-"
+        lines.append(
+            f"{row['case']:<40s} {row['stage']:<20s} {baseline:>12s} {1e3 * row['current_s']:>12.1f} {ratio:>7s}"
+            f"  {row['status']}"
+        )
+    lines.append(f"{n_regressions} regression(s)")
+    return "\n".join(lines)
@@ -0,0 +1,78 @@
+"""Import time of pypulse modules, measured in fresh interpreters."""
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Modules imported by batch scripts and worker processes, and by plotting code
+DEFAULT_IMPORT_MODULES = ["pypulse", "pypulse.processing.sifast", "pypulse.visualization.plotting"]
+
+# Dependencies whose import is reported
+HEAVY_MODULES = ["numpy", "scipy", "h5py", "pandas", "skimage", "matplotlib", "plotly", "mayavi", "vtk", "PySide6"]
+
+_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+@dataclass
+class ImportTiming:
+    """Import times of a module in fresh interpreters (seconds)."""
+
+    module: str
+    times: list[float]
+    loaded: list[str] = field(default_factory=list)  # heavy dependencies the import loaded
+
+    @property
+    def best(self) -> float:
+        return min(self.times)
+
+
+def measure_import_time(module: str = "pypulse", repeats: int = 5) -> ImportTiming:
+    """
+    Time the import of a module in new Python processes.
+
+    Parameters
+    ----------
+    module : str
+        Module to import
+    repeats : int
+        Number of processes
+
+    Returns
+    -------
+    ImportTiming
+        Time of each import and the heavy dependencies it loaded
+    """
+    # The package is found from the source tree whatever the working directory
+    root = str(Path(__file__).resolve().parents[2])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    script = _SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+
+    times, loaded = [], []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        elapsed, loaded = json.loads(output.strip().splitlines()[-1])
+        times.append(elapsed)
+    return ImportTiming(module, times, loaded)
+
+
+def format_import_times(timings: list[ImportTiming]) -> str:
+    """Format import times as a table (ms)."""
+    width = max(6, *(len(timing.module) for timing in timings))
+    lines = [f"{'module':<{width}s}  {'best ms':>9s}  {'worst ms':>9s}  loaded"]
+    for timing in timings:
+        lines.append(
+            f"{timing.module:<{width}s}  {1e3 * timing.best:>9.1f}  {1e3 * max(timing.times):>9.1f}  "
+            + (", ".join(timing.loaded) or "-")
+        )
+    return "\n".join(lines)
@@ -0,0 +1,370 @@
+"""Synthetic SIFAST and SRSI measurements of a known spatiotemporal field."""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ..core.base import PulseInterface
+from ..fiber.registry import get_fiber_array, register_fiber_array
+from ..io.writers import DataWriter
+from ..processing.calibration import reference_geometry
+
+_C = PulseInterface.SPEED_OF_LIGHT
+_CHANNELS = {
+    "single": ["interference"],
+    "double": ["interference", "unknown"],
+    "triple": ["interference", "unknown", "reference"],
+}
+
+
+@dataclass
+class SyntheticField:
+    """
+    Known spatiotemporal field used to generate synthetic measurements.
+
+    The unknown pulse has a Gaussian spectrum, a polynomial spectral phase,
+    a weak post-pulse and a pulse front that is tilted and curved across the
+    fiber array. The reference pulse is a spherical wave described by the
+    usual reference parameters.
+    """
+
+    wavelength_center: float = 800.0  # nm
+    bandwidth: float = 40.0  # FWHM, nm
+    gdd: float = 200.0  # fs^2
+    tod: float = 0.0  # fs^3
+    pulse_front_tilt: float = 2.0  # fs/mm along x
+    pulse_front_curvature: float = 0.5  # fs/mm^2
+    beam_radius: float = 8.0  # 1/e^2 intensity radius, mm
+    satellite_amplitude: float = 0.1  # relative field amplitude of the post-pulse
+    satellite_delay: float = 300.0  # fs
+    reference_parameters: dict[str, float] = field(
+        default_factory=lambda: {"x0": 0.0, "y0": 0.0, "L": 1000.0, "tau0": 3000.0}
+    )
+
+    @property
+    def omega_center(self) -> float:
+        """Central angular frequency (rad/fs)."""
+        return 2 * np.pi * _C / self.wavelength_center
+
+    def spectrum(self, wavelength: npt.NDArray[np.float64], bandwidth: float | None = None) -> npt.NDArray[np.float64]:
+        """Normalized spectral intensity on a wavelength axis."""
+        width = bandwidth or self.bandwidth
+        return np.exp(-4 * np.log(2) * ((wavelength - self.wavelength_center) / width) ** 2)
+
+    def spectral_phase(self, omega: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Spectral phase relative to the central frequency (rad)."""
+        return self.gdd / 2 * omega**2 + self.tod / 6 * omega**3
+
+    def satellite(self, omega: npt.NDArray[np.float64]) -> npt.NDArray[np.complex128]:
+        """Spectral modulation of the unknown field by the post-pulse."""
+        return 1 + self.satellite_amplitude * np.exp(1j * omega * self.satellite_delay)
+
+    def phase_difference(self, omega: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Spectral phase including the post-pulse, as recovered by SIFAST before adding the pulse front (rad)."""
+        return self.spectral_phase(omega) - np.angle(self.satellite(omega))
+
+    def pulse_front(self, x: npt.NDArray[np.float64], y: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Pulse front delay at the fiber positions (fs)."""
+        return self.pulse_front_tilt * x + self.pulse_front_curvature * (x**2 + y**2)
+
+    def intensity(self, x: npt.NDArray[np.float64], y: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Relative beam intensity at the fiber positions."""
+        return np.exp(-2 * (x**2 + y**2) / self.beam_radius**2)
+
+
+@dataclass
+class SyntheticDataset:
+    """Synthetic SIFAST measurement and the field it was generated from."""
+
+    field: SyntheticField
+    fiber_array_id: str
+    mode_acquire: str
+    wavelength: npt.NDArray[np.float64]
+    images: dict[str, npt.NDArray[np.int32]]
+    pixel_positions: npt.NDArray[np.int64]  # 1-based camera row of each fiber number
+    pulse_front: npt.NDArray[np.float64]  # (ny, nx), fs
+    time_interval: npt.NDArray[np.float64]  # (ny, nx), fs
+
+    def write(self, folder_path: str | Path) -> Path:
+        """
+        Write the measurement in the layout read by SIFAST in read mode.
+
+        Parameters
+        ----------
+        folder_path : str or Path
+            Output folder, the configuration goes to its ``config`` subfolder
+
+        Returns
+        -------
+        Path
+            Output folder
+        """
+        folder = Path(folder_path)
+        DataWriter.save_sifast_data(
+            folder,
+            self.wavelength,
+            self.images["interference"],
+            self.images.get("unknown"),
+            self.images.get("reference"),
+        )
+
+        config_folder = folder / "config"
+        config_folder.mkdir(parents=True, exist_ok=True)
+        np.savetxt(config_folder / "setting_fiber_calibration.csv", self.pixel_positions, fmt="%d", delimiter=",")
+        with open(config_folder / "reference_parameters.json", "w") as f:
+            json.dump(self.field.reference_parameters, f, indent=2)
+        return folder
+
+
+def synthetic_fiber_array(nx: int, ny: int | None = None, spacing: float = 1.1) -> str:
+    """
+    Register a rectangular fiber array of the given size.
+
+    Parameters
+    ----------
+    nx, ny : int
+        Number of fibers along x and y (``ny`` defaults to ``nx``)
+    spacing : float
+        Fiber spacing (mm)
+
+    Returns
+    -------
+    str
+        Array identifier
+    """
+    ny = ny or nx
+    array_id = f"synthetic_{nx}x{ny}_{spacing:g}"
+    register_fiber_array(
+        array_id, {"type": f"rectangular_{nx}x{ny}", "nx": nx, "ny": ny, "spacing": spacing}, auto_save=False
+    )
+    return array_id
+
+
+def generate_sifast_data(
+    synthetic_field: SyntheticField | None = None,
+    fiber_array_id: str = "default_14x14",
+    mode_acquire: str = "triple",
+    n_wavelengths: int = 2048,
+    wavelength_span: float = 200.0,
+    n_rows: int | None = None,
+    pixel_spacing: int = 8,
+    first_pixel: int = 32,
+    peak_counts: float = 20000.0,
+    background: float = 100.0,
+    read_noise: float = 10.0,
+    seed: int = 0,
+) -> SyntheticDataset:
+    """
+    Generate camera images of a known field for a registered fiber array.
+
+    Each fiber is imaged onto one camera row (with a Gaussian spread of about
+    one pixel onto its neighbors). The interference image contains the
+    spectral fringes of the reference and unknown pulses, delayed by the
+    reference pulse front minus the unknown pulse front. Shot noise, read
+    noise and a constant background are added.
+
+    Parameters
+    ----------
+    synthetic_field : SyntheticField, optional
+        Field to generate, defaults to ``SyntheticField()``
+    fiber_array_id : str
+        Registered fiber array
+    mode_acquire : str
+        Acquisition mode ('single', 'double', 'triple')
+    n_wavelengths : int
+        Number of camera columns
+    wavelength_span : float
+        Wavelength range covered by the camera (nm)
+    n_rows : int, optional
+        Number of camera rows, defaults to at least 2048
+    pixel_spacing : int
+        Camera rows between neighboring fibers
+    first_pixel : int
+        Camera row of the first fiber (0-based)
+    peak_counts : float
+        Peak signal of the unknown spectrum at the beam center
+    background : float
+        Constant camera background (counts)
+    read_noise : float
+        Gaussian read noise (counts)
+    seed : int
+        Random seed of the noise
+
+    Returns
+    -------
+    SyntheticDataset
+        Images, calibration and ground truth
+    """
+    if mode_acquire not in _CHANNELS:
+        raise ValueError(f"Invalid mode_acquire: {mode_acquire}")
+
+    synthetic_field = synthetic_field or SyntheticField()
+    rng = np.random.default_rng(seed)
+
+    fiber_array = get_fiber_array(fiber_array_id)
+    x = fiber_array.x_matrix.ravel()
+    y = fiber_array.y_matrix.ravel()
+    n_fibers = x.size
+
+    n_needed = first_pixel + n_fibers * pixel_spacing + first_pixel
+    n_rows = n_rows or max(2048, n_needed)
+    if n_rows < n_needed:
+        raise ValueError(f"{n_fibers} fibers need at least {n_needed} camera rows")
+    pixel_positions = first_pixel + pixel_spacing * np.arange(n_fibers)
+
+    # Camera axis and relative frequencies
+    wavelength_center = synthetic_field.wavelength_center
+    wavelength = np.linspace(
+        wavelength_center - wavelength_span / 2, wavelength_center + wavelength_span / 2, n_wavelengths
+    )
+    omega = 2 * np.pi * _C / wavelength - synthetic_field.omega_center
+
+    # Pulse fronts and the resulting delays
+    geometry = reference_geometry(fiber_array_id, 0, 0, synthetic_field.reference_parameters, wavelength_center)
+    pulse_front = synthetic_field.pulse_front(x, y)
+    pulse_front_reference = geometry.pulse_front_reference.ravel()
+    time_interval = pulse_front_reference - pulse_front
+    spherical_phase = geometry.spherical_phase.ravel()
+
+    # Spectra of every fiber, the fringes delayed by the time interval and carrying the spectral and spherical phases
+    satellite = synthetic_field.satellite(omega)
+    S_unknown = peak_counts * synthetic_field.intensity(x, y)[:, np.newaxis] * synthetic_field.spectrum(wavelength)
+    S_reference = 0.8 * peak_counts * synthetic_field.spectrum(wavelength, 1.2 * synthetic_field.bandwidth)
+    S_reference = np.broadcast_to(S_reference, S_unknown.shape)
+    phase = omega * time_interval[:, np.newaxis] - synthetic_field.spectral_phase(omega)
+    phase -= spherical_phase[:, np.newaxis]
+    fringes = 2 * np.sqrt(S_reference * S_unknown) * np.real(satellite * np.exp(1j * phase))
+    spectra = {
+        "interference": S_reference + S_unknown * np.abs(satellite) ** 2 + fringes,
+        "unknown": S_unknown * np.abs(satellite) ** 2,
+        "reference": S_reference,
+    }
+
+    # Spread each fiber over neighboring rows and add noise
+    spread = np.exp(-0.5 * np.arange(-3, 4) ** 2 / 1.2**2)
+    spread /= spread.max()
+    images = {}
+    for channel in _CHANNELS[mode_acquire]:
+        image = np.zeros((n_rows, n_wavelengths))
+        for offset, weight in zip(range(-3, 4), spread):
+            rows = pixel_positions + offset
+            inside = (rows >= 0) & (rows < n_rows)
+            image[rows[inside]] += weight * spectra[channel][inside]
+        image += rng.normal(0, 1, image.shape) * np.sqrt(image + read_noise**2) + background
+        images[channel] = np.clip(np.rint(image), 0, None).astype(np.int32)
+
+    shape = fiber_array.shape
+    return SyntheticDataset(
+        field=synthetic_field,
+        fiber_array_id=fiber_array_id,
+        mode_acquire=mode_acquire,
+        wavelength=wavelength,
+        images=images,
+        pixel_positions=pixel_positions + 1,
+        pulse_front=pulse_front.reshape(shape),
+        time_interval=time_interval.reshape(shape),
+    )
+
+
+def write_srsi_data(
+    folder_path: str | Path,
+    synthetic_field: SyntheticField | None = None,
+    mode_acquire: str = "triple",
+    delay: float = 800.0,
+    n_points: int = 3648,
+    wavelength_span: float = 300.0,
+    seed: int = 0,
+) -> Path:
+    """
+    Write synthetic SRSI spectrometer files for the unknown pulse of a field.
+
+    The reference is the cubic (XPW-like) nonlinearity of the unknown pulse,
+    interfering with the unknown pulse delayed by ``delay``.
+
+    Parameters
+    ----------
+    folder_path : str or Path
+        Output folder
+    synthetic_field : SyntheticField, optional
+        Field whose spectral phase is measured
+    mode_acquire : str
+        Acquisition mode ('single', 'double', 'triple')
+    delay : float
+        Delay between the pulses (fs)
+    n_points : int
+        Number of spectrometer pixels
+    wavelength_span : float
+        Spectrometer wavelength range (nm)
+    seed : int
+        Random seed of the noise
+
+    Returns
+    -------
+    Path
+        Output folder
+    """
+    if mode_acquire not in _CHANNELS:
+        raise ValueError(f"Invalid mode_acquire: {mode_acquire}")
+
+    synthetic_field = synthetic_field or SyntheticField()
+    rng = np.random.default_rng(seed)
+    wavelength_center = synthetic_field.wavelength_center
+    wavelength = np.linspace(wavelength_center - wavelength_span / 2, wavelength_center + wavelength_span / 2, n_points)
+
+    # Unknown field on a uniform frequency grid, then the cubic nonlinearity in time
+    omega_uniform = np.linspace(-0.6, 0.6, 4096)
+    wavelength_uniform = 2 * np.pi * _C / (omega_uniform + synthetic_field.omega_center)
+    E_unknown = np.sqrt(synthetic_field.spectrum(wavelength_uniform)) * np.exp(
+        -1j * synthetic_field.spectral_phase(omega_uniform)
+    )
+    E_unknown *= np.conj(synthetic_field.satellite(omega_uniform))
+    Et = np.fft.ifft(np.fft.ifftshift(E_unknown))
+    E_reference = np.fft.fftshift(np.fft.fft(Et * np.abs(Et) ** 2))
+    E_reference *= np.abs(E_unknown).max() / np.abs(E_reference).max()
+
+    # Back onto the spectrometer axis
+    omega = 2 * np.pi * _C / wavelength - synthetic_field.omega_center
+
+    def on_axis(values: npt.NDArray[np.complex128]) -> npt.NDArray[np.complex128]:
+        real = np.interp(omega, omega_uniform, values.real, 0, 0)
+        return real + 1j * np.interp(omega, omega_uniform, values.imag, 0, 0)
+
+    E_unknown = on_axis(E_unknown)
+    E_reference = on_axis(E_reference)
+    spectra = {
+        "interference": np.abs(E_reference + E_unknown * np.exp(-1j * omega * delay)) ** 2,
+        "unknown": np.abs(E_unknown) ** 2,
+        "reference": np.abs(E_reference) ** 2,
+    }
+
+    folder = Path(folder_path)
+    folder.mkdir(parents=True, exist_ok=True)
+    header = "\n".join(["Synthetic SRSI spectrum"] + [""] * 12 + [">>>>>Begin Spectral Data<<<<<"])
+    for channel, name in [("interference", "inter"), ("unknown", "unk"), ("reference", "ref")]:
+        if channel not in _CHANNELS[mode_acquire]:
+            continue
+        counts = 1e4 * spectra[channel] + rng.normal(0, 5, n_points)
+        np.savetxt(
+            folder / f"{name}.txt",
+            np.column_stack([wavelength, counts]),
+            delimiter="\t",
+            header=header,
+            comments="",
+            encoding="iso-8859-1",
+        )
+    return folder
+
+
+def dataset_summary(dataset: SyntheticDataset) -> dict[str, Any]:
+    """Sizes describing a synthetic dataset, for benchmark records."""
+    image = dataset.images["interference"]
+    return {
+        "fiber_array_id": dataset.fiber_array_id,
+        "n_fibers": int(dataset.pixel_positions.size),
+        "image_shape": list(image.shape),
+        "mode_acquire": dataset.mode_acquire,
+    }
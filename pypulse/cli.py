@@ -0,0 +1,288 @@
+"""
+Headless command line interface: ``python -m pypulse``.
+
+Each subcommand streams its progress to stdout as JSON lines, one event per
+line, so batch jobs can be monitored and their logs parsed. The interface
+imports neither Qt nor the plotting backends.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+RESULT_FILENAME = "sifast_result.h5"
+SCAN_RESULT_FILENAME = "sifast_scan_result.h5"
+
+
+def emit(event: str, **fields: Any) -> None:
+    """Write one JSON progress event to stdout."""
+    from .io.history import SerializableEncoder
+
+    print(json.dumps({"event": event, "time": time.time(), **fields}, cls=SerializableEncoder), flush=True)
+
+
+def _status(message: str, level: str = "INFO") -> None:
+    emit("status", level=level, message=message)
+
+
+def _progress(percent: int) -> None:
+    emit("progress", percent=percent)
+
+
+def _load_config(args: argparse.Namespace):
+    """Processing configuration and the fiber array it uses."""
+    from .config.settings import ProcessingConfig
+    from .fiber.registry import get_fiber_array_config, register_fiber_array
+
+    config = ProcessingConfig.load(Path(args.config)) if args.config else ProcessingConfig()
+    for file in args.fiber_array or []:
+        with open(file) as f:
+            register_fiber_array(Path(file).stem, json.load(f), auto_save=False)
+    return config, get_fiber_array_config(config.fiber_array_id)
+
+
+def _load_reference(args: argparse.Namespace, config):
+    """
+    Reference pulse of ``--reference``.
+
+    A JSON file holds SRSI arguments as stored in the processing history; a
+    folder is processed with the spectral settings of the configuration.
+    """
+    if not args.reference:
+        return None
+
+    from .processing.srsi import SRSI
+
+    path = Path(args.reference)
+    if path.is_dir():
+        return SRSI(
+            path,
+            config.mode_acquire,
+            config.wavelength_center,
+            config.wavelength_width,
+            config.n_omega,
+            config.n_fft,
+            args.reference_iterations,
+            config.method,
+            config.dtype,
+            config.time_resolution,
+        )
+    with open(path) as f:
+        return SRSI(**json.load(f))
+
+
+def _measurement_folders(paths: list[str]) -> list[Path]:
+    """Measurement folders given or found below the given paths."""
+    from .processing.scan import _has_measurement_data, _natural_key
+
+    folders = []
+    for path in map(Path, paths):
+        if not path.is_dir():
+            raise FileNotFoundError(f"Folder does not exist: {path}")
+        if _has_measurement_data(path):
+            folders.append(path)
+        else:
+            found = {file.parent for ext in ("h5", "hdf5", "csv") for file in path.rglob(f"*inter*.{ext}")}
+            folders.extend(sorted(found, key=lambda folder: [_natural_key(Path(part)) for part in folder.parts]))
+    return folders
+
+
+def _output_path(folder: Path, folders: list[Path], output: str | None) -> Path:
+    """Result file of a folder, mirroring the folder tree under ``output``."""
+    if output is None:
+        return folder / RESULT_FILENAME
+    root = Path(os.path.commonpath([f.resolve() for f in folders]))
+    return Path(output) / folder.resolve().relative_to(root) / RESULT_FILENAME
+
+
+def _process_folder(
+    kwargs: dict[str, Any], fiber_array_config: dict[str, Any], output: Path, record_history: bool
+) -> dict[str, Any]:
+    """Process one folder and write its result (runs in a worker process)."""
+    from .fiber.registry import register_fiber_array
+    from .io.writers import DataWriter
+    from .processing.sifast import SIFAST
+
+    # Worker processes do not share the parent's fiber array registry
+    register_fiber_array(kwargs["fiber_array_id"], fiber_array_config, auto_save=False)
+    start = time.perf_counter()
+    pulse = SIFAST(**kwargs, record_history=record_history)
+    DataWriter.save_sifast_result(output, pulse)
+    return {"n_fibers": len(pulse.row), "duration": time.perf_counter() - start}
+
+
+def command_process(args: argparse.Namespace) -> int:
+    """Process measurement folders in parallel, one HDF5 result per folder."""
+    config, fiber_array_config = _load_config(args)
+    reference_pulse = _load_reference(args, config)
+    folders = _measurement_folders(args.folders)
+    if not folders:
+        raise FileNotFoundError("No measurement folders found")
+
+    base_kwargs = config.to_dict()
+    base_kwargs.update(mode_input="read", reference_pulse=reference_pulse, config_folder_path=args.config_folder)
+    emit("start", command="process", total=len(folders))
+
+    n_failed = 0
+    max_workers = args.workers or min(len(folders), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for folder in folders:
+            output = _output_path(folder, folders, args.output)
+            kwargs = dict(base_kwargs, folder_path=str(folder))
+            future = executor.submit(_process_folder, kwargs, fiber_array_config, output, not args.no_history)
+            futures[future] = (folder, output)
+
+        for n_done, future in enumerate(as_completed(futures), 1):
+            folder, output = futures[future]
+            progress = int(100 * n_done / len(futures))
+            try:
+                emit("done", folder=folder, output=output, progress=progress, **future.result())
+            except Exception as e:
+                n_failed += 1
+                emit("failed", folder=folder, progress=progress, error=f"{type(e).__name__}: {e}")
+
+    emit("finished", succeeded=len(folders) - n_failed, failed=n_failed)
+    return 1 if n_failed else 0
+
+
+def command_scan(args: argparse.Namespace) -> int:
+    """Process the positions of a spatial scan in parallel and merge them."""
+    from .io.writers import DataWriter
+    from .processing.scan import process_scan
+
+    config, _ = _load_config(args)
+    reference_pulse = _load_reference(args, config)
+    emit("start", command="scan", folder=args.scan_folder)
+
+    merged = process_scan(
+        args.scan_folder,
+        config,
+        reference_pulse=reference_pulse,
+        config_folder_path=args.config_folder,
+        max_workers=args.workers,
+        unwrap_before_merge=args.unwrap_before_merge,
+        n_neighbors=args.n_neighbors,
+        progress_callback=_progress,
+        status_callback=_status,
+    )
+
+    output = Path(args.output) if args.output else Path(args.scan_folder) / SCAN_RESULT_FILENAME
+    DataWriter.save_sifast_result(output, merged)
+    emit("finished", output=output, n_fibers=len(merged.row))
+    return 0
+
+
+def command_convert(args: argparse.Namespace) -> int:
+    """Convert the CSV measurements below folders to HDF5."""
+    from .io.converters import batch_convert_csv_to_hdf5
+
+    emit("start", command="convert", total=len(args.folders))
+    n_failed = 0
+    for folder in args.folders:
+        succeeded, total = batch_convert_csv_to_hdf5(folder, args.mode, args.remove_csv, verbose=False)
+        n_failed += total - succeeded
+        emit("done", folder=folder, succeeded=succeeded, total=total)
+
+    emit("finished", failed=n_failed)
+    return 1 if n_failed else 0
+
+
+def command_reproduce(args: argparse.Namespace) -> int:
+    """Re-run the logged runs below a folder and compare them with their stored results."""
+    from .processing.reproduce import reproduce_logged_runs
+
+    emit("start", command="reproduce", folder=args.folder)
+    report = reproduce_logged_runs(
+        args.folder,
+        max_workers=args.workers,
+        delay_tolerance=args.delay_tolerance,
+        phase_tolerance=args.phase_tolerance,
+        progress_callback=_progress,
+        status_callback=_status,
+    )
+    if args.report:
+        report.save(args.report)
+
+    counts = report.counts()
+    emit("finished", counts=counts, duration=report.duration, report=args.report)
+    return 1 if counts.get("changed") or counts.get("failed") else 0
+
+
+def command_bench(args: argparse.Namespace) -> int:
+    """Run the pipeline benchmark, see ``python -m pypulse.benchmark --help``."""
+    from .benchmark.__main__ import main
+
+    return main(args.arguments)
+
+
+def _add_processing_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments shared by the commands that process measurements."""
+    parser.add_argument("--config", metavar="FILE", help="ProcessingConfig JSON, defaults for missing fields")
+    parser.add_argument("--config-folder", metavar="DIR", help="external device configuration folder")
+    parser.add_argument(
+        "--fiber-array", metavar="FILE", action="append", help="fiber array configuration JSON, named by its file"
+    )
+    parser.add_argument("--reference", metavar="PATH", help="SRSI arguments JSON or SRSI measurement folder")
+    parser.add_argument("--reference-iterations", type=int, default=3, help="SRSI iterations for a reference folder")
+    parser.add_argument("--workers", type=int, help="number of worker processes (defaults to the CPU count)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser of the command line interface."""
+    parser = argparse.ArgumentParser(prog="pypulse", description="Headless SIFAST batch processing")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    process = subparsers.add_parser("process", help="process measurement folders")
+    process.add_argument("folders", nargs="+", help="measurement folders, or folders searched for measurements")
+    process.add_argument("--output", metavar="DIR", help="result folder, mirroring the measurement folders")
+    process.add_argument("--no-history", action="store_true", help="do not append to the processing histories")
+    _add_processing_arguments(process)
+    process.set_defaults(handler=command_process)
+
+    scan = subparsers.add_parser("scan", help="process and merge a spatial scan")
+    scan.add_argument("scan_folder", help="folder with one subfolder per scan position")
+    scan.add_argument("--output", metavar="FILE", help=f"result file (defaults to {SCAN_RESULT_FILENAME} in the scan)")
+    scan.add_argument("--unwrap-before-merge", action="store_true", help="unwrap the phases before merging")
+    scan.add_argument("--n-neighbors", type=int, default=3, help="neighbors for the phase interpolation")
+    _add_processing_arguments(scan)
+    scan.set_defaults(handler=command_scan)
+
+    convert = subparsers.add_parser("convert", help="convert CSV measurements to HDF5")
+    convert.add_argument("folders", nargs="+", help="folders searched for CSV measurements")
+    convert.add_argument("--mode", default="auto", choices=["auto", "single", "double", "triple"])
+    convert.add_argument("--remove-csv", action="store_true", help="remove the CSV files after conversion")
+    convert.set_defaults(handler=command_convert)
+
+    reproduce = subparsers.add_parser("reproduce", help="reproduce logged runs and compare their results")
+    reproduce.add_argument("folder", help="folder searched for processing histories")
+    reproduce.add_argument("--workers", type=int, help="number of worker processes (defaults to the CPU count)")
+    reproduce.add_argument("--report", metavar="FILE", help="save the report as JSON")
+    reproduce.add_argument("--delay-tolerance", type=float, default=0.01, help="largest delay difference (fs)")
+    reproduce.add_argument("--phase-tolerance", type=float, default=1e-3, help="largest phase difference (rad)")
+    reproduce.set_defaults(handler=command_reproduce)
+
+    # The arguments of the benchmark, including --help, are passed on unparsed
+    bench = subparsers.add_parser("bench", help="benchmark the pipeline on synthetic data", add_help=False)
+    bench.set_defaults(handler=command_bench)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run a subcommand, returning the exit code."""
+    parser = build_parser()
+    args, arguments = parser.parse_known_args(argv)
+    if args.command == "bench":
+        args.arguments = arguments
+    elif arguments:
+        parser.error(f"unrecognized arguments: {' '.join(arguments)}")
+    try:
+        return args.handler(args)
+    except Exception as e:
+        emit("error", command=args.command, error=f"{type(e).__name__}: {e}")
+        return 1
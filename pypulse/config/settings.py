@@ -20,9 +20,10 @@ class ProcessingConfig:
     wavelength_center: float = 800.0
     wavelength_width: float = 100.0
 
-    # FFT settings
+    # FFT settings ('auto' picks the smallest n_fft whose time step is below time_resolution)
     n_omega: int = 2048
-    n_fft: int = 65536
+    n_fft: int | str = 65536
+    time_resolution: float = 2.0
 
     # Fiber array settings
     fiber_array_id: str = "default_14x14"
@@ -35,6 +36,12 @@ class ProcessingConfig:
     delay_min: float | None = None
     as_calibration: bool = False
 
+    # Precision settings ('float64' or 'float32')
+    dtype: str = "float64"
+
+    # Record per-stage timings and memory in SIFAST.timings
+    profile: bool = False
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
         return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
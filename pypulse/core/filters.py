@@ -0,0 +1,265 @@
+"""Super-Gaussian time-domain windows evaluated on their support only."""
+
+import math
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+_BANK_CACHE_SIZE = 16
+_bank_cache: dict[tuple[Any, ...], "SuperGaussianFilterBank"] = {}
+
+
+def even_power(x: npt.NDArray[np.floating], order: int) -> npt.NDArray[np.floating]:
+    """
+    Raise ``x`` to an even integer power in place.
+
+    Powers of two are computed by repeated squaring, which is much faster
+    than ``np.power`` with an integer exponent.
+
+    Parameters
+    ----------
+    x : array_like
+        Real array, overwritten with the result
+    order : int
+        Even exponent
+
+    Returns
+    -------
+    array_like
+        ``x``
+    """
+    np.square(x, out=x)
+    half = order // 2
+    if half & (half - 1) == 0:
+        while half > 1:
+            np.square(x, out=x)
+            half //= 2
+    elif half > 1:
+        np.power(x, half, out=x)
+    return x
+
+
+class SuperGaussianFilterBank:
+    """
+    AC and DC windows of Fourier transform spectral interferometry.
+
+    For a delay ``d`` the AC window is ``exp(-((t - d) / w) ** order)`` and the
+    DC window ``exp(-(t / w) ** order)``, with ``w`` chosen so that both
+    windows fall to 1e-3 at ``d / 2``. A window is below the tolerance
+    outside ``|t - center| < w * (-ln tolerance) ** (1 / order)``, so it is
+    evaluated and applied only on the samples within that range.
+
+    Delays are quantized to a fraction of the sample spacing and the windows
+    of each quantized delay are cached as templates, so fibers and shots with
+    the same delay share them.
+    """
+
+    def __init__(
+        self,
+        t_axis: npt.NDArray[np.float64],
+        order: int = 8,
+        dtype: str | np.dtype = "float64",
+        subdivisions: int = 16,
+        tolerance: float | None = None,
+        max_templates: int = 4096,
+    ):
+        """
+        Initialize filter bank.
+
+        Parameters
+        ----------
+        t_axis : array_like
+            Uniform time axis (fs)
+        order : int
+            Super-Gaussian order (must be even)
+        dtype : str or dtype
+            Working precision of the windows
+        subdivisions : int
+            Delays are quantized to ``dt / subdivisions``
+        tolerance : float, optional
+            Window values below this are treated as zero, defaults to the
+            machine epsilon of ``dtype``
+        max_templates : int
+            Maximum number of cached templates
+        """
+        if order <= 0 or order % 2 != 0:
+            raise ValueError("Filter order must be even")
+        if subdivisions < 1:
+            raise ValueError("subdivisions must be positive")
+
+        self.dtype = np.dtype(dtype)
+        self.order = order
+        t_axis = np.asarray(t_axis, dtype=np.float64)
+        self.n_fft = len(t_axis)
+        self.t0 = float(t_axis[0])
+        self.dt = float(t_axis[1] - t_axis[0])
+        self.quantum = self.dt / subdivisions
+        self.tolerance = float(np.finfo(self.dtype).eps) if tolerance is None else tolerance
+        self.max_templates = max_templates
+
+        self._t = t_axis.astype(self.dtype)
+        self._width_factor = float((-np.log(0.001)) ** (-1 / order))
+        self._reach = float((-np.log(self.tolerance)) ** (1 / order))
+        self._templates: dict[int, tuple[tuple[int, npt.NDArray[np.floating]], ...]] = {}
+
+    def support(self, center: float, width: float) -> tuple[int, int]:
+        """
+        Sample range where a window is above the tolerance.
+
+        Parameters
+        ----------
+        center : float
+            Window center (fs)
+        width : float
+            Window width (fs)
+
+        Returns
+        -------
+        tuple[int, int]
+            Start and stop indices on the time axis
+        """
+        half = self._reach * abs(width)
+        start = max(math.ceil((center - half - self.t0) / self.dt), 0)
+        stop = min(math.floor((center + half - self.t0) / self.dt) + 1, self.n_fft)
+        return start, max(start, stop)
+
+    def _window(self, center: np.floating, width: np.floating) -> tuple[int, npt.NDArray[np.floating]]:
+        """Window values on its support, with the start index."""
+        start, stop = self.support(float(center), float(width))
+        values = self._t[start:stop] - center
+        values /= width
+        even_power(values, self.order)
+        np.negative(values, out=values)
+        np.exp(values, out=values)
+        values.setflags(write=False)
+        return start, values
+
+    def templates(self, key: int) -> tuple[tuple[int, npt.NDArray[np.floating]], ...]:
+        """
+        AC and DC windows of a quantized delay.
+
+        Parameters
+        ----------
+        key : int
+            Quantized delay, ``round((delay - t0) / quantum)``
+
+        Returns
+        -------
+        tuple
+            ``(start, values)`` of the AC and of the DC window
+        """
+        windows = self._templates.get(key)
+        if windows is None:
+            delay = self.dtype.type(self.t0 + key * self.quantum)
+            width = self._width_factor * delay / 2
+            windows = (self._window(delay, width), self._window(self.dtype.type(0), width))
+            if len(self._templates) >= self.max_templates:
+                self._templates.pop(next(iter(self._templates)), None)
+            self._templates[key] = windows
+        return windows
+
+    def _pieces(self, start: int, length: int, shift: int) -> list[tuple[slice, slice]]:
+        """Split a window into contiguous (values, data) slices of a circularly shifted axis."""
+        first = (start + shift) % self.n_fft
+        if first + length <= self.n_fft:
+            return [(slice(0, length), slice(first, first + length))]
+        split = self.n_fft - first
+        return [(slice(0, split), slice(first, self.n_fft)), (slice(split, length), slice(0, length - split))]
+
+    def apply(
+        self,
+        St: npt.NDArray[np.complexfloating],
+        delay: npt.NDArray[np.float64],
+        out: tuple[npt.NDArray[np.complexfloating], npt.NDArray[np.complexfloating]] | None = None,
+        shift: int = 0,
+    ) -> tuple[npt.NDArray[np.complexfloating], npt.NDArray[np.complexfloating]]:
+        """
+        Multiply time-domain signals by their AC and DC windows.
+
+        Parameters
+        ----------
+        St : array_like
+            Time-domain signals of shape (..., n_fft)
+        delay : array_like
+            Delays of shape St.shape[:-1]; NaN delays give NaN outputs
+        out : tuple of array_like, optional
+            Preallocated AC and DC outputs, same shape as ``St``
+        shift : int
+            Sample ``i`` of the time axis is stored at ``(i + shift) % n_fft``,
+            e.g. ``-n_fft // 2`` for unshifted FFT output
+
+        Returns
+        -------
+        St_AC, St_DC : array_like
+            Filtered signals
+        """
+        if St.shape[-1] != self.n_fft:
+            raise ValueError(f"Signals have {St.shape[-1]} samples, the time axis has {self.n_fft}")
+
+        if out is None:
+            St_AC, St_DC = np.zeros_like(St), np.zeros_like(St)
+        else:
+            St_AC, St_DC = out
+            St_AC.fill(0)
+            St_DC.fill(0)
+
+        signals = St.reshape(-1, self.n_fft)
+        outputs = (St_AC.reshape(-1, self.n_fft), St_DC.reshape(-1, self.n_fft))
+        delay = np.asarray(delay, dtype=np.float64).reshape(-1)
+
+        valid = np.isfinite(delay)
+        rows = np.flatnonzero(valid)
+        keys = np.rint((delay[valid] - self.t0) / self.quantum).astype(np.int64)
+        unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        groups = np.split(rows[np.argsort(inverse, kind="stable")], np.cumsum(counts)[:-1])
+
+        # Fibers with the same quantized delay share one template
+        for key, group in zip(unique_keys, groups):
+            for (start, values), output in zip(self.templates(int(key)), outputs):
+                for window, data in self._pieces(start, len(values), shift):
+                    output[group, data] = signals[group, data] * values[window]
+
+        for output in outputs:
+            output[~valid] = np.nan
+        return St_AC, St_DC
+
+
+def filter_bank(
+    t_axis: npt.NDArray[np.float64], order: int = 8, dtype: str | np.dtype = "float64"
+) -> SuperGaussianFilterBank:
+    """
+    Shared filter bank for a time axis.
+
+    Banks are cached per axis, order and dtype, so their window templates
+    are reused across pulses.
+
+    Parameters
+    ----------
+    t_axis : array_like
+        Uniform time axis (fs)
+    order : int
+        Super-Gaussian order (must be even)
+    dtype : str or dtype
+        Working precision
+
+    Returns
+    -------
+    SuperGaussianFilterBank
+        Cached filter bank
+    """
+    t_axis = np.asarray(t_axis, dtype=np.float64)
+    dtype = np.dtype(dtype)
+    key = (len(t_axis), float(t_axis[0]), float(t_axis[1] - t_axis[0]), order, dtype.str)
+
+    bank = _bank_cache.get(key)
+    if bank is None:
+        if len(_bank_cache) >= _BANK_CACHE_SIZE:
+            _bank_cache.pop(next(iter(_bank_cache), None), None)
+        bank = _bank_cache[key] = SuperGaussianFilterBank(t_axis, order, dtype)
+    return bank
+
+
+def clear_filter_banks() -> None:
+    """Clear the cached filter banks."""
+    _bank_cache.clear()
@@ -0,0 +1,90 @@
+"""Compact per-fiber storage of spatially resolved data."""
+
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+
+def to_dense(
+    packed: npt.NDArray[Any],
+    row: npt.NDArray[np.int64],
+    col: npt.NDArray[np.int64],
+    shape: tuple[int, int],
+    fill_value: float = np.nan,
+) -> npt.NDArray[Any]:
+    """
+    Scatter per-fiber data into a dense grid.
+
+    Parameters
+    ----------
+    packed : array_like
+        Per-fiber data of shape (n_fibers, ...)
+    row, col : array_like
+        Grid indices of the fibers
+    shape : tuple[int, int]
+        Grid shape (ny, nx)
+    fill_value : float
+        Value of grid cells without a fiber
+
+    Returns
+    -------
+    array_like
+        Dense data of shape (ny, nx, ...)
+    """
+    dtype = np.result_type(packed.dtype, np.min_scalar_type(fill_value))
+    dense = np.full(tuple(shape) + packed.shape[1:], fill_value, dtype=dtype)
+    dense[row, col] = packed
+    return dense
+
+
+def to_packed(dense: npt.NDArray[Any], row: npt.NDArray[np.int64], col: npt.NDArray[np.int64]) -> npt.NDArray[Any]:
+    """
+    Gather per-fiber data from a dense grid.
+
+    Parameters
+    ----------
+    dense : array_like
+        Dense data of shape (ny, nx, ...)
+    row, col : array_like
+        Grid indices of the fibers
+
+    Returns
+    -------
+    array_like
+        Per-fiber data of shape (n_fibers, ...)
+    """
+    return np.asarray(dense)[row, col]
+
+
+class FiberField:
+    """
+    Descriptor exposing per-fiber data as a dense grid.
+
+    The data is stored as ``<name>_packed`` with shape (n_fibers, ...) and the
+    owner provides the ``row``, ``col`` and ``shape`` attributes. Reading the
+    attribute builds a dense (ny, nx, ...) view on demand, assigning a dense
+    array packs it.
+    """
+
+    def __init__(self, fill_value: float = np.nan):
+        self.fill_value = fill_value
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.packed_name = f"{name}_packed"
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return self
+        try:
+            packed = obj.__dict__[self.packed_name]
+        except KeyError:
+            raise AttributeError(f"'{type(obj).__name__}' object has no attribute '{self.name}'") from None
+        return to_dense(packed, obj.row, obj.col, obj.shape, self.fill_value)
+
+    def __set__(self, obj: Any, value: npt.NDArray[Any]) -> None:
+        obj.__dict__[self.packed_name] = to_packed(value, obj.row, obj.col)
+
+    def __delete__(self, obj: Any) -> None:
+        obj.__dict__.pop(self.packed_name, None)
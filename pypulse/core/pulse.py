@@ -2,22 +2,27 @@
 
 import numpy as np
 import numpy.typing as npt
-import scipy.interpolate as interp
-from scipy.signal import find_peaks
 
-from ..utils.math import rescale
+from ..utils.math import interpolate_peaks, rescale, select_n_fft, wrap_phase
 from .base import PulseInterface
+from .filters import filter_bank
 from .transforms import FourierTransforms
 
 
 class PulseBase(PulseInterface, FourierTransforms):
     """Base class for pulse representations with common operations."""
 
-    def __init__(self):
+    def __init__(self, dtype: str | np.dtype = "float64"):
+        self.dtype = np.dtype(dtype)
         self._t_axis: npt.NDArray[np.float64] | None = None
         self._omega_axis: npt.NDArray[np.float64] | None = None
         self._wavelength_axis: npt.NDArray[np.float64] | None = None
 
+    @property
+    def complex_dtype(self) -> np.dtype:
+        """Complex dtype matching the working precision."""
+        return np.result_type(self.dtype, np.complex64)
+
     @property
     def t_axis(self) -> npt.NDArray[np.float64]:
         if self._t_axis is None:
@@ -48,6 +53,25 @@ class PulseBase(PulseInterface, FourierTransforms):
     def wavelength_axis(self, value: npt.NDArray[np.float64]) -> None:
         self._wavelength_axis = np.asarray(value, dtype=np.float64)
 
+    def auto_n_fft(self, time_resolution: float, n_min: int | None = None) -> int:
+        """
+        Smallest FFT size resolving the time axis to ``time_resolution``.
+
+        Parameters
+        ----------
+        time_resolution : float
+            Largest acceptable time step (fs)
+        n_min : int, optional
+            Lower bound on the FFT size
+
+        Returns
+        -------
+        int
+            5-smooth FFT size for the current frequency axis
+        """
+        omega_axis = self.omega_axis
+        return select_n_fft(len(omega_axis), omega_axis[1] - omega_axis[0], time_resolution, n_min)
+
     def resample_spectrum(
         self,
         spectrum: npt.NDArray[np.float64],
@@ -77,6 +101,8 @@ class PulseBase(PulseInterface, FourierTransforms):
         array_like
             Resampled spectrum
         """
+        from scipy.interpolate import interp1d
+
         # Validate attributes
         if not hasattr(self, "wavelength") or not hasattr(self, "omega_center"):
             raise ValueError("Object must have 'wavelength' and 'omega_center' attributes")
@@ -97,16 +123,22 @@ class PulseBase(PulseInterface, FourierTransforms):
         self.wavelength_axis = 2 * np.pi * self.SPEED_OF_LIGHT / (self.omega_axis + self.omega_center)
 
         # Interpolate
-        interpolator = interp.interp1d(omega, spectrum, kind=method, bounds_error=False, fill_value=0)
+        interpolator = interp1d(omega, spectrum, kind=method, bounds_error=False, fill_value=0)
         spectrum_resampled = interpolator(self.omega_axis)
 
         # Ensure non-negative
         spectrum_resampled[spectrum_resampled < 0] = 0
 
-        return spectrum_resampled
+        return spectrum_resampled.astype(self.dtype, copy=False)
 
     def fourier_transform_spectral_interferometry(
-        self, n_omega: int, n_fft: int, delay_min: float | None = None, filter_order: int = 8
+        self,
+        n_omega: int,
+        n_fft: int,
+        delay_min: float | None = None,
+        filter_order: int = 8,
+        Sw_interference: npt.NDArray[np.float64] | None = None,
+        interpolate_peak: bool = False,
     ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
         """
         Perform Fourier transform spectral interferometry.
@@ -121,6 +153,12 @@ class PulseBase(PulseInterface, FourierTransforms):
             Minimum delay for peak detection
         filter_order : int, optional
             Filter order (must be even)
+        Sw_interference : array_like, optional
+            Interference spectra of shape (..., n_omega). Defaults to the
+            ``Sw_interference`` attribute.
+        interpolate_peak : bool, optional
+            Refine the delays between time samples, for coarse time axes. The
+            time axis is then placed exactly on the FFT samples.
 
         Returns
         -------
@@ -131,26 +169,103 @@ class PulseBase(PulseInterface, FourierTransforms):
         Su : array_like
             Unknown spectrum
         """
-        # Validate inputs
-        if filter_order % 2 != 0:
-            raise ValueError("Filter order must be even")
+        St = self.time_domain_signal(n_omega, n_fft, Sw_interference, interpolate_peak)
+        return self.extract_phase(St, n_omega, n_fft, delay_min, filter_order, interpolate_peak)
+
+    def time_domain_signal(
+        self,
+        n_omega: int,
+        n_fft: int,
+        Sw_interference: npt.NDArray[np.float64] | None = None,
+        interpolate_peak: bool = False,
+    ) -> npt.NDArray[np.complex128]:
+        """
+        Transform interference spectra to the time domain and set ``t_axis``.
+
+        This is the first part of :meth:`fourier_transform_spectral_interferometry`,
+        independent of the delay search and the filters.
+
+        Parameters
+        ----------
+        n_omega : int
+            Number of frequency points
+        n_fft : int
+            FFT size
+        Sw_interference : array_like, optional
+            Interference spectra of shape (..., n_omega). Defaults to the
+            ``Sw_interference`` attribute.
+        interpolate_peak : bool, optional
+            Place the time axis exactly on the FFT samples
 
-        required_attrs = ["Sw_interference", "row", "col"]
-        for attr in required_attrs:
-            if not hasattr(self, attr):
-                raise ValueError(f"'{attr}' attribute is required")
+        Returns
+        -------
+        array_like
+            Time-domain signals of shape (..., n_fft)
+        """
+        if Sw_interference is None:
+            if not hasattr(self, "Sw_interference"):
+                raise ValueError("'Sw_interference' attribute is required")
+            Sw_interference = self.Sw_interference
+        Sw_interference = np.asarray(Sw_interference, dtype=self.dtype)
 
         # Set up time axis
-        f_max = (
-            np.max(self.omega_axis) + (n_fft - n_omega) / 2 * np.abs(self.omega_axis[1] - self.omega_axis[0])
-        ) / np.pi
-        self.t_axis = (np.arange(n_fft) - (n_fft - 1) / 2) / f_max
+        if interpolate_peak:
+            # Exact FFT sample times, so interpolated delays do not depend on n_fft
+            omega_step = np.abs(self.omega_axis[1] - self.omega_axis[0])
+            self.t_axis = (np.arange(n_fft) - n_fft // 2) * (2 * np.pi / (n_fft * omega_step))
+        else:
+            # Historical axis, half a sample later than the FFT samples, kept so results reproduce
+            f_max = (
+                np.max(self.omega_axis) + (n_fft - n_omega) / 2 * np.abs(self.omega_axis[1] - self.omega_axis[0])
+            ) / np.pi
+            self.t_axis = (np.arange(n_fft) - (n_fft - 1) / 2) / f_max
 
-        # Transform to time domain
-        St = self.iFt(self.Sw_interference, n_omega, n_fft)
+        return self.iFt(Sw_interference, n_omega, n_fft)
+
+    def extract_phase(
+        self,
+        St: npt.NDArray[np.complex128],
+        n_omega: int,
+        n_fft: int,
+        delay_min: float | None = None,
+        filter_order: int = 8,
+        interpolate_peak: bool = False,
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        Find the delays in time-domain signals and filter out the phases.
+
+        This is the second part of :meth:`fourier_transform_spectral_interferometry`,
+        on signals from :meth:`time_domain_signal`.
+
+        Parameters
+        ----------
+        St : array_like
+            Time-domain signals of shape (..., n_fft)
+        n_omega : int
+            Number of frequency points
+        n_fft : int
+            FFT size
+        delay_min : float, optional
+            Minimum delay for peak detection
+        filter_order : int, optional
+            Filter order (must be even)
+        interpolate_peak : bool, optional
+            Refine the delays between time samples
+
+        Returns
+        -------
+        phase : array_like
+            Extracted phase
+        delay : array_like
+            Delay map
+        Su : array_like
+            Unknown spectrum
+        """
+        if filter_order % 2 != 0:
+            raise ValueError("Filter order must be even")
 
         # Extract delays
-        delay = self._extract_delays(St, n_fft, delay_min)
+        delay = self._extract_delays(St, n_fft, delay_min, interpolate_peak)
 
         # Apply filters
         phase, Su = self._apply_filters(St, delay, filter_order, n_omega, n_fft)
@@ -158,10 +273,12 @@ class PulseBase(PulseInterface, FourierTransforms):
         return phase, delay, Su
 
     def _extract_delays(
-        self, St: npt.NDArray[np.complex128], n_fft: int, delay_min: float | None
+        self, St: npt.NDArray[np.complex128], n_fft: int, delay_min: float | None, interpolate_peak: bool = False
     ) -> npt.NDArray[np.float64]:
-        """Extract delay values from time-domain signal."""
-        delay = np.full((St.shape[0], St.shape[1]), np.nan)
+        """Extract delay values from time-domain signals of shape (..., n_fft)."""
+        from scipy.signal import find_peaks
+
+        delay = np.full(St.shape[:-1], np.nan)
 
         if delay_min is None:
             t_start = n_fft // 2
@@ -171,14 +288,21 @@ class PulseBase(PulseInterface, FourierTransforms):
             t_axis_temp = self.t_axis[mask]
             t_start = np.where(mask)[0][0]
 
-        for i, (r, c) in enumerate(zip(self.row, self.col)):
-            signal = rescale(np.abs(St[r, c, t_start:]))
+        for index in np.ndindex(St.shape[:-1]):
+            signal = rescale(np.abs(St[index][t_start:]))
             peaks, _ = find_peaks(signal, height=0.01)
 
             if len(peaks) > 1:
-                # Get strongest peak
-                peak_idx = peaks[np.argmax(signal[peaks])]
-                delay[r, c] = t_axis_temp[peak_idx]
+                if interpolate_peak:
+                    # Strongest peak by interpolated height, refined between samples
+                    magnitude = np.abs(St[index][t_start + peaks[:, np.newaxis] + np.arange(-1, 2)])
+                    offset, height = interpolate_peaks(magnitude)
+                    strongest = np.argmax(height)
+                    delay[index] = t_axis_temp[peaks[strongest]] + offset[strongest] * (self.t_axis[1] - self.t_axis[0])
+                else:
+                    # Get strongest peak
+                    peak_idx = peaks[np.argmax(signal[peaks])]
+                    delay[index] = t_axis_temp[peak_idx]
 
         return delay
 
@@ -191,29 +315,18 @@ class PulseBase(PulseInterface, FourierTransforms):
         n_fft: int,
     ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
         """Apply AC/DC filters and extract phase."""
-        # Create filter widths
-        filter_width = (-np.log(0.001)) ** (-1 / filter_order) * delay / 2
-
-        # Broadcast for vectorized operations
-        t_broadcast = self.t_axis.reshape(1, 1, -1)
-        delay_broadcast = delay[:, :, np.newaxis]
-        width_broadcast = filter_width[:, :, np.newaxis]
-
-        # Create filters
-        filter_AC = np.exp(-(((t_broadcast - delay_broadcast) / width_broadcast) ** filter_order))
-        filter_DC = np.exp(-((t_broadcast / width_broadcast) ** filter_order))
-
-        # Apply filters
-        St_AC = St * filter_AC
-        St_DC = St * filter_DC
+        # Apply filters on their support only, with windows shared across calls
+        bank = filter_bank(self.t_axis, filter_order, self.dtype)
+        St_AC, St_DC = bank.apply(St, delay)
 
         # Transform back to frequency domain
         Sw_AC = self.Ft(St_AC, n_omega, n_fft)
         Sw_DC = self.Ft(St_DC, n_omega, n_fft)
 
-        # Extract phase
-        omega_broadcast = self.omega_axis.reshape(1, 1, -1)
-        phase = np.angle(Sw_AC * np.exp(1j * omega_broadcast * delay_broadcast))
+        # Extract phase, shifting by the delay and wrapping in place
+        phase = np.angle(Sw_AC)
+        phase += self.omega_axis.astype(self.dtype) * delay[..., np.newaxis].astype(self.dtype)
+        wrap_phase(phase, out=phase)
 
         # Calculate unknown spectrum
         a = np.abs(Sw_DC) - 2 * np.abs(Sw_AC)
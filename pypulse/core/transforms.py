@@ -2,27 +2,32 @@
 
 import numpy as np
 import numpy.typing as npt
-from numpy.fft import fft, fft2, fftshift, ifft, ifft2, ifftshift
+from scipy.fft import fft, fft2, fftshift, ifft, ifft2, ifftshift
 
 
 class FourierTransforms:
-    """Mixin class providing Fourier transform methods."""
+    """
+    Mixin class providing Fourier transform methods.
+
+    scipy.fft is used so that single-precision input stays in single precision.
+    """
 
     @staticmethod
     def Ft(Et: npt.NDArray[np.complex128], n_omega: int, n_fft: int) -> npt.NDArray[np.complex128]:
-        """Time to frequency domain transform."""
-        Ew = fftshift(fft(fftshift(Et, axes=2), axis=2), axes=2)
+        """Time to frequency domain transform along the last axis."""
+        Ew = fft(fftshift(Et, axes=-1), axis=-1)
         start = (n_fft - n_omega) // 2
         end = (n_fft + n_omega) // 2
-        return Ew[:, :, start:end]
+        # Central band of the shifted spectrum, taken without shifting the whole spectrum
+        return np.take(Ew, (np.arange(start, end) - n_fft // 2) % n_fft, axis=-1)
 
     @staticmethod
     def iFt(Ew: npt.NDArray[np.complex128], n_omega: int, n_fft: int) -> npt.NDArray[np.complex128]:
-        """Frequency to time domain transform."""
+        """Frequency to time domain transform along the last axis."""
         padding_size = (n_fft - n_omega) // 2
-        padding = np.zeros((Ew.shape[0], Ew.shape[1], padding_size), dtype=Ew.dtype)
-        Ew_padded = np.concatenate((padding, Ew, padding), axis=2)
-        return fftshift(ifft(fftshift(Ew_padded, axes=2), axis=2), axes=2)
+        padding = np.zeros(Ew.shape[:-1] + (padding_size,), dtype=Ew.dtype)
+        Ew_padded = np.concatenate((padding, Ew, padding), axis=-1)
+        return fftshift(ifft(fftshift(Ew_padded, axes=-1), axis=-1), axes=-1)
 
     @staticmethod
     def F(Exy: npt.NDArray[np.complex128]) -> npt.NDArray[np.complex128]:
@@ -132,26 +132,33 @@ class FiberArrayRegistry:
         self._arrays[array_id] = config
 
 
-# Global registry instance
-_registry = FiberArrayRegistry()
+# Global registry instance, created on first use
+_registry: FiberArrayRegistry | None = None
+
+
+def _global_registry() -> FiberArrayRegistry:
+    """The global registry."""
+    global _registry
+    if _registry is None:
+        _registry = FiberArrayRegistry()
+    return _registry
 
 
 def get_fiber_array(array_id: str = "default_14x14", dx: float = 0, dy: float = 0) -> FiberArray:
     """Get fiber array from global registry."""
-    return _registry.get_array(array_id, dx, dy)
+    return _global_registry().get_array(array_id, dx, dy)
 
 
 def get_fiber_array_config(array_id: str) -> dict[str, Any]:
     """Get fiber array configuration from global registry."""
-    return _registry.get_array_config(array_id)
+    return _global_registry().get_array_config(array_id)
 
 
 def register_fiber_array(array_id: str, config: dict[str, Any], auto_save: bool = True) -> None:
     """Register array in global registry with auto-save option."""
-    _registry.register_array(array_id, config, auto_save)
+    _global_registry().register_array(array_id, config, auto_save)
 
 
 def set_fiber_array_config_dir(config_dir: Path) -> None:
     """Set the configuration directory for the global registry."""
-    global _registry
-    _registry.config_dir = config_dir
+    _global_registry().config_dir = config_dir
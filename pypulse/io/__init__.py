@@ -1,7 +1,10 @@
 from .converters import batch_convert_csv_to_hdf5
-from .logging import reproduce_from_log
+from .history import ProcessingHistory
+from .logging import reproduce_from_log, write_processing_log
 
 __all__ = [
     "batch_convert_csv_to_hdf5",
+    "ProcessingHistory",
     "reproduce_from_log",
+    "write_processing_log",
 ]
@@ -0,0 +1,407 @@
+"""Append-only processing history stored as JSON Lines with an entry-ID index."""
+
+import datetime
+import json
+import os
+import re
+import struct
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from ..utils.profiling import StageTiming, format_timings
+
+HISTORY_FILENAME = "processing_history.jsonl"
+INDEX_FILENAME = "processing_history.idx"
+MARKDOWN_FILENAME = "processing_history.md"
+
+# Index slot of entry ID k is the 8-byte offset of its line, at byte 8 * (k - 1)
+_SLOT = struct.Struct("<Q")
+_MISSING = 2**64 - 1
+
+
+class SerializableEncoder(json.JSONEncoder):
+    """JSON encoder for custom objects."""
+
+    def default(self, obj):
+        if hasattr(obj, "to_dict") and callable(obj.to_dict):
+            return obj.to_dict()
+        if isinstance(obj, Path):
+            return str(obj)
+        return super().default(obj)
+
+
+@contextmanager
+def _exclusive(f: BinaryIO) -> Iterator[None]:
+    """Hold an exclusive lock on an open file."""
+    if os.name == "nt":
+        import msvcrt
+
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def format_markdown_entry(entry: dict[str, Any]) -> str:
+    """
+    Format an entry as a section of the Markdown processing history.
+
+    Parameters
+    ----------
+    entry : dict
+        History entry
+
+    Returns
+    -------
+    str
+        Markdown section
+    """
+    entry_id, status = entry["entry_id"], entry["status"]
+    params_str = json.dumps(entry["params"], indent=4, cls=SerializableEncoder, ensure_ascii=False)
+    message = entry["message"]
+
+    text = f"""
+---
+## Processing Entry (ID: {entry_id}) - {status}
+
+- **Entry ID**: {entry_id}
+- **Timestamp**: `{entry["timestamp"]}`
+
+### Parameters Used
+```json
+{params_str}
+```
+"""
+
+    # Add status-specific information
+    if status == "SUCCESS":
+        text += f"""
+### Result
+- **Details**: {message if message else "Processing completed successfully."}
+"""
+    elif status == "FAILURE":
+        text += f"""
+### Error Details
+```
+{message}
+```
+"""
+
+    if entry.get("timings"):
+        timings = [StageTiming(**t) if isinstance(t, dict) else t for t in entry["timings"]]
+        text += f"""
+### Stage Timings
+```
+{format_timings(timings)}
+```
+"""
+    return text
+
+
+def _parse_markdown_log(content: str) -> list[dict[str, Any]]:
+    """Entries of a Markdown processing history, sorted by ID."""
+    entries = {}
+    for chunk in re.split(r"^---$", content, flags=re.MULTILINE):
+        header = re.search(r"^## Processing Entry \(ID: (\d+)\) - (\w+)", chunk, re.MULTILINE)
+        params = re.search(r"```json\s*(\{.*?\})\s*```", chunk, re.DOTALL)
+        if header is None or params is None:
+            continue
+
+        timestamp = re.search(r"^- \*\*Timestamp\*\*: `([^`]*)`", chunk, re.MULTILINE)
+        details = re.search(r"^- \*\*Details\*\*: (.*)$", chunk, re.MULTILINE)
+        error = re.search(r"### Error Details\s*```\n(.*?)\n```", chunk, re.DOTALL)
+        message = details.group(1) if details else error.group(1) if error else ""
+
+        entry_id = int(header.group(1))
+        entries[entry_id] = {
+            "entry_id": entry_id,
+            "timestamp": timestamp.group(1) if timestamp else None,
+            "status": header.group(2).upper(),
+            "message": message,
+            "params": json.loads(params.group(1)),
+            "timings": None,
+            "results": None,
+        }
+    return [entries[k] for k in sorted(entries)]
+
+
+class ProcessingHistory:
+    """
+    Processing history of a data folder.
+
+    Entries are appended as JSON lines to ``processing_history.jsonl``. The
+    byte offset of each entry is stored at a fixed position of
+    ``processing_history.idx``, so the next entry ID and the lookup of an
+    entry by ID cost one ``stat`` and two reads, however long the history.
+    Appends hold an exclusive lock on the index, so concurrent processes
+    never share an ID.
+
+    A folder that only has the Markdown history of older versions is read
+    from it without writing anything, and imported into the JSON Lines
+    history by the first append. From then on the Markdown history is only
+    regenerated from the entries by ``write_markdown``.
+    """
+
+    def __init__(self, folder_path: str | Path):
+        """
+        Open the history of a folder.
+
+        Parameters
+        ----------
+        folder_path : str or Path
+            Folder containing the history files
+        """
+        self.folder = Path(folder_path)
+        self.path = self.folder / HISTORY_FILENAME
+        self.index_path = self.folder / INDEX_FILENAME
+
+    def __len__(self) -> int:
+        """Number of index slots, which is the last entry ID."""
+        if not self.path.exists() and (legacy := self._markdown_entries()):
+            return legacy[-1]["entry_id"]
+        return self.index_path.stat().st_size // _SLOT.size if self.index_path.exists() else 0
+
+    def append(
+        self,
+        status: str,
+        params: dict[str, Any],
+        message: str = "",
+        timings: list[Any] | None = None,
+        results: dict[str, Any] | None = None,
+        timestamp: str | None = None,
+    ) -> int:
+        """
+        Append an entry.
+
+        Parameters
+        ----------
+        status : str
+            Processing status ('SUCCESS' or 'FAILURE')
+        params : dict
+            Processing parameters
+        message : str
+            Status message
+        timings : list, optional
+            Stage timings of a profiled run
+        results : dict, optional
+            Summary of the outputs, compared against when the run is reproduced
+        timestamp : str, optional
+            ISO timestamp, defaults to now
+
+        Returns
+        -------
+        int
+            Entry ID
+        """
+        self._import_markdown()
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, "a+b") as index, _exclusive(index):
+            self._repair(index)
+            index.seek(0, os.SEEK_END)
+            entry_id = index.tell() // _SLOT.size + 1
+
+            entry = {
+                "entry_id": entry_id,
+                "timestamp": timestamp or datetime.datetime.now().isoformat(),
+                "status": status.upper(),
+                "message": message,
+                "params": params,
+                "timings": timings,
+                "results": results,
+            }
+            self._write(index, [entry])
+        return entry_id
+
+    def get(self, entry_id: int) -> dict[str, Any]:
+        """
+        Entry with the given ID.
+
+        Parameters
+        ----------
+        entry_id : int
+            Entry ID
+
+        Returns
+        -------
+        dict
+            Entry with 'entry_id', 'timestamp', 'status', 'message', 'params', 'timings' and 'results'
+        """
+        if not 1 <= entry_id <= len(self):
+            raise ValueError(f"Entry with ID {entry_id} not found")
+        if not self.path.exists():
+            for entry in self._markdown_entries():
+                if entry["entry_id"] == entry_id:
+                    return entry
+            raise ValueError(f"Entry with ID {entry_id} not found")
+
+        with open(self.index_path, "rb") as index:
+            index.seek(_SLOT.size * (entry_id - 1))
+            (offset,) = _SLOT.unpack(index.read(_SLOT.size))
+        if offset == _MISSING:
+            raise ValueError(f"Entry with ID {entry_id} not found")
+        return self._read(offset)
+
+    def last(self, status: str | None = None) -> dict[str, Any]:
+        """
+        Most recent entry, optionally with a given status.
+
+        Parameters
+        ----------
+        status : str, optional
+            Only consider entries with this status
+
+        Returns
+        -------
+        dict
+            Entry
+        """
+        for entry in self.entries(reverse=True):
+            if status is None or entry["status"] == status.upper():
+                return entry
+        raise ValueError("No entries found in the log file.")
+
+    def entries(self, reverse: bool = False) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over the entries in ID order.
+
+        Parameters
+        ----------
+        reverse : bool
+            Iterate from the most recent entry
+
+        Yields
+        ------
+        dict
+            Entry
+        """
+        if not self.path.exists():
+            legacy = self._markdown_entries()
+            yield from reversed(legacy) if reverse else legacy
+            return
+
+        ids = range(len(self), 0, -1) if reverse else range(1, len(self) + 1)
+        for entry_id in ids:
+            try:
+                yield self.get(entry_id)
+            except ValueError:
+                continue
+
+    def to_markdown(self) -> str:
+        """Render the entries in the Markdown format of the processing history."""
+        return "".join(format_markdown_entry(entry) for entry in self.entries())
+
+    def write_markdown(self, filepath: str | Path | None = None) -> Path:
+        """
+        Regenerate the Markdown processing history.
+
+        Parameters
+        ----------
+        filepath : str or Path, optional
+            Output file, defaults to ``processing_history.md`` in the folder
+
+        Returns
+        -------
+        Path
+            Written file
+        """
+        filepath = Path(filepath) if filepath is not None else self.folder / MARKDOWN_FILENAME
+        content = self.to_markdown()
+        temp_path = filepath.with_name(filepath.name + ".tmp")
+        temp_path.write_text(content, encoding="utf-8")
+        os.replace(temp_path, filepath)
+        return filepath
+
+    def _read(self, offset: int) -> dict[str, Any]:
+        """Entry at a byte offset of the history."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def _write(self, index: BinaryIO, entries: list[dict[str, Any]]) -> None:
+        """Append entries and their index slots, the history first so the index never points past it."""
+        lines = [
+            (json.dumps(entry, cls=SerializableEncoder, ensure_ascii=False) + "\n").encode("utf-8") for entry in entries
+        ]
+        with open(self.path, "ab") as f:
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+        slots = []
+        index.seek(0, os.SEEK_END)
+        next_id = index.tell() // _SLOT.size + 1
+        for entry, line in zip(entries, lines):
+            slots += [_SLOT.pack(_MISSING)] * (entry["entry_id"] - next_id) + [_SLOT.pack(offset)]
+            next_id = entry["entry_id"] + 1
+            offset += len(line)
+        index.write(b"".join(slots))
+        index.flush()
+
+    def _repair(self, index: BinaryIO) -> None:
+        """Rebuild the index if an interrupted append left it out of step with the history."""
+        size = self.path.stat().st_size if self.path.exists() else 0
+        index.seek(0, os.SEEK_END)
+        n_slots = index.tell() // _SLOT.size
+
+        # Consistent when the last slot points at the last complete line
+        if n_slots == 0 and size == 0:
+            return
+        if n_slots > 0 and index.tell() % _SLOT.size == 0:
+            index.seek(_SLOT.size * (n_slots - 1))
+            (offset,) = _SLOT.unpack(index.read(_SLOT.size))
+            if offset < size:
+                with open(self.path, "rb") as f:
+                    f.seek(offset)
+                    line = f.readline()
+                if offset + len(line) == size and line.endswith(b"\n"):
+                    return
+
+        # Keep the complete entries, drop a partially written last line
+        entries = []
+        if size:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    entries.append(json.loads(line))
+        self.path.unlink(missing_ok=True)
+        index.truncate(0)
+        self._write(index, entries)
+
+    def _markdown_entries(self) -> list[dict[str, Any]]:
+        """Entries of the Markdown history, read in memory."""
+        markdown_path = self.folder / MARKDOWN_FILENAME
+        if not markdown_path.exists():
+            return []
+        return _parse_markdown_log(markdown_path.read_text(encoding="utf-8"))
+
+    def _import_markdown(self) -> None:
+        """Import the Markdown history of a folder without JSON Lines history before the first append."""
+        if self.path.exists() or not (self.folder / MARKDOWN_FILENAME).exists():
+            return
+
+        with open(self.index_path, "a+b") as index, _exclusive(index):
+            if self.path.exists():
+                return
+            entries = self._markdown_entries()
+            index.truncate(0)
+            self._write(index, entries)
+        print(
+            f"Imported {len(entries)} entries of {MARKDOWN_FILENAME} into {HISTORY_FILENAME} in {self.folder}; "
+            f"{MARKDOWN_FILENAME} is no longer updated, regenerate it with write_processing_log"
+        )
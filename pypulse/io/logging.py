@@ -1,39 +1,27 @@
 """Processing history logging functionality."""
 
-import datetime
 import json
-import re
 from pathlib import Path
 from typing import Any
 
+from ..utils.profiling import StageTiming
+from .history import HISTORY_FILENAME, MARKDOWN_FILENAME, ProcessingHistory, SerializableEncoder
 
-class SerializableEncoder(json.JSONEncoder):
-    """JSON encoder for custom objects."""
 
-    def default(self, obj):
-        if hasattr(obj, "to_dict") and callable(obj.to_dict):
-            return obj.to_dict()
-        if isinstance(obj, Path):
-            return str(obj)
-        return super().default(obj)
-
-
-def _get_next_entry_id(log_filepath: str | Path) -> int:
-    """Get next available entry ID."""
-    log_path = Path(log_filepath)
-    if not log_path.exists():
-        return 1
-
-    content = log_path.read_text(encoding="utf-8")
-    ids = re.findall(r"^- \*\*Entry ID\*\*: (\d+)", content, re.MULTILINE)
-
-    return max(int(id_str) for id_str in ids) + 1 if ids else 1
-
-
-def update_processing_log(folder_path: str | Path, status: str, params: dict[str, Any], message: str = "") -> None:
+def update_processing_log(
+    folder_path: str | Path,
+    status: str,
+    params: dict[str, Any],
+    message: str = "",
+    timings: list[StageTiming] | None = None,
+    results: dict[str, Any] | None = None,
+) -> int:
     """
     Update processing history log.
 
+    The entry is appended to the JSON Lines history of the folder; the
+    Markdown history is regenerated with ``write_processing_log``.
+
     Parameters
     ----------
     folder_path : str or Path
@@ -44,98 +32,94 @@ def update_processing_log(folder_path: str | Path, status: str, params: dict[str
         Processing parameters
     message : str
         Status message
+    timings : list[StageTiming], optional
+        Stage timings of a profiled run
+    results : dict, optional
+        Summary of the outputs, see ``SIFAST.result_summary``
+
+    Returns
+    -------
+    int
+        Entry ID
     """
-    log_filepath = Path(folder_path) / "processing_history.md"
-    new_id = _get_next_entry_id(log_filepath)
-    timestamp = datetime.datetime.now().isoformat()
-
-    # Serialize parameters
-    params_str = json.dumps(params, indent=4, cls=SerializableEncoder, ensure_ascii=False)
-
-    # Build log entry
-    log_entry = f"""
----
-## Processing Entry (ID: {new_id}) - {status}
-
-- **Entry ID**: {new_id}
-- **Timestamp**: `{timestamp}`
-
-### Parameters Used
-```json
-{params_str}
-```
-"""
-
-    # Add status-specific information
-    if status.upper() == "SUCCESS":
-        log_entry += f"""
-### Result
-- **Details**: {message if message else "Processing completed successfully."}
-"""
-    elif status.upper() == "FAILURE":
-        log_entry += f"""
-### Error Details
-```
-{message}
-```
-"""
-
-    # Append to log file
-    with open(log_filepath, "a", encoding="utf-8") as log_file:
-        log_file.write(log_entry)
+    return ProcessingHistory(folder_path).append(status, params, message, timings, results)
 
 
-def reproduce_from_log(log_dir: str | Path, entry_id: int | None = None) -> Any:
+def write_processing_log(folder_path: str | Path) -> Path:
     """
-    Reproduce processing from log entry.
+    Regenerate ``processing_history.md`` from the history of a folder.
 
     Parameters
     ----------
-    log_file_path : str or Path
-        Path to log file
-    entry_id : int
-        Entry ID to reproduce
+    folder_path : str or Path
+        Folder containing the history
 
     Returns
     -------
-    SIFAST or SRSI instance
+    Path
+        Markdown log file
     """
-    from ..fiber.registry import register_fiber_array
-    from ..processing.sifast import SIFAST
-    from ..processing.srsi import SRSI
+    return ProcessingHistory(folder_path).write_markdown()
 
-    log_path = Path(log_dir) / "processing_history.md"
-    if not log_path.exists():
-        raise FileNotFoundError(f"Log file not found: {log_path}")
 
-    if entry_id is None:
-        # Get the ID of the last entry
-        last_id = _get_next_entry_id(log_path) - 1
-        if last_id < 1:
-            raise ValueError("No entries found in the log file to reproduce.")
-        entry_id = last_id
+def get_entry_parameters(log_dir: str | Path, entry_id: int | None = None, status: str | None = None) -> dict[str, Any]:
+    """
+    Get the parameters recorded in a log entry.
 
-    content = log_path.read_text(encoding="utf-8")
-    entries = content.split("---")
+    Parameters
+    ----------
+    log_dir : str or Path
+        Folder containing the log file
+    entry_id : int, optional
+        Entry ID to read. Defaults to the last entry (matching ``status``)
+    status : str, optional
+        Only consider entries with this status ('SUCCESS' or 'FAILURE')
 
-    # Find entry with matching ID
-    target_entry = None
-    id_pattern = f"- \\*\\*Entry ID\\*\\*: {entry_id}\\b"
+    Returns
+    -------
+    dict
+        Parameters of the log entry
+    """
+    log_dir = Path(log_dir)
+    if not (log_dir / HISTORY_FILENAME).exists() and not (log_dir / MARKDOWN_FILENAME).exists():
+        raise FileNotFoundError(f"Log file not found: {log_dir / MARKDOWN_FILENAME}")
 
-    for entry in entries:
-        if re.search(id_pattern, entry):
-            target_entry = entry
-            break
+    history = ProcessingHistory(log_dir)
+    if entry_id is None:
+        return history.last(status)["params"]
 
-    if target_entry is None:
+    entry = history.get(entry_id)
+    if status is not None and entry["status"] != status.upper():
         raise ValueError(f"Entry with ID {entry_id} not found")
+    return entry["params"]
+
 
-    # Extract JSON parameters
-    match = re.search(r"```json\s*(\{.*?\})\s*```", target_entry, re.DOTALL)
-    if not match:
-        raise ValueError("Could not parse parameters from log entry")
+def reproduction_arguments(params: dict[str, Any], reference_cache: dict[str, Any] | None = None) -> dict[str, Any]:
+    """
+    Turn the parameters of a log entry into SIFAST arguments.
 
-    params = json.loads(match.group(1))
+    The fiber array of the entry is registered and the reference pulse is
+    rebuilt from its parameters. Entries of saved acquisitions are read back
+    from their folder, and a configuration copied into the folder by the
+    original run takes precedence over the external one it came from.
+
+    Parameters
+    ----------
+    params : dict
+        Parameters of a log entry
+    reference_cache : dict, optional
+        Reference pulses by their serialized parameters, so identical
+        references are built once
+
+    Returns
+    -------
+    dict
+        Keyword arguments of SIFAST
+    """
+    from ..fiber.registry import register_fiber_array
+    from ..processing.srsi import SRSI
+
+    params = dict(params)
 
     # Handle fiber array configuration
     if "fiber_array_config" in params:
@@ -149,7 +133,42 @@ def reproduce_from_log(log_dir: str | Path, entry_id: int | None = None) -> Any:
     # Handle reference pulse reconstruction
     if "reference_pulse" in params and isinstance(params["reference_pulse"], dict):
         ref_params = params["reference_pulse"]
-        params["reference_pulse"] = SRSI(**ref_params)
+        if reference_cache is None:
+            params["reference_pulse"] = SRSI(**ref_params)
+        else:
+            key = json.dumps(ref_params, sort_keys=True, cls=SerializableEncoder)
+            if key not in reference_cache:
+                reference_cache[key] = SRSI(**ref_params)
+            params["reference_pulse"] = reference_cache[key]
+
+    # Saved acquisitions and copied configurations are read from the folder
+    folder_path = params.get("folder_path")
+    if folder_path is not None:
+        params["mode_input"] = "read"
+        if params.get("config_folder_path") is not None and (Path(folder_path) / "config").exists():
+            params["config_folder_path"] = None
+
+    return params
+
+
+def reproduce_from_log(log_dir: str | Path, entry_id: int | None = None) -> Any:
+    """
+    Reproduce processing from log entry.
+
+    Parameters
+    ----------
+    log_file_path : str or Path
+        Path to log file
+    entry_id : int
+        Entry ID to reproduce
+
+    Returns
+    -------
+    SIFAST or SRSI instance
+    """
+    from ..processing.sifast import SIFAST
+
+    params = get_entry_parameters(log_dir, entry_id)
 
     # Create instance
-    return SIFAST(**params)
+    return SIFAST(**reproduction_arguments(params))
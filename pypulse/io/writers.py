@@ -1,12 +1,29 @@
 """Data writers for various file formats."""
 
 import datetime
+import json
 from pathlib import Path
+from typing import Any
 
 import h5py
 import numpy as np
 import numpy.typing as npt
 
+# Outputs of a processed pulse stored by ``save_sifast_result``, packed arrays without their suffix
+_RESULT_DATASETS = [
+    "row",
+    "col",
+    "x_axis",
+    "y_axis",
+    "omega_axis",
+    "wavelength_axis",
+    "t_axis",
+    "time_interval",
+    "pulse_front",
+    "Sw_unknown_packed",
+    "phase_packed",
+]
+
 
 class DataWriter:
     """Writer for data files."""
@@ -48,6 +65,44 @@ class DataWriter:
         else:
             raise ValueError(f"Unsupported format: {save_format}. Use 'hdf5' or 'csv'")
 
+    @staticmethod
+    def save_sifast_result(file_path: str | Path, pulse: Any) -> None:
+        """
+        Save the processed outputs of a SIFAST pulse to an HDF5 file.
+
+        Per-fiber arrays are stored packed, shape (n_fibers, n_omega), with
+        the fiber indices ``row``/``col``. The parameters are stored as JSON
+        in the ``params`` attribute.
+
+        Parameters
+        ----------
+        file_path : str or Path
+            Output file
+        pulse : SIFAST
+            Processed pulse
+        """
+        from .history import SerializableEncoder
+
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        params = {k: v for k, v in pulse.params.items() if not isinstance(v, np.ndarray)}
+        with h5py.File(file_path, "w") as f:
+            for name in _RESULT_DATASETS:
+                # Axes that were never set raise ValueError
+                try:
+                    value = getattr(pulse, name)
+                except (AttributeError, ValueError):
+                    continue
+                if isinstance(value, np.ndarray):
+                    f.create_dataset(name.removesuffix("_packed"), data=value, compression="gzip")
+
+            f.attrs["description"] = "SIFAST processing result"
+            f.attrs["params"] = json.dumps(params, cls=SerializableEncoder)
+            f.attrs["omega_center"] = pulse.omega_center
+            f.attrs["time_unit"] = "fs"
+            f.attrs["timestamp"] = datetime.datetime.now().isoformat()
+
     @staticmethod
     def _save_hdf5(
         folder: Path,
@@ -0,0 +1,428 @@
+"""Reference sphere fitting and geometry for SIFAST calibration."""
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ..core.base import PulseInterface
+from ..fiber.registry import get_fiber_array, get_fiber_array_config
+
+# Speed of light in mm/fs
+_C = PulseInterface.SPEED_OF_LIGHT * 1e-6
+# Curvature bounds (1/mm), i.e. radii of curvature from 1 km down to 1 mm. Over
+# a fiber array the sag of the flattest sphere is far below a femtosecond, so
+# flatter and inverted fronts are fitted at this bound.
+_MIN_CURVATURE = 1e-6
+_MAX_CURVATURE = 1.0
+
+_GEOMETRY_CACHE_SIZE = 128
+_geometry_cache: dict[tuple[Any, ...], "ReferenceGeometry"] = {}
+
+
+@dataclass
+class SphereFitResult:
+    """Result of a reference sphere fit."""
+
+    x0: float
+    y0: float
+    L: float
+    tau0: float
+    n_iterations: int
+    converged: bool
+    residual_rms: float
+    n_outliers: int
+    at_bound: bool = False  # curvature at a bound: L only limits the radius, the front may be flatter or inverted
+
+    @property
+    def reference_parameters(self) -> dict[str, float]:
+        """Fitted parameters in the reference_parameters.json format."""
+        return {"x0": self.x0, "y0": self.y0, "L": self.L, "tau0": self.tau0}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+def sphere_model(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], x0: float, y0: float, L: float, tau0: float
+) -> npt.NDArray[np.float64]:
+    """
+    Arrival time of a spherical pulse front.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Fiber positions (mm)
+    x0, y0 : float
+        Center of the sphere (mm)
+    L : float
+        Radius of curvature (mm)
+    tau0 : float
+        Arrival time at the center (fs)
+
+    Returns
+    -------
+    array_like
+        Arrival times (fs)
+    """
+    return (np.sqrt((x - x0) ** 2 + (y - y0) ** 2 + L**2) - L) / _C + tau0
+
+
+def _model_and_jacobian(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], q: npt.NDArray[np.float64]
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Evaluate the batched model (B, N) and its analytic Jacobian (B, N, 4).
+
+    The sphere is parametrized by q = (x0 / L, y0 / L, 1 / L, arrival time at
+    the origin), in which the model stays well conditioned as the front
+    flattens. With S = sqrt((kx - u)^2 + (ky - v)^2 + 1) and S0 its value at
+    the origin, t = (k r^2 - 2 (u x + v y)) / (c (S + S0)) + t_origin.
+    """
+    u, v, k, t_origin = (q[:, i : i + 1] for i in range(4))
+    du = k * x - u
+    dv = k * y - v
+    S = np.sqrt(du**2 + dv**2 + 1)
+    S0 = np.sqrt(u**2 + v**2 + 1)
+    numerator = k * (x**2 + y**2) - 2 * (u * x + v * y)
+    denominator = _C * (S + S0)
+
+    front = numerator / denominator
+    model = front + t_origin
+
+    # Quotient rule with the derivatives of the numerator and of S + S0
+    jacobian = np.stack(
+        [
+            (-2 * x - front * _C * (u / S0 - du / S)) / denominator,
+            (-2 * y - front * _C * (v / S0 - dv / S)) / denominator,
+            (x**2 + y**2 - front * _C * (du * x + dv * y) / S) / denominator,
+            np.ones_like(model),
+        ],
+        axis=-1,
+    )
+    return model, jacobian
+
+
+def _to_sphere(q: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Fit parameters (x0 / L, y0 / L, 1 / L, t_origin) to (x0, y0, L, tau0)."""
+    u, v, k, t_origin = q.T
+    r2 = u**2 + v**2
+    # sqrt(r2 + 1) - 1 written without cancellation
+    return np.stack([u / k, v / k, 1 / k, t_origin - r2 / (k * _C * (np.sqrt(r2 + 1) + 1))], axis=-1)
+
+
+def _initial_guess(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], t: npt.NDArray[np.float64], mask: npt.NDArray[np.bool_]
+) -> npt.NDArray[np.float64]:
+    """
+    Closed-form initial guess from the paraxial approximation.
+
+    With sqrt(r^2 + L^2) - L ~ r^2 / (2L) the model becomes the paraboloid
+    t = a (x^2 + y^2) + b x + c y + d, which is solved by linear least squares.
+    Flat or inverted fronts are seeded from a plane fit t = b x + c y + d with
+    the largest radius of curvature.
+    """
+    q0 = np.empty((x.shape[0], 4))
+    for i in range(x.shape[0]):
+        xi, yi, ti = x[i, mask[i]], y[i, mask[i]], t[i, mask[i]]
+        design = np.column_stack([xi**2 + yi**2, xi, yi, np.ones_like(xi)])
+        (a, b, c, d), *_ = np.linalg.lstsq(design, ti, rcond=None)
+        if 2 * a * _C <= _MIN_CURVATURE:
+            (b, c, d), *_ = np.linalg.lstsq(design[:, 1:], ti, rcond=None)
+        k = np.clip(2 * a * _C, _MIN_CURVATURE, _MAX_CURVATURE)
+        q0[i] = (-b * _C, -c * _C, k, d)
+
+    return q0
+
+
+def _masked_median(values: npt.NDArray[np.float64], mask: npt.NDArray[np.bool_]) -> npt.NDArray[np.float64]:
+    """Median of each row over the masked entries (much faster than nanmedian for small rows)."""
+    ordered = np.sort(np.where(mask, values, np.inf), axis=1)
+    n_valid = mask.sum(axis=1)
+    rows = np.arange(values.shape[0])
+    return 0.5 * (ordered[rows, (n_valid - 1) // 2] + ordered[rows, n_valid // 2])
+
+
+def _robust_scale(residuals: npt.NDArray[np.float64], mask: npt.NDArray[np.bool_]) -> npt.NDArray[np.float64]:
+    """Robust residual scale (MAD) per fit, shape (B, 1)."""
+    center = _masked_median(residuals, mask)[:, np.newaxis]
+    scale = 1.4826 * _masked_median(np.abs(residuals - center), mask)
+    return np.maximum(scale, 1e-6)[:, np.newaxis]
+
+
+def _robust_weights(
+    residuals: npt.NDArray[np.float64], mask: npt.NDArray[np.bool_], loss: str, scale: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """IRLS weights for the given loss, zero outside the mask."""
+    weights = mask.astype(np.float64)
+    if loss == "linear":
+        return weights
+
+    z = np.abs(residuals) / scale
+    if loss == "huber":
+        weights *= np.where(z <= 1.345, 1.0, 1.345 / np.maximum(z, 1e-12))
+    else:  # soft_l1
+        weights *= 1 / np.sqrt(1 + z**2)
+    return weights
+
+
+def fit_reference_sphere_batch(
+    x: npt.NDArray[np.float64],
+    y: npt.NDArray[np.float64],
+    time_interval: npt.NDArray[np.float64],
+    loss: str = "linear",
+    f_scale: float | None = None,
+    max_iterations: int = 50,
+    tolerance: float = 1e-8,
+) -> list[SphereFitResult]:
+    """
+    Fit reference spheres to several delay maps at once.
+
+    A damped Gauss-Newton (Levenberg-Marquardt) iteration with an analytic
+    Jacobian is run for all fits simultaneously. Robust losses are handled by
+    iteratively reweighted least squares. The default linear loss minimizes the
+    same unweighted residual as a plain least-squares fit. The radius of
+    curvature is kept between 1 mm and 1 km, so flat and inverted fronts
+    converge to the flattest sphere instead of drifting towards a plane; such
+    fits are flagged with ``at_bound``.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Fiber positions (mm), shape (B, ...) or broadcastable to ``time_interval``
+    time_interval : array_like
+        Measured delays (fs) of shape (B, ...); NaN marks missing fibers
+    loss : str
+        'linear', 'huber' or 'soft_l1'
+    f_scale : float, optional
+        Residual scale (fs) of the robust loss, estimated from the data if None
+    max_iterations : int
+        Maximum number of iterations
+    tolerance : float
+        Relative parameter or cost change at which a fit is converged
+
+    Returns
+    -------
+    list[SphereFitResult]
+        One result per delay map
+    """
+    if loss not in ["linear", "huber", "soft_l1"]:
+        raise ValueError(f"Invalid loss: {loss}")
+
+    t = np.asarray(time_interval, dtype=np.float64)
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), t)[:2]
+    n_batch = t.shape[0]
+    x, y, t = x.reshape(n_batch, -1), y.reshape(n_batch, -1), t.reshape(n_batch, -1)
+
+    mask = np.isfinite(t) & np.isfinite(x) & np.isfinite(y)
+    if np.any(mask.sum(axis=1) < 4):
+        raise ValueError("At least 4 valid delays are required to fit the reference sphere")
+    t = np.where(mask, t, 0.0)
+
+    q = _initial_guess(x, y, t, mask)
+    damping = np.full(n_batch, 1e-3)
+    converged = np.zeros(n_batch, dtype=bool)
+    n_iterations = np.zeros(n_batch, dtype=int)
+
+    model, jacobian = _model_and_jacobian(x, y, q)
+    residuals = t - model
+    # The loss scale is fixed from the initial guess so the weights only follow the residuals
+    scale = _robust_scale(residuals, mask) if f_scale is None else np.full((n_batch, 1), f_scale)
+    weights = _robust_weights(residuals, mask, loss, scale)
+    cost = np.sum(weights * residuals**2, axis=1)
+
+    for _ in range(max_iterations):
+        active = ~converged
+        if not np.any(active):
+            break
+        n_iterations[active] += 1
+
+        # The curvature is held at a bound it is pushed against by leaving it out of the step
+        JtWr = np.einsum("bnk,bn->bk", jacobian, weights * residuals)
+        held = ((q[:, 2] <= _MIN_CURVATURE) & (JtWr[:, 2] < 0)) | ((q[:, 2] >= _MAX_CURVATURE) & (JtWr[:, 2] > 0))
+        free = np.ones((n_batch, 1, 4))
+        free[held, :, 2] = 0
+        JtWr[held, 2] = 0
+
+        # Damped normal equations, scaled by the diagonal (Marquardt)
+        JtW = (jacobian * free).transpose(0, 2, 1) * weights[:, np.newaxis, :]
+        JtWJ = JtW @ (jacobian * free)
+        diagonal = np.einsum("bii->bi", JtWJ)
+        A = JtWJ + (damping[:, np.newaxis] * np.maximum(diagonal, 1e-12))[..., np.newaxis] * np.eye(4)
+        step = np.linalg.solve(A, JtWr[..., np.newaxis])[..., 0]
+        step[converged] = 0
+
+        # Evaluate the trial step with the current weights
+        q_trial = q + step
+        q_trial[:, 2] = np.clip(q_trial[:, 2], _MIN_CURVATURE, _MAX_CURVATURE)
+        step = q_trial - q
+        model_trial, jacobian_trial = _model_and_jacobian(x, y, q_trial)
+        residuals_trial = t - model_trial
+        cost_trial = np.sum(weights * residuals_trial**2, axis=1)
+
+        accept = active & (cost_trial <= cost)
+        cost_decrease = (cost - cost_trial) / np.maximum(cost, 1e-300)
+        q[accept] = q_trial[accept]
+        jacobian[accept] = jacobian_trial[accept]
+        residuals[accept] = residuals_trial[accept]
+        damping = np.where(accept, np.maximum(damping / 10, 1e-12), damping * 10)
+
+        # Update robust weights for accepted steps
+        weights_new = _robust_weights(residuals, mask, loss, scale)
+        weights[accept] = weights_new[accept]
+        cost = np.sum(weights * residuals**2, axis=1)
+
+        relative_step = np.max(np.abs(step) / (np.abs(q) + 1), axis=1)
+        converged |= accept & ((relative_step < tolerance) | (cost_decrease < tolerance))
+        converged |= active & (damping > 1e12)
+
+    p = _to_sphere(q)
+    results = []
+    for i in range(n_batch):
+        res = residuals[i, mask[i]]
+        outliers = (weights[i, mask[i]] < 0.5) if loss != "linear" else np.zeros(res.size, dtype=bool)
+        results.append(
+            SphereFitResult(
+                *(float(value) for value in p[i]),
+                n_iterations=int(n_iterations[i]),
+                converged=bool(converged[i]),
+                residual_rms=float(np.sqrt(np.mean(res**2))),
+                n_outliers=int(np.sum(outliers)),
+                at_bound=bool(q[i, 2] <= _MIN_CURVATURE or q[i, 2] >= _MAX_CURVATURE),
+            )
+        )
+
+    return results
+
+
+def fit_reference_sphere(
+    x: npt.NDArray[np.float64],
+    y: npt.NDArray[np.float64],
+    time_interval: npt.NDArray[np.float64],
+    loss: str = "linear",
+    f_scale: float | None = None,
+    max_iterations: int = 50,
+    tolerance: float = 1e-8,
+) -> SphereFitResult:
+    """
+    Fit the reference sphere (x0, y0, L, tau0) to a delay map.
+
+    Parameters
+    ----------
+    x, y : array_like
+        Fiber positions (mm)
+    time_interval : array_like
+        Measured delays (fs); NaN marks missing fibers
+    loss : str
+        'linear', 'huber' or 'soft_l1'
+    f_scale : float, optional
+        Residual scale (fs) of the robust loss, estimated from the data if None
+    max_iterations : int
+        Maximum number of iterations
+    tolerance : float
+        Relative parameter or cost change at which the fit is converged
+
+    Returns
+    -------
+    SphereFitResult
+        Fitted parameters and diagnostics
+    """
+    t = np.asarray(time_interval)[np.newaxis]
+    x = np.broadcast_to(x, t.shape[1:])[np.newaxis]
+    y = np.broadcast_to(y, t.shape[1:])[np.newaxis]
+    return fit_reference_sphere_batch(x, y, t, loss, f_scale, max_iterations, tolerance)[0]
+
+
+def fit_reference_parameters_batch(pulses: list[Any], **kwargs) -> list[SphereFitResult]:
+    """
+    Fit reference spheres for several processed calibration measurements at once.
+
+    Parameters
+    ----------
+    pulses : list[SIFAST]
+        Processed measurements (e.g. one per calibration folder)
+    **kwargs
+        Options for :func:`fit_reference_sphere_batch`
+
+    Returns
+    -------
+    list[SphereFitResult]
+        One result per measurement
+    """
+    n_max = max(pulse.time_interval.size for pulse in pulses)
+
+    def padded(values: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        flat = np.full(n_max, np.nan)
+        flat[: values.size] = values.ravel()
+        return flat
+
+    x = np.stack([padded(pulse.x_matrix) for pulse in pulses])
+    y = np.stack([padded(pulse.y_matrix) for pulse in pulses])
+    t = np.stack([padded(pulse.time_interval) for pulse in pulses])
+    return fit_reference_sphere_batch(x, y, t, **kwargs)
+
+
+@dataclass(frozen=True)
+class ReferenceGeometry:
+    """Reference sphere terms on a fiber array grid (read-only arrays)."""
+
+    pulse_front_reference: npt.NDArray[np.float64]
+    spherical_phase: npt.NDArray[np.float64]
+
+
+def reference_geometry(
+    fiber_array_id: str, dx: float, dy: float, rp: dict[str, float], wavelength_center: float
+) -> ReferenceGeometry:
+    """
+    Reference pulse front and spherical phase of a fiber array, cached.
+
+    The terms only depend on the fiber positions, the reference parameters and
+    the central wavelength, so they are computed once per combination.
+
+    Parameters
+    ----------
+    fiber_array_id : str
+        Fiber array identifier
+    dx, dy : float
+        Fiber array offsets (mm)
+    rp : dict
+        Reference parameters x0, y0, L, tau0
+    wavelength_center : float
+        Central wavelength (nm)
+
+    Returns
+    -------
+    ReferenceGeometry
+        Reference pulse front (fs) and spherical phase wrapped to [0, 2*pi)
+    """
+    # The array configuration is part of the key so re-registered arrays are not served stale
+    config = json.dumps(get_fiber_array_config(fiber_array_id), sort_keys=True, default=str)
+    rp_values = tuple(float(rp[k]) for k in ("x0", "y0", "L", "tau0"))
+    key = (fiber_array_id, config, float(dx), float(dy), rp_values, float(wavelength_center))
+    geometry = _geometry_cache.get(key)
+    if geometry is not None:
+        return geometry
+
+    fiber_array = get_fiber_array(fiber_array_id, dx, dy)
+    distance = np.sqrt((fiber_array.x_matrix - rp["x0"]) ** 2 + (fiber_array.y_matrix - rp["y0"]) ** 2 + rp["L"] ** 2)
+    pulse_front_reference = (distance - rp["L"]) / _C + rp["tau0"]
+
+    # Reduced modulo 2*pi in double precision as the phase reaches ~1e10 rad
+    spherical_phase = np.mod(2 * np.pi * distance / wavelength_center * 1e6, 2 * np.pi)
+
+    pulse_front_reference.setflags(write=False)
+    spherical_phase.setflags(write=False)
+    geometry = ReferenceGeometry(pulse_front_reference, spherical_phase)
+
+    if len(_geometry_cache) >= _GEOMETRY_CACHE_SIZE:
+        _geometry_cache.pop(next(iter(_geometry_cache), None), None)
+    _geometry_cache[key] = geometry
+    return geometry
+
+
+def clear_geometry_cache() -> None:
+    """Clear the cached reference geometries."""
+    _geometry_cache.clear()
@@ -0,0 +1,510 @@
+"""Live acquisition pipeline for on-line SIFAST processing."""
+
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import h5py
+import numpy as np
+import numpy.typing as npt
+
+from ..config.settings import ProcessingConfig
+from .plan import SIFASTPlan
+from .sifast import SIFAST
+from .srsi import SRSI
+
+# Images needed per acquisition mode and the SIFAST arguments they are passed as
+CHANNELS = {
+    "single": ["interference"],
+    "double": ["interference", "unknown"],
+    "triple": ["interference", "unknown", "reference"],
+}
+IMAGE_ARGUMENTS = {
+    "interference": "image_interference",
+    "unknown": "image_unknown",
+    "reference": "image_reference",
+}
+_FILE_PATTERNS = {"interference": "*inter*", "unknown": "*unk*", "reference": "*ref*"}
+
+
+class FrameSource(ABC):
+    """Source of camera frames for the live pipeline."""
+
+    def __init__(self, mode_acquire: str):
+        if mode_acquire not in CHANNELS:
+            raise ValueError(f"Invalid mode_acquire: {mode_acquire}")
+        self.mode_acquire = mode_acquire
+
+    @property
+    def channels(self) -> list[str]:
+        """Images acquired per frame."""
+        return CHANNELS[self.mode_acquire]
+
+    @property
+    @abstractmethod
+    def wavelength(self) -> npt.NDArray[np.float64]:
+        """Wavelength axis of the camera (nm)."""
+        pass
+
+    @property
+    @abstractmethod
+    def image_shape(self) -> tuple[int, int]:
+        """Shape of one image."""
+        pass
+
+    @property
+    def image_dtype(self) -> np.dtype:
+        """Data type of the images."""
+        return np.dtype(np.float64)
+
+    @abstractmethod
+    def read_into(self, buffers: dict[str, npt.NDArray[Any]]) -> bool:
+        """
+        Write the next frame into preallocated buffers.
+
+        Parameters
+        ----------
+        buffers : dict
+            One array per channel of shape ``image_shape``
+
+        Returns
+        -------
+        bool
+            False when the source is exhausted
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the source."""
+        pass
+
+
+class FileReplaySource(FrameSource):
+    """Replays recorded HDF5 measurements (inter.h5, unk.h5, ref.h5) as frames."""
+
+    def __init__(
+        self,
+        folder_paths: str | Path | list[str | Path],
+        mode_acquire: str = "triple",
+        frame_rate: float | None = None,
+        loop: bool = False,
+        n_frames: int | None = None,
+    ):
+        """
+        Initialize replay source.
+
+        Parameters
+        ----------
+        folder_paths : str, Path or list
+            Measurement folder(s), replayed in order
+        mode_acquire : str
+            Acquisition mode ('single', 'double', 'triple')
+        frame_rate : float, optional
+            Simulated camera rate (Hz), as fast as possible if None
+        loop : bool
+            Restart from the first folder when all are replayed
+        n_frames : int, optional
+            Stop after this many frames
+        """
+        super().__init__(mode_acquire)
+        if isinstance(folder_paths, (str, Path)):
+            folder_paths = [folder_paths]
+
+        self.files = [self._find_files(Path(folder)) for folder in folder_paths]
+        if not self.files:
+            raise ValueError("No measurement folders given")
+
+        self.frame_rate = frame_rate
+        self.loop = loop
+        self.n_frames = n_frames
+        self._index = 0
+        self._next_time = None
+
+        with h5py.File(self.files[0]["interference"], "r") as f:
+            self._wavelength = f["wavelength"][:]
+            self._shape = f["image"].shape
+            self._dtype = f["image"].dtype
+
+    def _find_files(self, folder: Path) -> dict[str, Path]:
+        """Locate the HDF5 file of each channel."""
+        files = {}
+        for channel in self.channels:
+            pattern = _FILE_PATTERNS[channel]
+            matches = list(folder.glob(f"{pattern}.h5")) + list(folder.glob(f"{pattern}.hdf5"))
+            if not matches:
+                raise FileNotFoundError(f"No {channel} HDF5 file found in {folder}")
+            files[channel] = matches[0]
+        return files
+
+    @property
+    def wavelength(self) -> npt.NDArray[np.float64]:
+        return self._wavelength
+
+    @property
+    def image_shape(self) -> tuple[int, int]:
+        return self._shape
+
+    @property
+    def image_dtype(self) -> np.dtype:
+        return self._dtype
+
+    def read_into(self, buffers: dict[str, npt.NDArray[Any]]) -> bool:
+        if self.n_frames is not None and self._index >= self.n_frames:
+            return False
+        if self._index >= len(self.files) and not self.loop:
+            return False
+
+        # Pace to the simulated camera rate
+        if self.frame_rate:
+            now = time.perf_counter()
+            if self._next_time is None:
+                self._next_time = now
+            elif self._next_time > now:
+                time.sleep(self._next_time - now)
+            self._next_time += 1 / self.frame_rate
+
+        files = self.files[self._index % len(self.files)]
+        for channel in self.channels:
+            with h5py.File(files[channel], "r") as f:
+                f["image"].read_direct(buffers[channel])
+
+        self._index += 1
+        return True
+
+
+class FrameRing:
+    """Bounded ring of preallocated frame buffers shared by producer and consumers."""
+
+    def __init__(self, n_buffers: int, channels: list[str], shape: tuple[int, int], dtype: np.dtype):
+        """
+        Initialize ring.
+
+        Parameters
+        ----------
+        n_buffers : int
+            Number of frames that can be in flight
+        channels : list[str]
+            Images per frame
+        shape : tuple[int, int]
+            Shape of one image
+        dtype : dtype
+            Data type of the images
+        """
+        if n_buffers < 2:
+            raise ValueError("At least 2 buffers are required")
+
+        self.buffers = [{channel: np.empty(shape, dtype=dtype) for channel in channels} for _ in range(n_buffers)]
+        self._free: queue.Queue[int] = queue.Queue()
+        self._ready: queue.Queue[tuple[int, int, float] | None] = queue.Queue()
+        for slot in range(n_buffers):
+            self._free.put(slot)
+
+    def acquire(self, block: bool = True, timeout: float | None = None) -> int | None:
+        """Take a free slot to write a frame into, None if none is available."""
+        try:
+            return self._free.get(block=block, timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def publish(self, slot: int, index: int, timestamp: float) -> None:
+        """Hand a filled slot to the consumers."""
+        self._ready.put((slot, index, timestamp))
+
+    def close(self, n_consumers: int = 1) -> None:
+        """Signal the consumers that no more frames will arrive."""
+        for _ in range(n_consumers):
+            self._ready.put(None)
+
+    def next_frame(self, timeout: float | None = None) -> tuple[int, int, float] | None:
+        """Wait for a filled slot, None once the ring is closed."""
+        return self._ready.get(timeout=timeout)
+
+    def release(self, slot: int) -> None:
+        """Return a processed slot to the producer."""
+        self._free.put(slot)
+
+
+@dataclass
+class LiveStats:
+    """Throughput and latency of a live pipeline."""
+
+    frames_acquired: int = 0
+    frames_processed: int = 0
+    frames_dropped: int = 0
+    frames_failed: int = 0
+    fps: float = 0.0
+    acquisition_fps: float = 0.0
+    latency_last_ms: float = 0.0
+    latency_mean_ms: float = 0.0
+    latency_max_ms: float = 0.0
+    acquisition_error: str | None = None  # exception that stopped the source
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class LiveResult:
+    """Processed frame of a live pipeline."""
+
+    index: int
+    pulse: SIFAST | None
+    latency_ms: float
+    error: str | None = None
+
+
+class LivePipeline:
+    """
+    Acquisition-to-result pipeline for live SIFAST processing.
+
+    A producer thread writes frames from a :class:`FrameSource` into a ring of
+    preallocated buffers while consumer threads process them with SIFAST in
+    acquire mode. When all buffers are busy, new frames are dropped (like a
+    camera that cannot wait) unless ``drop_frames`` is False.
+
+    An exception of the source stops the acquisition. It is reported to
+    ``result_callback`` as a result without pulse, kept in ``error`` and
+    re-raised by ``join`` and ``stop``.
+    """
+
+    def __init__(
+        self,
+        source: FrameSource,
+        config: ProcessingConfig | None = None,
+        reference_pulse: SRSI | None = None,
+        config_folder_path: str | Path | None = None,
+        n_buffers: int = 3,
+        n_workers: int = 1,
+        drop_frames: bool = True,
+        keep_images: bool = False,
+        result_callback: Callable[[LiveResult], None] | None = None,
+        window: int = 30,
+        use_plan: bool = False,
+    ):
+        """
+        Initialize pipeline.
+
+        Parameters
+        ----------
+        source : FrameSource
+            Frame source
+        config : ProcessingConfig, optional
+            Processing parameters; ``mode_acquire`` is taken from the source
+        reference_pulse : SRSI, optional
+            Reference pulse for phase compensation
+        config_folder_path : str or Path, optional
+            External configuration folder
+        n_buffers : int
+            Number of preallocated frame buffers
+        n_workers : int
+            Number of consumer threads
+        drop_frames : bool
+            Drop frames when no buffer is free instead of waiting
+        keep_images : bool
+            Keep a copy of the raw images on each pulse
+        result_callback : callable, optional
+            Called from a consumer thread with each :class:`LiveResult`
+        window : int
+            Number of recent frames used for the rate and latency statistics
+        use_plan : bool
+            Compile a :class:`SIFASTPlan` from the first frame and reuse it for
+            the following ones; the fiber set and reference parameters are then
+            fixed to those of the first frame
+        """
+        self.source = source
+        self.reference_pulse = reference_pulse
+        self.n_workers = n_workers
+        self.drop_frames = drop_frames
+        self.keep_images = keep_images
+        self.result_callback = result_callback
+        self.use_plan = use_plan
+        self.plan: SIFASTPlan | None = None
+
+        self._kwargs = (config or ProcessingConfig()).to_dict()
+        self._kwargs.update(mode_input="acquire", mode_acquire=source.mode_acquire)
+        self._config_folder_path = config_folder_path
+
+        self.ring = FrameRing(n_buffers, source.channels, source.image_shape, source.image_dtype)
+        self._scratch = {channel: np.empty(source.image_shape, source.image_dtype) for channel in source.channels}
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._stats = LiveStats()
+        self._acquired_times: deque[float] = deque(maxlen=window)
+        self._processed_times: deque[float] = deque(maxlen=window)
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.latest: LiveResult | None = None
+        self.error: Exception | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether any pipeline thread is alive."""
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def stats(self) -> LiveStats:
+        """Snapshot of the current statistics."""
+        with self._lock:
+            stats = LiveStats(**self._stats.to_dict())
+            stats.acquisition_fps = self._rate(self._acquired_times)
+            stats.fps = self._rate(self._processed_times)
+            if self._latencies:
+                stats.latency_mean_ms = 1e3 * float(np.mean(self._latencies))
+            return stats
+
+    @staticmethod
+    def _rate(times: deque[float]) -> float:
+        """Event rate over a window of timestamps."""
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def start(self) -> "LivePipeline":
+        """Start the producer and consumer threads."""
+        if self.running:
+            raise RuntimeError("Pipeline is already running")
+
+        self._stop.clear()
+        self.error = None
+        self._threads = [threading.Thread(target=self._produce, name="live-producer", daemon=True)]
+        for i in range(self.n_workers):
+            self._threads.append(threading.Thread(target=self._consume, name=f"live-consumer-{i}", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop acquisition and wait for in-flight frames to finish."""
+        self._stop.set()
+        self.join(timeout)
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait until the source is exhausted and all frames are processed, re-raising a source error."""
+        for thread in self._threads:
+            thread.join(timeout)
+
+        # Raised once, the message stays in the statistics
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def __enter__(self) -> "LivePipeline":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _produce(self) -> None:
+        """Read frames from the source into free buffers."""
+        index = 0
+        slot = None
+        try:
+            while not self._stop.is_set():
+                slot = self.ring.acquire(block=not self.drop_frames, timeout=None if self.drop_frames else 0.1)
+                if slot is None and not self.drop_frames:
+                    continue
+
+                buffers = self.ring.buffers[slot] if slot is not None else self._scratch
+                if not self.source.read_into(buffers):
+                    if slot is not None:
+                        self.ring.release(slot)
+                    break
+                timestamp = time.perf_counter()
+
+                with self._lock:
+                    self._stats.frames_acquired += 1
+                    self._acquired_times.append(timestamp)
+                    if slot is None:
+                        self._stats.frames_dropped += 1
+
+                if slot is not None:
+                    self.ring.publish(slot, index, timestamp)
+                    slot = None
+                index += 1
+        except Exception as e:
+            # Without this the error would only reach the thread excepthook
+            if slot is not None:
+                self.ring.release(slot)
+            message = f"Acquisition failed: {type(e).__name__}: {e}"
+            self.error = e
+            with self._lock:
+                self._stats.acquisition_error = message
+            result = LiveResult(index, None, 0.0, message)
+            self.latest = result
+            if self.result_callback is not None:
+                self.result_callback(result)
+        finally:
+            self.ring.close(self.n_workers)
+
+    def _consume(self) -> None:
+        """Process frames until the ring is closed."""
+        while (item := self.ring.next_frame()) is not None:
+            slot, index, timestamp = item
+            buffers = self.ring.buffers[slot]
+            try:
+                pulse = self._process(buffers)
+                error = None
+            except Exception as e:
+                pulse, error = None, str(e)
+            finally:
+                self.ring.release(slot)
+
+            done = time.perf_counter()
+            latency = done - timestamp
+            with self._lock:
+                if error is None:
+                    self._stats.frames_processed += 1
+                    self._processed_times.append(done)
+                    self._latencies.append(latency)
+                    self._stats.latency_last_ms = 1e3 * latency
+                    self._stats.latency_max_ms = max(self._stats.latency_max_ms, 1e3 * latency)
+                else:
+                    self._stats.frames_failed += 1
+
+            result = LiveResult(index, pulse, 1e3 * latency, error)
+            self.latest = result
+            if self.result_callback is not None:
+                self.result_callback(result)
+
+    def _process(self, buffers: dict[str, npt.NDArray[Any]]) -> SIFAST:
+        """Run SIFAST on one frame."""
+        if self.plan is not None:
+            pulse = self.plan.run(buffers)
+            if self.keep_images:
+                for channel, buffer in buffers.items():
+                    setattr(pulse, IMAGE_ARGUMENTS[channel], buffer.copy())
+            return pulse
+
+        images = {IMAGE_ARGUMENTS[channel]: buffer for channel, buffer in buffers.items()}
+        pulse = SIFAST(
+            **self._kwargs,
+            reference_pulse=self.reference_pulse,
+            config_folder_path=self._config_folder_path,
+            wavelength=self.source.wavelength,
+            **images,
+        )
+
+        # The buffers are reused for later frames, so the pulse must not keep them
+        pulse._stage_graph = None
+        pulse.__dict__.pop("_St_packed", None)  # only needed for updates
+        for name in images:
+            pulse.params.pop(name, None)
+            if self.keep_images:
+                setattr(pulse, name, getattr(pulse, name).copy())
+            else:
+                pulse.__dict__.pop(name, None)
+
+        if self.use_plan:
+            with self._lock:
+                if self.plan is None:
+                    self.plan = SIFASTPlan.from_pulse(pulse, self.reference_pulse)
+
+        return pulse
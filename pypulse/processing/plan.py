@@ -0,0 +1,351 @@
+"""Precompiled SIFAST processing for repeated acquisitions."""
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import scipy.interpolate as interp
+from scipy.fft import fft, ifft
+
+from ..config.settings import ProcessingConfig
+from ..core.filters import filter_bank
+from ..core.packed import to_dense
+from ..utils.math import interpolate_peaks, wrap_phase
+from .calibration import reference_geometry
+from .sifast import SIFAST
+from .srsi import SRSI
+
+# Images per acquisition mode and the spectra they are resampled into
+_SPECTRA = {
+    "interference": "Sw_interference_packed",
+    "unknown": "Sw_unknown_packed",
+    "reference": "Sw_reference_packed",
+}
+_CHANNELS = {
+    "single": ["interference"],
+    "double": ["interference", "unknown"],
+    "triple": ["interference", "unknown", "reference"],
+}
+
+# Attributes recomputed for every shot, all others are shared with the template
+_PER_SHOT = {
+    "image_interference",
+    "image_unknown",
+    "image_reference",
+    "Sw_interference_packed",
+    "Sw_unknown_packed",
+    "Sw_reference_packed",
+    "phase_diff_with_sphere_packed",
+    "time_interval",
+    "pulse_front",
+    "phase_diff_packed",
+    "phase_packed",
+    "_folder_path",
+    "_St_packed",
+}
+
+
+class SIFASTPlan:
+    """
+    SIFAST processing compiled once and applied to many shots.
+
+    The plan is built from a template pulse processed the usual way. It keeps
+    the fiber pixel rows, the resampling operators, the time axis, the
+    reference geometry, the interpolated reference phase and the FFT work
+    buffers. :meth:`run` then only performs the per-shot math.
+
+    The fibers detected on the template are used for every shot, and the
+    reference parameters are not refitted. Work buffers are kept per thread,
+    so one plan can be shared by several worker threads.
+    """
+
+    def __init__(
+        self,
+        config: ProcessingConfig,
+        wavelength: npt.NDArray[np.float64],
+        images: dict[str, npt.NDArray[Any]],
+        reference_pulse: SRSI | None = None,
+        config_folder_path: str | Path | None = None,
+        workers: int | None = None,
+    ):
+        """
+        Compile a plan from a sample shot.
+
+        Parameters
+        ----------
+        config : ProcessingConfig
+            Processing parameters
+        wavelength : array_like
+            Wavelength axis of the camera (nm)
+        images : dict
+            Sample shot, one image per channel ('interference', 'unknown', 'reference')
+        reference_pulse : SRSI, optional
+            Reference pulse for phase compensation
+        config_folder_path : str or Path, optional
+            Configuration folder with the fiber calibration and reference parameters
+        workers : int, optional
+            Number of FFT threads
+        """
+        kwargs = config.to_dict()
+        kwargs["mode_input"] = "acquire"
+        kwargs.update({f"image_{channel}": images[channel] for channel in _CHANNELS[config.mode_acquire]})
+        template = SIFAST(
+            reference_pulse=reference_pulse, config_folder_path=config_folder_path, wavelength=wavelength, **kwargs
+        )
+        self._compile(template, reference_pulse, workers)
+
+    @classmethod
+    def from_pulse(cls, pulse: SIFAST, reference_pulse: SRSI | None = None, workers: int | None = None) -> "SIFASTPlan":
+        """
+        Compile a plan from an already processed pulse.
+
+        Parameters
+        ----------
+        pulse : SIFAST
+            Processed pulse used as template
+        reference_pulse : SRSI, optional
+            Reference pulse, defaults to the one the pulse was processed with
+        workers : int, optional
+            Number of FFT threads
+
+        Returns
+        -------
+        SIFASTPlan
+            Compiled plan
+        """
+        plan = cls.__new__(cls)
+        if reference_pulse is None:
+            reference_pulse = pulse.params.get("reference_pulse")
+        plan._compile(pulse, reference_pulse, workers)
+        return plan
+
+    def _compile(self, template: SIFAST, reference_pulse: SRSI | None, workers: int | None) -> None:
+        """Precompute everything that does not change from shot to shot."""
+        params = template.params
+        n_omega, n_fft = template.n_omega, template.n_fft
+        if n_omega % 2 or n_fft % 2:
+            raise ValueError("SIFASTPlan requires even n_omega and n_fft")
+
+        self.mode_acquire = params["mode_acquire"]
+        self.dtype = template.dtype
+        self.complex_dtype = template.complex_dtype
+        self.workers = workers
+        self.n_fibers = len(template.row)
+
+        # Static attributes shared by all results
+        self._static = {key: value for key, value in template.__dict__.items() if key not in _PER_SHOT}
+        self._static["params"] = {k: v for k, v in params.items() if not k.startswith("image_")}
+        self._static["_profiler"] = self._static["timings"] = None  # the template's stage timings are not per shot
+        self._static["_stage_graph"] = None  # plan results are not updated stage by stage
+        self._static["pulse_front_reference"] = template.pulse_front_reference.copy()
+        self._static["pulse_front_reference"].setflags(write=False)
+        self._row, self._col, self._shape = template.row, template.col, template.shape
+
+        self._compile_resampling(template, params["wavelength_center"], params["wavelength_width"], params["method"])
+        self._compile_transforms(template, params.get("delay_min"), params["n_fft"] == "auto")
+
+        # Reference sphere terms
+        geometry = reference_geometry(
+            params["fiber_array_id"], params["dx"], params["dy"], template.rp, params["wavelength_center"]
+        )
+        self._pulse_front_reference = geometry.pulse_front_reference[self._row, self._col]
+        self._spherical_phase = geometry.spherical_phase[self._row, self._col][:, np.newaxis]
+        self._omega_axis = template.omega_axis
+        self._omega = template.omega_axis.astype(self.dtype)
+
+        # Reference phase for compensation
+        self._phase_reference = None
+        if reference_pulse is not None:
+            self._phase_reference = reference_pulse.phase_on(template.omega_axis, params["method"], self.dtype)
+
+        self._local = threading.local()
+
+    def _compile_resampling(
+        self, template: SIFAST, wavelength_center: float, wavelength_width: float, method: str
+    ) -> None:
+        """Build the operator resampling camera rows onto the frequency axis."""
+        self._pixels = template.pixel_of_signal
+        wavelength = template.wavelength
+        self._background = np.abs(wavelength - wavelength_center) > wavelength_width / 2
+
+        omega = 2 * np.pi * template.SPEED_OF_LIGHT / wavelength - template.omega_center
+        omega_axis = template.omega_axis
+        self._inside = (omega_axis >= omega.min()) & (omega_axis <= omega.max())
+
+        if method in ["linear", "slinear"]:
+            # Two-point gather, same indexing as interp1d
+            order = np.argsort(omega, kind="mergesort")
+            omega_sorted = omega[order]
+            upper = np.clip(np.searchsorted(omega_sorted, omega_axis), 1, len(omega) - 1)
+            self._lower_index = order[upper - 1]
+            self._upper_index = order[upper]
+            lower_omega = omega_sorted[upper - 1]
+            self._fraction = (omega_axis - lower_omega) / (omega_sorted[upper] - lower_omega)
+            self._operator = None
+        else:
+            # Spline interpolation is linear in the data, so it is a dense matrix
+            interpolator = interp.interp1d(
+                omega, np.eye(len(omega)), kind=method, axis=0, bounds_error=False, fill_value=0
+            )
+            self._operator = np.ascontiguousarray(interpolator(omega_axis).T)
+
+    def _compile_transforms(self, template: SIFAST, delay_min: float | None, interpolate_peak: bool) -> None:
+        """Precompute FFT index maps, the time axes and the delay search window."""
+        n_omega, n_fft = template.n_omega, template.n_fft
+
+        # The centered spectrum of iFt/Ft maps to these bins of the unshifted FFT
+        self._spectrum_bins = (np.arange(n_omega) - n_omega // 2) % n_fft
+
+        t_axis = template.t_axis
+        self._t_axis = t_axis
+
+        # Delay search window (positive delays are the first half of the unshifted output)
+        if delay_min is None:
+            t_start = n_fft // 2
+        else:
+            t_start = np.where(t_axis > delay_min / 2)[0][0]
+        window = (np.arange(t_start, n_fft) - n_fft // 2) % n_fft
+        if np.all(np.diff(window) == 1):
+            self._window = slice(window[0], window[-1] + 1)
+        else:
+            self._window = window
+        self._t_window = t_axis[t_start:]
+        self._interpolate_peak = interpolate_peak
+
+    def _buffers(self) -> dict[str, npt.NDArray[Any]]:
+        """Per-thread work buffers, allocated on first use."""
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            shape = (self.n_fibers, len(self._t_axis))
+            buffers = {
+                "spectrum": np.zeros(shape, dtype=self.complex_dtype),
+                "AC": np.empty(shape, dtype=self.complex_dtype),
+                "DC": np.empty(shape, dtype=self.complex_dtype),
+            }
+            self._local.buffers = buffers
+        return buffers
+
+    def resample(self, image: npt.NDArray[Any]) -> npt.NDArray[np.float64]:
+        """
+        Resample the fiber rows of one camera image.
+
+        Parameters
+        ----------
+        image : array_like
+            Camera image (pixels x wavelengths)
+
+        Returns
+        -------
+        array_like
+            Spectra of shape (n_fibers, n_omega)
+        """
+        spectra = image[self._pixels].astype(np.float64)
+        if np.any(self._background):
+            spectra -= spectra[:, self._background].mean(axis=1, keepdims=True)
+
+        if self._operator is None:
+            lower = spectra[:, self._lower_index]
+            resampled = (spectra[:, self._upper_index] - lower) * self._fraction + lower
+        else:
+            resampled = spectra @ self._operator
+
+        resampled[:, ~self._inside] = 0
+        resampled[resampled < 0] = 0
+        return resampled.astype(self.dtype, copy=False)
+
+    def _extract_delays(self, St: npt.NDArray[np.complex128]) -> npt.NDArray[np.float64]:
+        """Delay of the strongest peak in the search window, as in PulseBase._extract_delays."""
+        signal = np.abs(St[:, self._window]).astype(np.float64)
+        low = signal.min(axis=1, keepdims=True)
+        threshold = low + 0.01 * (signal.max(axis=1, keepdims=True) - low)
+
+        # Interior local maxima above the threshold
+        center = signal[:, 1:-1]
+        peaks = (center > signal[:, :-2]) & (center > signal[:, 2:]) & (center >= threshold)
+        if self._interpolate_peak:
+            # Strongest peak by interpolated height, refined between samples
+            rows, cols = np.nonzero(peaks)
+            offset, height = interpolate_peaks(signal[rows[:, np.newaxis], cols[:, np.newaxis] + np.arange(3)])
+            order = np.lexsort((height, rows))
+            last = order[np.append(rows[order][1:] != rows[order][:-1], True)] if len(rows) else order
+            delay = np.full(len(signal), np.nan)
+            delay[rows[last]] = self._t_window[cols[last] + 1] + offset[last] * (self._t_window[1] - self._t_window[0])
+        else:
+            strongest = np.argmax(np.where(peaks, center, -np.inf), axis=1) + 1
+            delay = self._t_window[strongest]
+
+        # At least two peaks are required, as in the full processing
+        return np.where(peaks.sum(axis=1) > 1, delay, np.nan)
+
+    def run(self, images: dict[str, npt.NDArray[Any]], filter_order: int = 8) -> SIFAST:
+        """
+        Process one shot.
+
+        Parameters
+        ----------
+        images : dict
+            One camera image per channel ('interference', 'unknown', 'reference')
+        filter_order : int
+            Super-Gaussian filter order (must be even)
+
+        Returns
+        -------
+        SIFAST
+            Processed pulse sharing the static attributes of the plan
+        """
+        missing = [channel for channel in _CHANNELS[self.mode_acquire] if channel not in images]
+        if missing:
+            raise ValueError(f"Missing images: {', '.join(missing)}")
+        if filter_order % 2 != 0:
+            raise ValueError("Filter order must be even")
+
+        pulse = SIFAST.__new__(SIFAST)
+        pulse.__dict__.update(self._static)
+        pulse.params = self._static["params"].copy()
+        for channel in _CHANNELS[self.mode_acquire]:
+            setattr(pulse, _SPECTRA[channel], self.resample(images[channel]))
+
+        # FTSI: spectrum into the zero-padded FFT buffer, time signal in unshifted order
+        buffers = self._buffers()
+        buffers["spectrum"][:, self._spectrum_bins] = pulse.Sw_interference_packed
+        St = ifft(buffers["spectrum"], axis=-1, workers=self.workers)
+        delay = self._extract_delays(St)
+
+        # AC and DC filters on their support, the time axis starts at the middle of the unshifted signal
+        bank = filter_bank(self._t_axis, filter_order, self.dtype)
+        bank.apply(St, delay, out=(buffers["AC"], buffers["DC"]), shift=-(len(self._t_axis) // 2))
+        Sw_AC = fft(buffers["AC"], axis=-1, workers=self.workers, overwrite_x=True)[:, self._spectrum_bins]
+        Sw_DC = fft(buffers["DC"], axis=-1, workers=self.workers, overwrite_x=True)[:, self._spectrum_bins]
+
+        # Phase relative to the delay
+        phase_diff_with_sphere = np.angle(Sw_AC)
+        phase_diff_with_sphere += self._omega * delay[:, np.newaxis].astype(self.dtype)
+        pulse.phase_diff_with_sphere_packed = wrap_phase(phase_diff_with_sphere, out=phase_diff_with_sphere)
+
+        if self.mode_acquire == "single":
+            abs_AC, abs_DC = np.abs(Sw_AC), np.abs(Sw_DC)
+            a = abs_DC - 2 * abs_AC
+            a[a < 0] = 0
+            pulse.Sw_unknown_packed = (0.5 * (np.sqrt(abs_DC + 2 * abs_AC) + np.sqrt(a))) ** 2
+
+        # Pulse fronts
+        pulse.time_interval = to_dense(delay, self._row, self._col, self._shape)
+        pulse_front = self._pulse_front_reference - delay
+        pulse.pulse_front = to_dense(pulse_front, self._row, self._col, self._shape)
+
+        phase_diff = np.empty_like(phase_diff_with_sphere)
+        np.multiply(pulse_front[:, np.newaxis], self._omega_axis, out=phase_diff)
+        phase_diff += phase_diff_with_sphere
+        phase_diff -= self._spherical_phase
+        pulse.phase_diff_packed = wrap_phase(phase_diff, out=phase_diff)
+
+        # Reference pulse compensation
+        if self._phase_reference is not None:
+            phase = np.add(phase_diff, self._phase_reference, out=np.empty_like(phase_diff))
+            pulse.phase_packed = wrap_phase(phase, out=phase)
+        else:
+            pulse.phase_packed = phase_diff.copy()
+
+        return pulse
@@ -0,0 +1,104 @@
+"""Accuracy of reduced-precision processing compared to double precision."""
+
+import time
+from typing import Any
+
+import numpy as np
+
+from ..utils.math import wrap_phase
+from .sifast import SIFAST
+
+
+def _packed_nbytes(pulse: SIFAST) -> int:
+    """Total size of the per-fiber arrays of a pulse."""
+    return sum(value.nbytes for key, value in vars(pulse).items() if key.endswith("_packed"))
+
+
+def compare_precision(reference: SIFAST, candidate: SIFAST, intensity_threshold: float = 0.01) -> dict[str, float]:
+    """
+    Compare a reduced-precision SIFAST result with a double-precision one.
+
+    Parameters
+    ----------
+    reference : SIFAST
+        Result processed in double precision
+    candidate : SIFAST
+        Same measurement processed in reduced precision
+    intensity_threshold : float
+        Phase errors are only evaluated where the spectral intensity exceeds
+        this fraction of the fiber's maximum
+
+    Returns
+    -------
+    dict
+        Error metrics (phases in mrad, times in fs, others relative)
+    """
+    if not (np.array_equal(reference.row, candidate.row) and np.array_equal(reference.col, candidate.col)):
+        raise ValueError("Pulses do not share the same fibers")
+
+    # Phase error where the spectrum is significant
+    Sw = reference.Sw_unknown_packed
+    significant = Sw > intensity_threshold * np.nanmax(Sw, axis=1, keepdims=True)
+    phase_error = reference.phase_packed - candidate.phase_packed.astype(np.float64)
+    phase_error = np.abs(wrap_phase(phase_error, out=phase_error))[significant & np.isfinite(phase_error)]
+
+    # Spectral intensity and field errors
+    Sw_error = np.abs(candidate.Sw_unknown_packed - Sw)
+    Et_reference = reference.Et_packed
+    Et_error = np.linalg.norm(candidate.Et_packed - Et_reference) / np.linalg.norm(Et_reference)
+
+    pulse_front_error = np.abs(candidate.pulse_front - reference.pulse_front)
+
+    return {
+        "phase_max_mrad": 1e3 * np.max(phase_error, initial=0),
+        "phase_rms_mrad": 1e3 * np.sqrt(np.mean(phase_error**2)) if phase_error.size else 0.0,
+        "pulse_front_max_fs": np.nanmax(pulse_front_error, initial=0),
+        "Sw_unknown_max_rel": np.nanmax(Sw_error) / np.nanmax(Sw),
+        "Et_rel_l2": float(Et_error),
+        "memory_ratio": _packed_nbytes(candidate) / _packed_nbytes(reference),
+    }
+
+
+def precision_report(dtype: str = "float32", intensity_threshold: float = 0.01, **sifast_kwargs) -> dict[str, Any]:
+    """
+    Process one measurement in double and reduced precision and compare them.
+
+    Parameters
+    ----------
+    dtype : str
+        Reduced precision to evaluate
+    intensity_threshold : float
+        Relative intensity threshold for phase errors
+    **sifast_kwargs
+        Arguments for :class:`SIFAST` (without ``dtype``); the runs are not
+        recorded in the processing history
+
+    Returns
+    -------
+    dict
+        Error metrics plus processing times of both runs
+    """
+    sifast_kwargs.pop("dtype", None)
+    sifast_kwargs["record_history"] = False
+    results = {}
+    times = {}
+    for precision in ["float64", dtype]:
+        start = time.perf_counter()
+        results[precision] = SIFAST(dtype=precision, **dict(sifast_kwargs))
+        times[precision] = time.perf_counter() - start
+
+    report = compare_precision(results["float64"], results[dtype], intensity_threshold)
+    report["time_float64_s"] = times["float64"]
+    report[f"time_{dtype}_s"] = times[dtype]
+    report["dtype"] = dtype
+
+    return report
+
+
+def format_precision_report(report: dict[str, Any]) -> str:
+    """Format a precision report as readable text."""
+    lines = [f"Precision report ({report.get('dtype', 'float32')} vs float64)"]
+    for key, value in report.items():
+        if key != "dtype":
+            lines.append(f"  {key:<22s} {value:.4g}")
+    return "\n".join(lines)
@@ -0,0 +1,369 @@
+"""Bulk reproduction of logged runs and comparison with their stored results."""
+
+import datetime
+import json
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..io.history import HISTORY_FILENAME, MARKDOWN_FILENAME, ProcessingHistory, SerializableEncoder
+from ..io.logging import reproduction_arguments
+from ..utils.math import wrap_phase
+from .sifast import SIFAST
+
+
+@dataclass
+class LoggedRun:
+    """One entry of a processing history."""
+
+    folder_path: Path
+    entry_id: int
+    status: str
+    timestamp: str | None
+    params: dict[str, Any]
+    results: dict[str, Any] | None = None
+
+
+@dataclass
+class ReproductionResult:
+    """Outcome of reproducing one logged run."""
+
+    folder_path: str
+    entry_id: int
+    stored_status: str
+    status: str  # 'match', 'changed', 'failed', 'fixed', 'reproduced' or 'failed_again'
+    duration: float = 0.0  # s
+    error: str | None = None
+    fibers_added: int = 0
+    fibers_removed: int = 0
+    max_delay_difference: float | None = None  # fs
+    max_phase_difference: float | None = None  # rad
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class ReproductionReport:
+    """Comparison of reproduced runs with their stored results."""
+
+    results: list[ReproductionResult] = field(default_factory=list)
+    delay_tolerance: float = 0.01
+    phase_tolerance: float = 1e-3
+    duration: float = 0.0  # s
+
+    def counts(self) -> dict[str, int]:
+        """Number of runs per status."""
+        counts: dict[str, int] = {}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+    @property
+    def differences(self) -> list[ReproductionResult]:
+        """Runs whose outputs or status differ from the stored ones."""
+        return [r for r in self.results if r.status in ("changed", "failed", "fixed")]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "delay_tolerance": self.delay_tolerance,
+            "phase_tolerance": self.phase_tolerance,
+            "duration": self.duration,
+            "counts": self.counts(),
+            "results": [r.to_dict() for r in self.results],
+        }
+
+    def save(self, filepath: str | Path) -> None:
+        """Save the report as JSON."""
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, cls=SerializableEncoder)
+
+    def format(self) -> str:
+        """Text report listing the runs that differ, then the counts per status."""
+        lines = []
+        for r in self.differences:
+            line = f"{r.status:<8} {r.folder_path} #{r.entry_id}"
+            if r.error is not None:
+                line += f": {r.error}"
+            else:
+                line += f": delay {_format_difference(r.max_delay_difference, 'fs')}"
+                line += f", phase {_format_difference(r.max_phase_difference, 'rad')}"
+                if r.fibers_added or r.fibers_removed:
+                    line += f", fibers +{r.fibers_added}/-{r.fibers_removed}"
+            lines.append(line)
+
+        counts = ", ".join(f"{n} {status}" for status, n in sorted(self.counts().items()))
+        lines.append(f"{len(self.results)} runs reproduced in {self.duration:.1f} s: {counts or 'none'}")
+        return "\n".join(lines)
+
+
+def _format_difference(value: float | None, unit: str) -> str:
+    """Format a maximum difference."""
+    return "n/a" if value is None else f"{value:.3g} {unit}"
+
+
+def _parse_time(value: str | datetime.datetime | None) -> datetime.datetime | None:
+    """Datetime from an ISO string."""
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.fromisoformat(value)
+
+
+def _matches(params: dict[str, Any], where: dict[str, Any] | Callable[[dict[str, Any]], bool] | None) -> bool:
+    """Check the parameters of an entry against a filter."""
+    if where is None:
+        return True
+    if callable(where):
+        return bool(where(params))
+    return all(params.get(key) == value for key, value in where.items())
+
+
+def find_logged_runs(
+    root: str | Path,
+    status: str | None = "SUCCESS",
+    since: str | datetime.datetime | None = None,
+    until: str | datetime.datetime | None = None,
+    where: dict[str, Any] | Callable[[dict[str, Any]], bool] | None = None,
+    deduplicate: bool = True,
+) -> list[LoggedRun]:
+    """
+    Find the logged runs in a tree of measurement folders.
+
+    Parameters
+    ----------
+    root : str or Path
+        Folder searched recursively for processing histories
+    status : str, optional
+        Only select entries with this status ('SUCCESS' or 'FAILURE')
+    since, until : str or datetime, optional
+        Only select entries logged in this time range (ISO strings or datetimes)
+    where : dict or callable, optional
+        Parameter values the entry must have, or a predicate on its parameters
+    deduplicate : bool
+        Keep only the latest entry of each distinct parameter set in a folder
+
+    Returns
+    -------
+    list[LoggedRun]
+        Selected runs, by folder then entry ID
+    """
+    since, until = _parse_time(since), _parse_time(until)
+
+    folders = set()
+    for directory, _, filenames in os.walk(root):
+        if HISTORY_FILENAME in filenames or MARKDOWN_FILENAME in filenames:
+            folders.add(Path(directory))
+
+    runs = []
+    for folder in sorted(folders):
+        selected: dict[str, LoggedRun] = {}
+        for entry in ProcessingHistory(folder).entries():
+            if status is not None and entry["status"] != status.upper():
+                continue
+            if since is not None or until is not None:
+                timestamp = _parse_time(entry["timestamp"])
+                if timestamp is None or (since and timestamp < since) or (until and timestamp > until):
+                    continue
+            if not _matches(entry["params"], where):
+                continue
+
+            run = LoggedRun(
+                folder,
+                entry["entry_id"],
+                entry["status"],
+                entry["timestamp"],
+                entry["params"],
+                entry.get("results"),
+            )
+            key = json.dumps(entry["params"], sort_keys=True) if deduplicate else str(entry["entry_id"])
+            selected.pop(key, None)
+            selected[key] = run
+        runs.extend(sorted(selected.values(), key=lambda r: r.entry_id))
+    return runs
+
+
+def compare_results(stored: dict[str, Any], reproduced: dict[str, Any]) -> dict[str, Any]:
+    """
+    Differences between two result summaries.
+
+    Parameters
+    ----------
+    stored, reproduced : dict
+        Result summaries, see ``SIFAST.result_summary``
+
+    Returns
+    -------
+    dict
+        Fibers added and removed, and the largest delay (fs) and wrapped phase
+        (rad) differences over the fibers present in both
+    """
+    stored_fibers = {(r, c): i for i, (r, c) in enumerate(zip(stored["row"], stored["col"]))}
+    new_fibers = {(r, c): i for i, (r, c) in enumerate(zip(reproduced["row"], reproduced["col"]))}
+    common = [fiber for fiber in new_fibers if fiber in stored_fibers]
+    i_stored = [stored_fibers[fiber] for fiber in common]
+    i_new = [new_fibers[fiber] for fiber in common]
+
+    differences: dict[str, Any] = {
+        "fibers_added": len(new_fibers) - len(common),
+        "fibers_removed": len(stored_fibers) - len(common),
+        "max_delay_difference": None,
+        "max_phase_difference": None,
+    }
+    if not common:
+        return differences
+
+    delay = np.asarray(reproduced["time_interval"], dtype=np.float64)[i_new]
+    delay_stored = np.asarray(stored["time_interval"], dtype=np.float64)[i_stored]
+    differences["max_delay_difference"] = float(np.nanmax(np.abs(delay - delay_stored), initial=0))
+
+    if stored["phase_indices"] == reproduced["phase_indices"]:
+        phase = np.asarray(reproduced["phase"], dtype=np.float64)[i_new]
+        phase_stored = np.asarray(stored["phase"], dtype=np.float64)[i_stored]
+        phase_difference = np.abs(wrap_phase(phase - phase_stored))
+        differences["max_phase_difference"] = float(np.nanmax(phase_difference, initial=0))
+    return differences
+
+
+def _reproduce_run(kwargs: dict[str, Any]) -> tuple[dict[str, Any] | None, str | None, float]:
+    """Reproduce one run (runs in a worker process) and return its result summary."""
+    start = time.perf_counter()
+    try:
+        pulse = SIFAST(record_history=False, **reproduction_arguments(kwargs))
+        return pulse.result_summary(), None, time.perf_counter() - start
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+def _classify(
+    run: LoggedRun,
+    summary: dict[str, Any] | None,
+    error: str | None,
+    duration: float,
+    delay_tolerance: float,
+    phase_tolerance: float,
+) -> ReproductionResult:
+    """Compare a reproduction with the stored run."""
+    result = ReproductionResult(str(run.folder_path), run.entry_id, run.status, "reproduced", duration, error)
+    if summary is None:
+        result.status = "failed_again" if run.status == "FAILURE" else "failed"
+        return result
+    if run.status == "FAILURE":
+        result.status = "fixed"
+        return result
+    if run.results is None:
+        return result
+
+    differences = compare_results(run.results, summary)
+    for key, value in differences.items():
+        setattr(result, key, value)
+
+    within = (
+        not result.fibers_added
+        and not result.fibers_removed
+        and (result.max_delay_difference or 0) <= delay_tolerance
+        and (result.max_phase_difference or 0) <= phase_tolerance
+    )
+    result.status = "match" if within else "changed"
+    return result
+
+
+def reproduce_logged_runs(
+    runs: list[LoggedRun] | str | Path,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+    delay_tolerance: float = 0.01,
+    phase_tolerance: float = 1e-3,
+    progress_callback: Callable[[int], None] | None = None,
+    status_callback: Callable[[str, str], None] | None = None,
+) -> ReproductionReport:
+    """
+    Re-run logged runs in parallel and compare them with their stored results.
+
+    Reference pulses are built once per distinct set of parameters, in the
+    calling process, and shared by all runs that use them. Reproductions are
+    not appended to the processing histories.
+
+    Parameters
+    ----------
+    runs : list[LoggedRun], str or Path
+        Runs to reproduce, or a folder whose successful runs are reproduced
+        (see ``find_logged_runs``)
+    max_workers : int, optional
+        Number of worker processes (defaults to the CPU count)
+    executor : Executor, optional
+        Executor to use instead of a new process pool
+    delay_tolerance : float
+        Largest delay difference (fs) of a matching run
+    phase_tolerance : float
+        Largest wrapped phase difference (rad) of a matching run
+    progress_callback : callable, optional
+        Called with the progress in percent (0-100)
+    status_callback : callable, optional
+        Called with a status message and a level ('INFO', 'WARNING', ...)
+
+    Returns
+    -------
+    ReproductionReport
+        One result per run, in the order of ``runs``
+    """
+    if not isinstance(runs, list):
+        runs = find_logged_runs(runs)
+    start = time.perf_counter()
+
+    def report_status(message: str, level: str = "INFO") -> None:
+        if status_callback is not None:
+            status_callback(message, level)
+
+    report_status(f"Reproducing {len(runs)} logged runs...")
+
+    # Reference pulses are built here once and sent to the workers
+    reference_cache: dict[str, Any] = {}
+    jobs: dict[int, dict[str, Any]] = {}
+    results: dict[int, ReproductionResult] = {}
+    for order, run in enumerate(runs):
+        kwargs = dict(run.params)
+        reference = kwargs.get("reference_pulse")
+        if isinstance(reference, dict):
+            try:
+                arguments = reproduction_arguments({"reference_pulse": reference}, reference_cache)
+                kwargs["reference_pulse"] = arguments["reference_pulse"]
+            except Exception as e:
+                results[order] = _classify(run, None, f"Reference pulse: {type(e).__name__}: {e}", 0.0, 0, 0)
+                continue
+        jobs[order] = kwargs
+
+    own_executor = executor is None
+    if own_executor and jobs:
+        executor = ProcessPoolExecutor(max_workers=max_workers or min(len(jobs), os.cpu_count() or 1))
+
+    try:
+        futures = {executor.submit(_reproduce_run, kwargs): order for order, kwargs in jobs.items()}
+        for n_done, future in enumerate(as_completed(futures), 1):
+            order = futures[future]
+            run = runs[order]
+            summary, error, duration = future.result()
+            results[order] = _classify(run, summary, error, duration, delay_tolerance, phase_tolerance)
+            if results[order].status in ("changed", "failed"):
+                report_status(f"{run.folder_path} #{run.entry_id}: {results[order].status}", "WARNING")
+            if progress_callback is not None:
+                progress_callback(int(100 * n_done / len(futures)))
+    finally:
+        if own_executor and jobs:
+            executor.shutdown(cancel_futures=True)
+
+    report = ReproductionReport(
+        [results[order] for order in range(len(runs))],
+        delay_tolerance,
+        phase_tolerance,
+        time.perf_counter() - start,
+    )
+    report_status(f"Reproduced {len(runs)} runs: {report.counts()}", "SUCCESS")
+    return report
@@ -0,0 +1,229 @@
+"""End-to-end processing of spatial scan folders."""
+
+import json
+import os
+import re
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..config.settings import ProcessingConfig
+from ..fiber.registry import get_fiber_array, get_fiber_array_config, register_fiber_array
+from ..io.history import ProcessingHistory
+from .sifast import SIFAST
+from .spatial_scan import SpatialScanner
+from .srsi import SRSI
+
+SCAN_POSITIONS_FILE = "scan_positions.json"
+
+
+@dataclass
+class ScanPosition:
+    """One measurement position of a spatial scan."""
+
+    index: int
+    folder_path: Path
+    dx: float
+    dy: float
+
+
+def _natural_key(path: Path) -> list[Any]:
+    """Sort key that orders '2' before '10'."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", path.name)]
+
+
+def _has_measurement_data(folder: Path) -> bool:
+    """Check whether a folder contains SIFAST interference data."""
+    return any(any(folder.glob(f"*inter*.{ext}")) for ext in ("h5", "hdf5", "csv"))
+
+
+def _logged_offsets(folder: Path, positions_file: Path) -> tuple[float, float]:
+    """Offsets shared by all successful runs of a folder."""
+    logged = {
+        (float(entry["params"]["dx"]), float(entry["params"]["dy"]))
+        for entry in ProcessingHistory(folder).entries()
+        if entry["status"] == "SUCCESS" and "dx" in entry["params"] and "dy" in entry["params"]
+    }
+    if not logged:
+        raise ValueError(f"Could not determine dx/dy for {folder}; add it to {positions_file.name}")
+    if len(logged) > 1:
+        found = ", ".join(f"({dx:g}, {dy:g})" for dx, dy in sorted(logged))
+        raise ValueError(f"Successful runs of {folder} used different offsets {found}; add it to {positions_file.name}")
+    return logged.pop()
+
+
+def discover_scan_positions(scan_folder: str | Path) -> list[ScanPosition]:
+    """
+    Find the position subfolders of a scan and their offsets.
+
+    Offsets are read from ``scan_positions.json`` in the scan folder if present,
+    mapping subfolder names to ``{"dx": ..., "dy": ...}`` or ``[dx, dy]``.
+    Otherwise they are taken from the successful entries of each subfolder's
+    processing history, which must all agree: a later run of the folder with
+    other offsets (e.g. a single measurement run with the default 0, 0) makes
+    them ambiguous, and the folder has to be listed in ``scan_positions.json``.
+
+    Parameters
+    ----------
+    scan_folder : str or Path
+        Folder containing one subfolder per scan position
+
+    Returns
+    -------
+    list[ScanPosition]
+        Scan positions in natural folder order
+    """
+    scan_folder = Path(scan_folder)
+    if not scan_folder.is_dir():
+        raise FileNotFoundError(f"Scan folder does not exist: {scan_folder}")
+
+    folders = sorted((f for f in scan_folder.iterdir() if f.is_dir() and _has_measurement_data(f)), key=_natural_key)
+    if not folders:
+        raise FileNotFoundError(f"No measurement folders found in {scan_folder}")
+
+    positions_file = scan_folder / SCAN_POSITIONS_FILE
+    offsets = {}
+    if positions_file.exists():
+        with open(positions_file) as f:
+            offsets = json.load(f)
+
+    positions = []
+    for index, folder in enumerate(folders):
+        if folder.name in offsets:
+            offset = offsets[folder.name]
+            dx, dy = (offset["dx"], offset["dy"]) if isinstance(offset, dict) else offset
+        else:
+            dx, dy = _logged_offsets(folder, positions_file)
+        positions.append(ScanPosition(index, folder, float(dx), float(dy)))
+
+    return positions
+
+
+def _process_position(kwargs: dict[str, Any], fiber_array_config: dict[str, Any]) -> SIFAST:
+    """Process one scan position (runs in a worker process)."""
+    # Worker processes do not share the parent's fiber array registry
+    register_fiber_array(kwargs["fiber_array_id"], fiber_array_config, auto_save=False)
+    return SIFAST(**kwargs)
+
+
+def process_scan(
+    scan_folder: str | Path,
+    config: ProcessingConfig | None = None,
+    reference_pulse: SRSI | None = None,
+    config_folder_path: str | Path | None = None,
+    positions: list[ScanPosition] | None = None,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+    calibration_index: tuple[int, int] | None = None,
+    calibration_point: tuple[float, float] | None = None,
+    unwrap_before_merge: bool = False,
+    n_neighbors: int = 3,
+    progress_callback: Callable[[int], None] | None = None,
+    status_callback: Callable[[str, str], None] | None = None,
+) -> SIFAST:
+    """
+    Process all positions of a spatial scan in parallel and merge them.
+
+    Positions are processed in a pool of workers. Finished pulses are streamed
+    into the merger in scan order, so merging overlaps with processing.
+
+    Parameters
+    ----------
+    scan_folder : str or Path
+        Folder containing one subfolder per scan position
+    config : ProcessingConfig, optional
+        Processing parameters; ``dx``/``dy`` are taken from each position
+    reference_pulse : SRSI, optional
+        Reference pulse for phase compensation
+    config_folder_path : str or Path, optional
+        External configuration folder
+    positions : list[ScanPosition], optional
+        Scan positions, discovered from ``scan_folder`` if not given
+    max_workers : int, optional
+        Number of worker processes (defaults to one per position, capped at CPU count)
+    executor : Executor, optional
+        Executor to use instead of a new process pool
+    calibration_index : Tuple[int, int], optional
+        (row, col) index for phase calibration
+    calibration_point : Tuple[float, float], optional
+        (x, y) spatial position for phase calibration
+    unwrap_before_merge : bool
+        Whether to apply 2D phase unwrapping before merging
+    n_neighbors : int
+        Number of nearest neighbors for phase interpolation
+    progress_callback : callable, optional
+        Called with the progress in percent (0-100)
+    status_callback : callable, optional
+        Called with a status message and a level ('INFO', 'SUCCESS', ...)
+
+    Returns
+    -------
+    SIFAST
+        Merged SIFAST instance (or the single pulse for a one-position scan)
+    """
+    config = config or ProcessingConfig()
+    positions = positions if positions is not None else discover_scan_positions(scan_folder)
+    n_positions = len(positions)
+
+    def report_progress(n_done: int) -> None:
+        if progress_callback is not None:
+            progress_callback(int(100 * n_done / (n_positions + 1)))
+
+    def report_status(message: str, level: str = "INFO") -> None:
+        if status_callback is not None:
+            status_callback(message, level)
+
+    # Common processing arguments
+    base_kwargs = config.to_dict()
+    base_kwargs.update(mode_input="read", reference_pulse=reference_pulse, config_folder_path=config_folder_path)
+    fiber_array_config = get_fiber_array_config(config.fiber_array_id)
+
+    # The merged grid is known before any position is processed
+    scanner = SpatialScanner(unwrap_before_merge=unwrap_before_merge, n_neighbors=n_neighbors)
+    if n_positions > 1:
+        fiber_arrays = [get_fiber_array(config.fiber_array_id, p.dx, p.dy) for p in positions]
+        all_x = [x for fiber_array in fiber_arrays for x in fiber_array.x_axis]
+        all_y = [y for fiber_array in fiber_arrays for y in fiber_array.y_axis]
+        scanner.begin(all_x, all_y, config.n_omega)
+
+    report_status(f"Processing {n_positions} scan positions...")
+    report_progress(0)
+
+    own_executor = executor is None
+    if own_executor:
+        max_workers = max_workers or min(n_positions, os.cpu_count() or 1)
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    pulses = {}
+    next_to_merge = 0
+    try:
+        futures = {}
+        for order, position in enumerate(positions):
+            kwargs = dict(base_kwargs, folder_path=str(position.folder_path), dx=position.dx, dy=position.dy)
+            futures[executor.submit(_process_position, kwargs, fiber_array_config)] = order
+
+        for n_done, future in enumerate(as_completed(futures), 1):
+            order = futures[future]
+            position = positions[order]
+            try:
+                pulses[order] = future.result()
+            except Exception as e:
+                raise RuntimeError(f"Processing failed for {position.folder_path}: {e}") from e
+            report_status(f"Processed position {position.index} ({position.folder_path.name})")
+            report_progress(n_done)
+
+            # Merge in scan order as soon as the next position is available
+            while n_positions > 1 and next_to_merge in pulses:
+                scanner.add(pulses.pop(next_to_merge), calibration_index, calibration_point)
+                next_to_merge += 1
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+    merged = scanner.finish() if n_positions > 1 else pulses[0]
+    report_progress(n_positions + 1)
+    report_status("Scan processing completed", "SUCCESS")
+
+    return merged
@@ -1,24 +1,76 @@
 """Spatially resolved Interferometric Field Autocorrelation Scan Technique (SIFAST)."""
 
 import json
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import numpy.typing as npt
-from scipy.optimize import curve_fit
 
+from ..core.packed import FiberField, to_dense
 from ..core.pulse import PulseBase
 from ..fiber.registry import get_fiber_array, get_fiber_array_config
 from ..io.logging import update_processing_log
 from ..io.readers import SpectrumReader
 from ..io.writers import DataWriter
-from ..visualization.plotting import SIFASTVisualizer
+from ..utils.math import wrap_phase
+from ..utils.profiling import StageProfiler, StageTiming
+from .calibration import fit_reference_sphere, reference_geometry
 from .srsi import SRSI
+from .stages import Stage, StageGraph, same_value
 
 
 class SIFAST(PulseBase):
-    """SIFAST pulse characterization processor."""
+    """
+    SIFAST pulse characterization processor.
+
+    Spectra and phases are stored per fiber as ``<name>_packed`` arrays of shape
+    (n_fibers, n_omega), indexed by ``row``/``col``. The ``(ny, nx, n_omega)``
+    attributes are dense views built on demand.
+    """
+
+    # Data arguments passed as keyword arguments
+    INPUT_KEYS = ("folder_path", "wavelength", "image_interference", "image_unknown", "image_reference")
+
+    # Processing stages in order, the parameters each one reads and the stages whose outputs it
+    # reads. Changing a parameter reruns its stage and the stages downstream of it, see ``update``.
+    STAGES = (
+        Stage("input", ("mode_input", "mode_acquire", "config_folder_path", *INPUT_KEYS), cache_size=1),
+        Stage("fiber_array", ("fiber_array_id", "dx", "dy")),
+        Stage(
+            "fiber_positions",
+            ("gate_noise_intensity", "mode_fiber_position", "mode_acquire"),
+            ("input", "fiber_array"),
+        ),
+        Stage(
+            "resampling",
+            ("wavelength_center", "wavelength_width", "n_omega", "method", "mode_acquire", "dtype"),
+            ("input", "fiber_positions"),
+        ),
+        # The time-domain signals are large (n_fibers, n_fft), so only the current ones are kept
+        Stage("time_signal", ("n_omega", "n_fft", "time_resolution"), ("resampling",), cache_size=1),
+        Stage(
+            "ftsi",
+            ("n_omega", "n_fft", "delay_min", "mode_acquire"),
+            ("fiber_array", "fiber_positions", "resampling", "time_signal"),
+        ),
+        Stage("reference_parameters", ("as_calibration",), ("input", "fiber_array", "ftsi")),
+        Stage(
+            "pulse_front",
+            ("wavelength_center", "fiber_array_id", "dx", "dy"),
+            ("fiber_array", "resampling", "ftsi", "reference_parameters"),
+        ),
+        Stage("compensation", ("reference_pulse", "method", "dtype"), ("resampling", "pulse_front")),
+    )
+
+    Sw_interference = FiberField(fill_value=0)
+    Sw_unknown = FiberField(fill_value=0)
+    Sw_reference = FiberField(fill_value=0)
+    phase_diff_with_sphere = FiberField()
+    phase_diff = FiberField()
+    phase = FiberField()
 
     def __init__(
         self,
@@ -28,7 +80,7 @@ class SIFAST(PulseBase):
         wavelength_center: float,
         wavelength_width: float,
         n_omega: int,
-        n_fft: int,
+        n_fft: int | str,
         mode_fiber_position: str = "calibration",
         method: str = "linear",
         fiber_array_id: str = "default_14x14",
@@ -38,6 +90,10 @@ class SIFAST(PulseBase):
         as_calibration: bool = False,
         config_folder_path: str | Path | None = None,
         delay_min: float | None = None,
+        dtype: str = "float64",
+        time_resolution: float = 2.0,
+        profile: bool = False,
+        record_history: bool = True,
         **kwargs,
     ):
         """
@@ -57,8 +113,9 @@ class SIFAST(PulseBase):
             Wavelength range (nm)
         n_omega : int
             Number of frequency points
-        n_fft : int
-            FFT size
+        n_fft : int or str
+            FFT size, or 'auto' for the smallest size meeting ``time_resolution``
+            with sub-sample delay interpolation
         mode_fiber_position : str
             Fiber position mode ('calibration' or 'calculation')
         method_interpolation : str
@@ -75,6 +132,15 @@ class SIFAST(PulseBase):
             Configuration folder path
         delay_min : float, optional
             Minimum delay for peak detection
+        dtype : str
+            Working precision of the spectra, phases and fields ('float64' or 'float32')
+        time_resolution : float
+            Largest time step (fs) when ``n_fft`` is 'auto'
+        profile : bool
+            Record the wall time, CPU time, peak memory and array sizes of
+            each stage in ``timings`` (memory tracing slows processing down)
+        record_history : bool
+            Append the run to the processing history of the folder (read mode)
         **kwargs
             Additional arguments for data input
         """
@@ -82,49 +148,25 @@ class SIFAST(PulseBase):
 
         # Store all parameters
         self.params = self._collect_parameters(locals())
-        try:
-            fiber_array_config = get_fiber_array_config(fiber_array_id)
-            self.params["fiber_array_config"] = fiber_array_config
-        except:  # noqa: E722
-            # If we can't get the config, at least keep the ID
-            self.params["fiber_array_config"] = {"id": fiber_array_id}
+        self.params.pop("record_history")
+        self.params["fiber_array_config"] = self._fiber_array_config(fiber_array_id)
+
+        self._profiler = StageProfiler() if profile else None
+        self.timings: list[StageTiming] | None = self._profiler.timings if profile else None
 
         try:
-            self._validate_inputs(mode_input, mode_acquire, mode_fiber_position, method)
-
-            # Initialize core parameters
-            self.omega_center = 2 * np.pi * self.SPEED_OF_LIGHT / wavelength_center
-            self.n_omega = n_omega
-            self.n_fft = n_fft
-
-            # Initialize fiber array
-            fiber_array = get_fiber_array(fiber_array_id, dx, dy)
-            self._apply_fiber_array_properties(fiber_array)
-
-            # Process based on input mode
-            if mode_input == "read":
-                self._process_read_mode(kwargs, mode_acquire, config_folder_path)
-            else:  # acquire
-                self._process_acquire_mode(kwargs, mode_acquire, config_folder_path)
-
-            # Common processing steps
-            self._process_fiber_positions(
-                gate_noise_intensity, mode_fiber_position, mode_acquire, self.final_config_path
-            )
-            self._resample_and_process_spectra(wavelength_center, wavelength_width, method, mode_acquire)
-            self._perform_interferometry(
-                n_omega,
-                n_fft,
-                delay_min,
-                mode_acquire,
-                as_calibration,
-                reference_pulse,
-                method,
-                wavelength_center,
-            )
+            unexpected = kwargs.keys() - set(self.INPUT_KEYS)
+            if unexpected:
+                raise ValueError(f"Unexpected keyword arguments: {', '.join(unexpected)}")
+            self._validate_inputs(mode_input, mode_acquire, mode_fiber_position, method, dtype, n_fft)
+            self.dtype = np.dtype(dtype)
+
+            # Stage outputs are cached for ``update``, the bookkeeping attributes are not outputs
+            self._stage_graph = StageGraph(self.STAGES, untracked={"params", "timings", "_profiler", "_stage_graph"})
+            self._run_stages()
 
             # Log success for read mode
-            if mode_input == "read" and hasattr(self, "_folder_path"):
+            if record_history and mode_input == "read" and hasattr(self, "_folder_path"):
                 if hasattr(self, "_copy_config_after_processing") and self._copy_config_after_processing:
                     import shutil
 
@@ -136,13 +178,68 @@ class SIFAST(PulseBase):
                     "SUCCESS",
                     self.params,
                     f"Data processed using config from '{self.final_config_path}'",
+                    self.timings,
+                    self.result_summary(),
                 )
 
         except Exception as e:
-            if mode_input == "read" and hasattr(self, "_folder_path"):
-                update_processing_log(self._folder_path, "FAILURE", self.params, str(e))
+            if record_history and mode_input == "read" and hasattr(self, "_folder_path"):
+                update_processing_log(self._folder_path, "FAILURE", self.params, str(e), self.timings)
             raise
 
+    def result_summary(self, n_samples: int = 8) -> dict[str, Any]:
+        """
+        Compact record of the outputs, stored in the processing history.
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of frequencies at which the phase of each fiber is recorded,
+            spread over the central half of the frequency axis
+
+        Returns
+        -------
+        dict
+            Fiber indices, delay of each fiber (fs) and sampled phases (rad)
+        """
+        samples = np.linspace(self.n_omega // 4, 3 * self.n_omega // 4, n_samples).astype(int)
+        return {
+            "row": self.row.tolist(),
+            "col": self.col.tolist(),
+            "time_interval": np.round(self.time_interval[self.row, self.col], 4).tolist(),
+            "phase_indices": samples.tolist(),
+            "phase": np.round(self.phase_packed[:, samples].astype(np.float64), 5).tolist(),
+        }
+
+    def _stage(self, name: str) -> AbstractContextManager:
+        """Profile a processing stage when profiling is enabled."""
+        profiler = getattr(self, "_profiler", None)
+        return nullcontext() if profiler is None else profiler.stage(name, self)
+
+    def __copy__(self) -> "SIFAST":
+        """Shallow copy that can be updated without changing this pulse."""
+        pulse = type(self).__new__(type(self))
+        pulse.__dict__.update(self.__dict__)
+        if getattr(self, "_stage_graph", None) is not None:
+            pulse._stage_graph = self._stage_graph.copy()
+        return pulse
+
+    def __getstate__(self) -> dict[str, Any]:
+        """State without the stage caches and time-domain signals, e.g. for results of worker processes."""
+        state = self.__dict__.copy()
+        state.pop("_St_packed", None)
+        state["_stage_graph"] = None  # unpickled pulses cannot be updated
+        return state
+
+    @staticmethod
+    def _fiber_array_config(fiber_array_id: str) -> dict[str, Any]:
+        """Configuration of a fiber array, stored with the parameters."""
+        try:
+            return get_fiber_array_config(fiber_array_id)
+        except:  # noqa: E722
+            # If we can't get the config, at least keep the ID
+            return {"id": fiber_array_id}
+
     def _collect_parameters(self, local_vars: dict[str, Any]) -> dict[str, Any]:
         """Collect and clean parameters."""
         params = local_vars.copy()
@@ -154,7 +251,13 @@ class SIFAST(PulseBase):
         return params
 
     def _validate_inputs(
-        self, mode_input: str, mode_acquire: str, mode_fiber_position: str, method_interpolation: str
+        self,
+        mode_input: str,
+        mode_acquire: str,
+        mode_fiber_position: str,
+        method_interpolation: str,
+        dtype: str = "float64",
+        n_fft: int | str = 65536,
     ) -> None:
         """Validate input parameters."""
         if mode_input not in ["read", "acquire"]:
@@ -165,6 +268,10 @@ class SIFAST(PulseBase):
             raise ValueError("mode_fiber_position must be 'calibration' or 'calculation'")
         if method_interpolation not in ["linear", "slinear", "quadratic", "cubic"]:
             raise ValueError(f"Invalid interpolation method: {method_interpolation}")
+        if dtype not in ["float64", "float32"]:
+            raise ValueError("dtype must be 'float64' or 'float32'")
+        if n_fft != "auto" and not isinstance(n_fft, int | np.integer):
+            raise ValueError("n_fft must be an integer or 'auto'")
 
     def _apply_fiber_array_properties(self, fiber_array) -> None:
         """Apply fiber array properties to instance."""
@@ -312,142 +419,242 @@ class SIFAST(PulseBase):
     def _resample_and_process_spectra(
         self, wavelength_center: float, wavelength_width: float, method: str, mode_acquire: str
     ) -> None:
-        """Resample spectra to common grid."""
+        """Resample spectra of the detected fibers to a common grid."""
         n_fibers = len(self.row)
 
-        # Initialize arrays
-        Sw_interference = np.zeros((self.number_y, self.number_x, self.n_omega))
+        # Initialize per-fiber arrays
+        Sw_interference = np.zeros((n_fibers, self.n_omega), dtype=self.dtype)
         if mode_acquire in ["double", "triple"]:
-            Sw_unknown = np.zeros((self.number_y, self.number_x, self.n_omega))
+            Sw_unknown = np.zeros((n_fibers, self.n_omega), dtype=self.dtype)
         if mode_acquire == "triple":
-            Sw_reference = np.zeros((self.number_y, self.number_x, self.n_omega))
+            Sw_reference = np.zeros((n_fibers, self.n_omega), dtype=self.dtype)
 
         # Resample each fiber's spectrum
         for i in range(n_fibers):
-            r, c = self.row[i], self.col[i]
             pixel = self.pixel_of_signal[i]
 
-            Sw_interference[r, c, :] = self.resample_spectrum(
+            Sw_interference[i, :] = self.resample_spectrum(
                 self.image_interference[pixel, :], wavelength_center, self.n_omega, wavelength_width, method
             )
 
             if mode_acquire in ["double", "triple"]:
-                Sw_unknown[r, c, :] = self.resample_spectrum(
+                Sw_unknown[i, :] = self.resample_spectrum(
                     self.image_unknown[pixel, :], wavelength_center, self.n_omega, wavelength_width, method
                 )
 
             if mode_acquire == "triple":
-                Sw_reference[r, c, :] = self.resample_spectrum(
+                Sw_reference[i, :] = self.resample_spectrum(
                     self.image_reference[pixel, :], wavelength_center, self.n_omega, wavelength_width, method
                 )
 
-        self.Sw_interference = Sw_interference
+        self.Sw_interference_packed = Sw_interference
         if mode_acquire in ["double", "triple"]:
-            self.Sw_unknown = Sw_unknown
+            self.Sw_unknown_packed = Sw_unknown
         if mode_acquire == "triple":
-            self.Sw_reference = Sw_reference
+            self.Sw_reference_packed = Sw_reference
+
+    def _run_stages(self, check: Callable[[], None] | None = None) -> list[str]:
+        """Bring the stage outputs up to date with the stored parameters."""
 
-    def _perform_interferometry(
+        def execute(stage: Stage, params: dict[str, Any]) -> None:
+            with self._stage(stage.name):
+                getattr(self, f"_stage_{stage.name}")(**params)
+
+        return self._stage_graph.run(self, self.params, execute, check)
+
+    def _stage_input(
         self,
-        n_omega: int,
-        n_fft: int,
-        delay_min: float | None,
+        mode_input: str,
         mode_acquire: str,
-        as_calibration: bool,
-        reference_pulse: SRSI | None,
-        method: str,
+        config_folder_path: str | Path | None,
+        **data: Any,
+    ) -> None:
+        """Read or take the raw spectra."""
+        kwargs = {k: v for k, v in data.items() if v is not None}
+        if mode_input == "read":
+            self._process_read_mode(kwargs, mode_acquire, config_folder_path)
+        else:  # acquire
+            self._process_acquire_mode(kwargs, mode_acquire, config_folder_path)
+
+    def _stage_fiber_array(self, fiber_array_id: str, dx: float, dy: float) -> None:
+        """Set up the fiber array geometry."""
+        self._apply_fiber_array_properties(get_fiber_array(fiber_array_id, dx, dy))
+
+    def _stage_fiber_positions(self, gate_noise_intensity: float, mode_fiber_position: str, mode_acquire: str) -> None:
+        """Detect the fibers carrying signal."""
+        self._process_fiber_positions(gate_noise_intensity, mode_fiber_position, mode_acquire, self.final_config_path)
+
+    def _stage_resampling(
+        self,
         wavelength_center: float,
+        wavelength_width: float,
+        n_omega: int,
+        method: str,
+        mode_acquire: str,
+        dtype: str,
     ) -> None:
-        """Perform spectral interferometry analysis."""
-        # FTSI
-        self.phase_diff_with_sphere, self.time_interval, Su = self.fourier_transform_spectral_interferometry(
-            n_omega, n_fft, delay_min
+        """Resample the spectra of the detected fibers."""
+        self.omega_center = 2 * np.pi * self.SPEED_OF_LIGHT / wavelength_center
+        self.n_omega = n_omega
+        self._resample_and_process_spectra(wavelength_center, wavelength_width, method, mode_acquire)
+
+    def _stage_time_signal(self, n_omega: int, n_fft: int | str, time_resolution: float) -> None:
+        """Transform the packed interference spectra to the time domain."""
+        # In auto mode the coarser time axis is compensated by interpolating the delay peaks
+        interpolate_peak = n_fft == "auto"
+        self.n_fft = self.auto_n_fft(time_resolution) if interpolate_peak else n_fft
+        self._St_packed = self.time_domain_signal(n_omega, self.n_fft, self.Sw_interference_packed, interpolate_peak)
+
+    def _stage_ftsi(self, n_omega: int, n_fft: int | str, delay_min: float | None, mode_acquire: str) -> None:
+        """Delays and phases of the fibers from their time-domain signals."""
+        self.phase_diff_with_sphere_packed, delay, Su = self.extract_phase(
+            self._St_packed, n_omega, self.n_fft, delay_min, interpolate_peak=n_fft == "auto"
         )
+        self.time_interval = to_dense(delay, self.row, self.col, self.shape)
 
         if mode_acquire == "single":
-            self.Sw_unknown = Su
+            self.Sw_unknown_packed = Su
 
-        # Get reference parameters
+    def _stage_reference_parameters(self, as_calibration: bool) -> None:
+        """Fit or load the reference sphere parameters."""
         if as_calibration:
             self.rp = self._fit_reference_parameters()
         else:
+            self.reference_fit = None
             rp_path = self.final_config_path / "reference_parameters.json"
             with open(rp_path) as f:
                 self.rp = json.load(f)
 
-        # Calculate pulse fronts
+    def _stage_pulse_front(self, wavelength_center: float, fiber_array_id: str, dx: float, dy: float) -> None:
+        """Calculate the pulse fronts."""
         self._calculate_pulse_fronts(wavelength_center)
 
-        # Apply reference pulse compensation if provided
+    def _stage_compensation(self, reference_pulse: SRSI | None, method: str, dtype: str) -> None:
+        """Apply reference pulse compensation if provided."""
         if reference_pulse is not None:
             if not isinstance(reference_pulse, SRSI):
                 raise TypeError("reference_pulse must be an instance of SRSI")
             self.compensate_phase(reference_pulse, method)
         else:
-            self.phase = self.phase_diff.copy()
+            self.phase_packed = self.phase_diff_packed.copy()
 
-    def _calculate_pulse_fronts(self, wavelength_center: float) -> None:
-        """Calculate pulse front timing."""
-        # Reference pulse front
-        distance = np.sqrt(
-            (self.x_matrix - self.rp["x0"]) ** 2 + (self.y_matrix - self.rp["y0"]) ** 2 + self.rp["L"] ** 2
-        )
-        self.pulse_front_reference = (distance - self.rp["L"]) / (self.SPEED_OF_LIGHT * 1e-6) + self.rp["tau0"]
-
-        # Unknown pulse front
-        self.pulse_front = self.pulse_front_reference - self.time_interval
+    @property
+    def updatable(self) -> bool:
+        """Whether ``update`` can reprocess the pulse, i.e. its processing stages were kept."""
+        return getattr(self, "_stage_graph", None) is not None
 
-        # Phase difference
-        omega_broadcast = self.omega_axis.reshape(1, 1, -1)
-        phase_diff = self.phase_diff_with_sphere + self.pulse_front[:, :, np.newaxis] * omega_broadcast
+    def update(self, check: Callable[[], None] | None = None, **changes) -> list[str]:
+        """
+        Reprocess with changed parameters, rerunning only the affected stages.
 
-        # Spherical phase correction
-        phase_sph = 2 * np.pi * distance / wavelength_center * 1e6
-        self.phase_diff = np.angle(np.exp(1j * (phase_diff - phase_sph[:, :, np.newaxis])))
+        The stages reading a changed parameter and the stages downstream of
+        them are rerun on the stored data, see ``STAGES``. Each stage keeps
+        its outputs for a few earlier inputs, so setting a parameter back
+        restores them instead of recomputing. Updates are not recorded in the
+        processing history.
 
-    def _fit_reference_parameters(self) -> dict[str, float]:
-        """Fit reference sphere parameters."""
+        Parameters
+        ----------
+        check : callable, optional
+            Called before each rerun stage, raises to abandon the update. The
+            pulse is then left partially updated.
+        **changes
+            Changed SIFAST parameters
+
+        Returns
+        -------
+        list[str]
+            Rerun stages, not counting those restored from the cache
+        """
+        if not self.updatable:
+            raise ValueError("Pulse cannot be updated, its processing stages were not kept")
+        unknown = changes.keys() - {k for stage in self.STAGES for k in stage.params} - {"profile"}
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(unknown)}")
+
+        changes = {k: v for k, v in changes.items() if not same_value(self.params.get(k), v)}
+        if not changes:
+            return []
+
+        params = {**self.params, **changes}
+        self._validate_inputs(
+            params["mode_input"],
+            params["mode_acquire"],
+            params["mode_fiber_position"],
+            params["method"],
+            params["dtype"],
+            params["n_fft"],
+        )
+        if "fiber_array_id" in changes:
+            params["fiber_array_config"] = self._fiber_array_config(params["fiber_array_id"])
+        self.params = params
+        self.dtype = np.dtype(params["dtype"])
+        if params["profile"]:
+            self._profiler = StageProfiler()
+            self.timings = self._profiler.timings
+        else:
+            self._profiler = self.timings = None
 
-        def sphere_equation(M, x0, y0, L, tau0):
-            x, y = M
-            return (np.sqrt((x - x0) ** 2 + (y - y0) ** 2 + L**2) - L) / (self.SPEED_OF_LIGHT * 1e-6) + tau0
+        return self._run_stages(check)
 
-        # Initial guess
-        p0 = (0, 0, 1000, np.nanmin(self.time_interval))
+    def _calculate_pulse_fronts(self, wavelength_center: float) -> None:
+        """Calculate pulse front timing."""
+        geometry = reference_geometry(
+            self.params["fiber_array_id"], self.params["dx"], self.params["dy"], self.rp, wavelength_center
+        )
 
-        # Flatten data for fitting
-        x_flat = self.x_matrix.ravel()
-        y_flat = self.y_matrix.ravel()
-        time_flat = self.time_interval.ravel()
+        # Reference and unknown pulse fronts
+        self.pulse_front_reference = geometry.pulse_front_reference.copy()
+        self.pulse_front = self.pulse_front_reference - self.time_interval
 
-        # Fit
-        popt, _ = curve_fit(sphere_equation, (x_flat, y_flat), time_flat, p0=p0, nan_policy="omit")
+        # Phase difference with the pulse front and spherical phase, built and wrapped in place
+        phase_diff = np.empty_like(self.phase_diff_with_sphere_packed)
+        np.multiply(self.pulse_front[self.row, self.col][:, np.newaxis], self.omega_axis, out=phase_diff)
+        phase_diff += self.phase_diff_with_sphere_packed
+        phase_diff -= geometry.spherical_phase[self.row, self.col][:, np.newaxis]
+        self.phase_diff_packed = wrap_phase(phase_diff, out=phase_diff)
 
-        return {"x0": popt[0], "y0": popt[1], "L": popt[2], "tau0": popt[3]}
+    def _fit_reference_parameters(self) -> dict[str, float]:
+        """Fit reference sphere parameters, raising if the fit did not converge."""
+        fit = self.reference_fit = fit_reference_sphere(
+            self.x_matrix[self.row, self.col], self.y_matrix[self.row, self.col], self.time_interval[self.row, self.col]
+        )
+        # The last iterate of a failed fit is no calibration; it stays in reference_fit for inspection
+        if not fit.converged:
+            raise ValueError(
+                f"Reference sphere fit did not converge after {fit.n_iterations} iterations "
+                f"(residual RMS {fit.residual_rms:.1f} fs)"
+            )
+        if fit.at_bound:
+            print(
+                f"Warning: Reference sphere fit stopped at the radius bound L = {fit.L:g} mm; "
+                f"the front is flatter than this sphere or inverted (residual RMS {fit.residual_rms:.1f} fs)"
+            )
+        return fit.reference_parameters
 
     def compensate_phase(self, reference_pulse: SRSI, method: str) -> None:
         """Compensate phase using reference pulse."""
-        from scipy.interpolate import interp1d
-
-        # Interpolate reference phase to current frequency axis
-        phase_interp = interp1d(
-            reference_pulse.omega_axis, reference_pulse.phase.squeeze(), fill_value=0, bounds_error=False, kind=method
-        )
-        phase_reference = phase_interp(self.omega_axis)
+        # Reference phase on the current frequency axis (cached by the SRSI instance)
+        phase_reference = reference_pulse.phase_on(self.omega_axis, method, self.dtype)
 
-        # Apply compensation
-        self.phase = self.phase_diff.copy()
-        self.phase[self.row, self.col, :] = np.angle(np.exp(1j * (self.phase[self.row, self.col, :] + phase_reference)))
+        # Apply compensation as a broadcast over the packed fibers, wrapped in place
+        phase = np.add(self.phase_diff_packed, phase_reference, out=np.empty_like(self.phase_diff_packed))
+        self.phase_packed = wrap_phase(phase, out=phase)
 
     @property
-    def Et(self) -> npt.NDArray[np.complex128]:
-        """Electric field in time domain."""
-        phase = self.phase.copy()
+    def Et_packed(self) -> npt.NDArray[np.complex128]:
+        """Electric field in time domain for each fiber, shape (n_fibers, n_fft)."""
+        phase = self.phase_packed.copy()
         phase[np.isnan(phase)] = 0
-        Et = self.iFt(np.sqrt(self.Sw_unknown) * np.exp(-1j * phase), self.n_omega, self.n_fft)
+        Et = self.iFt(np.sqrt(self.Sw_unknown_packed) * np.exp(-1j * phase), self.n_omega, self.n_fft)
         Et[np.isnan(Et)] = 0
         return Et
 
+    @property
+    def Et(self) -> npt.NDArray[np.complex128]:
+        """Electric field in time domain."""
+        return to_dense(self.Et_packed, self.row, self.col, self.shape, fill_value=0)
+
     def save_data_to_file(self, folder_path: str | Path, **kwargs) -> None:
         """Save data to files."""
         writer = DataWriter()
@@ -478,6 +685,8 @@ class SIFAST(PulseBase):
 
     def plot_scatter(self, values: npt.NDArray[np.float64], scene_model=None, backend: str = "mayavi") -> None:
         """Plot 3D scatter visualization."""
+        from ..visualization.plotting import SIFASTVisualizer
+
         visualizer = SIFASTVisualizer(self, backend=backend)
         visualizer.plot_scatter(values, scene_model)
 
@@ -493,6 +702,8 @@ class SIFAST(PulseBase):
         **kwargs,
     ) -> None:
         """Plot 3D isosurface visualization."""
+        from ..visualization.plotting import SIFASTVisualizer
+
         visualizer = SIFASTVisualizer(self, backend=backend)
         visualizer.plot_isosurface(t_min, t_max, frequency_scale, isovalue, indexing, scene_model, **kwargs)
 
@@ -51,27 +51,108 @@ class SpatialScanner:
         if len(pulses) < 2:
             raise ValueError("Need at least 2 pulses to merge")
 
-        # Step 1: Collect all spatial points
+        # Collect all spatial points and set up the merged grid
         all_x, all_y = self._collect_all_points(pulses)
+        self.begin(all_x, all_y, pulses[0].n_omega)
 
-        # Step 2: Create merged spatial arrays
-        x_merged, y_merged, x_matrix, y_matrix = self._create_merged_arrays(all_x, all_y)
+        # Merge pulses one by one, the first one being the phase reference
+        for pulse in pulses:
+            self.add(pulse, calibration_index, calibration_point)
 
-        # Step 3: Create and fill merged data arrays using vectorized operations
-        merged_data = self._create_and_fill_merged_arrays(pulses, x_matrix, y_matrix, pulses[0].n_omega)
+        return self.finish()
 
-        # Step 4: Update row and col indices for valid measurements
-        row_merged, col_merged = self._get_valid_indices(merged_data["time_interval"])
+    def begin(self, all_x: np.ndarray, all_y: np.ndarray, n_omega: int) -> None:
+        """
+        Start an incremental merge on the grid spanned by the given coordinates.
 
-        # Step 5: Merge phase with spatial calibration
-        phase_merged = self._merge_phase_with_calibration(
-            pulses, x_matrix, y_matrix, merged_data["Sw_unknown"], calibration_index, calibration_point
-        )
+        Parameters
+        ----------
+        all_x, all_y : array_like
+            All x and y coordinates of the positions that will be merged
+        n_omega : int
+            Number of frequency points
+        """
+        x_merged, y_merged, x_matrix, y_matrix = self._create_merged_arrays(np.unique(all_x), np.unique(all_y))
+        ny, nx = x_matrix.shape
+
+        self._x_merged = x_merged
+        self._y_merged = y_merged
+        self._x_matrix = x_matrix
+        self._y_matrix = y_matrix
+        self._n_omega = n_omega
+        self._merged_data = {
+            "time_interval": np.full((ny, nx), np.nan),
+            "pulse_front": np.full((ny, nx), np.nan),
+        }
+        # Per-fiber blocks of each pulse, combined in finish()
+        self._blocks = []
+        # Merged phase at the center frequency, used for calibration
+        self._phase_center = np.full((ny, nx), np.nan)
+        self._pulse_ref = None
+        self._phase_ref = None
+        self._n_added = 0
+
+    def add(
+        self,
+        pulse: "SIFAST",
+        calibration_index: tuple[int, int] | None = None,
+        calibration_point: tuple[float, float] | None = None,
+    ) -> None:
+        """
+        Add one pulse to the merge started with :meth:`begin`.
+
+        The first pulse added is used as the phase reference.
+
+        Parameters
+        ----------
+        pulse : SIFAST
+            SIFAST instance measured at one scan position
+        calibration_index : Tuple[int, int], optional
+            (row, col) index in the pulse for phase calibration
+        calibration_point : Tuple[float, float], optional
+            (x, y) spatial position for phase calibration
+        """
+        if not hasattr(self, "_merged_data"):
+            raise RuntimeError("begin() must be called before adding pulses")
+
+        self._fill_merged_arrays(pulse)
+        self._merge_phase_with_calibration(pulse, calibration_index, calibration_point)
+        self._n_added += 1
+
+    def finish(self) -> "SIFAST":
+        """
+        Finish the incremental merge and build the merged instance.
+
+        Returns
+        -------
+        SIFAST
+            Merged SIFAST instance
+        """
+        if getattr(self, "_pulse_ref", None) is None:
+            raise RuntimeError("No pulses have been added to the merge")
+
+        # Combine fiber blocks, later pulses win where fibers coincide
+        flat_all = np.concatenate([block["flat"] for block in self._blocks])
+        _, last_reversed = np.unique(flat_all[::-1], return_index=True)
+        keep = flat_all.size - 1 - last_reversed
+        row_merged, col_merged = np.unravel_index(flat_all[keep], self._x_matrix.shape)
+
+        merged_data = dict(self._merged_data)
+        merged_data["Sw_unknown"] = np.concatenate([block["Sw_unknown"] for block in self._blocks])[keep]
+        phase_merged = np.concatenate([block["phase"] for block in self._blocks])[keep]
 
-        # Step 6: Create merged SIFAST instance
         merged_pulse = self._create_merged_instance(
-            pulses[0], x_merged, y_merged, x_matrix, y_matrix, row_merged, col_merged, merged_data, phase_merged
+            self._pulse_ref,
+            self._x_merged,
+            self._y_merged,
+            self._x_matrix,
+            self._y_matrix,
+            row_merged,
+            col_merged,
+            merged_data,
+            phase_merged,
         )
+        merged_pulse.params["n_scan_positions"] = self._n_added
 
         return merged_pulse
 
@@ -103,159 +184,90 @@ class SpatialScanner:
 
         return x_merged, y_merged, x_matrix, y_matrix
 
-    def _create_and_fill_merged_arrays(
-        self, pulses: list["SIFAST"], x_matrix: np.ndarray, y_matrix: np.ndarray, n_omega: int
-    ) -> dict:
-        """Create and fill merged data arrays using fully vectorized operations."""
-        ny, nx = x_matrix.shape
-
-        # Initialize arrays
-        merged_data = {
-            "Sw_unknown": np.full((ny, nx, n_omega), np.nan),
-            "time_interval": np.full((ny, nx), np.nan),
-            "pulse_front": np.full((ny, nx), np.nan),
-        }
-
-        # Fully vectorized filling from each pulse
-        for pulse in pulses:
-            # Get flat indices for the pulse data
-            pulse_shape = pulse.x_matrix.shape
-            flat_indices = np.arange(pulse.x_matrix.size)
-            row_indices, col_indices = np.unravel_index(flat_indices, pulse_shape)
-
-            # Get coordinates
-            x_pulse = pulse.x_matrix[row_indices, col_indices]
-            y_pulse = pulse.y_matrix[row_indices, col_indices]
-
-            # Find indices in merged array
-            x_indices = np.searchsorted(x_matrix[0, :], x_pulse)
-            y_indices = np.searchsorted(y_matrix[:, 0], y_pulse)
-
-            # Direct assignment without loops
-            merged_data["Sw_unknown"][y_indices, x_indices, :] = pulse.Sw_unknown[row_indices, col_indices, :]
-            merged_data["time_interval"][y_indices, x_indices] = pulse.time_interval[row_indices, col_indices]
-            merged_data["pulse_front"][y_indices, x_indices] = pulse.pulse_front[row_indices, col_indices]
+    def _merged_indices(self, pulse: "SIFAST") -> tuple[np.ndarray, np.ndarray]:
+        """Get the indices of the pulse fibers in the merged grid."""
+        x_indices = np.searchsorted(self._x_merged, pulse.x_axis[pulse.col])
+        y_indices = np.searchsorted(self._y_merged, pulse.y_axis[pulse.row])
+        return y_indices, x_indices
 
-        return merged_data
+    def _fill_merged_arrays(self, pulse: "SIFAST") -> None:
+        """Fill merged maps from the fibers of one pulse."""
+        y_indices, x_indices = self._merged_indices(pulse)
 
-    def _get_valid_indices(self, time_interval: np.ndarray) -> tuple[list[int], list[int]]:
-        """Get row and col indices for valid (non-NaN) measurements."""
-        valid_indices = np.where(~np.isnan(time_interval))
-        return list(valid_indices[0]), list(valid_indices[1])
+        merged_data = self._merged_data
+        merged_data["time_interval"][y_indices, x_indices] = pulse.time_interval[pulse.row, pulse.col]
+        merged_data["pulse_front"][y_indices, x_indices] = pulse.pulse_front[pulse.row, pulse.col]
 
     def _merge_phase_with_calibration(
         self,
-        pulses: list["SIFAST"],
-        x_matrix: np.ndarray,
-        y_matrix: np.ndarray,
-        Sw_unknown_merged: np.ndarray,
+        pulse: "SIFAST",
         calibration_index: tuple[int, int] | None,
         calibration_point: tuple[float, float] | None,
-    ) -> np.ndarray:
-        """Merge phase arrays with spatial interpolation calibration."""
-        ny, nx, n_omega = Sw_unknown_merged.shape
-        phase_merged = np.full((ny, nx, n_omega), np.nan)
-        center_freq_idx = n_omega // 2
-
-        # Process first pulse as reference
-        pulse_ref = pulses[0]
-        phase_ref = self._prepare_phase(pulse_ref.phase, pulse_ref.Sw_unknown)
-
-        # Fully vectorized copy of reference phase
-        pulse_shape = pulse_ref.x_matrix.shape
-        flat_indices = np.arange(pulse_ref.x_matrix.size)
-        row_indices, col_indices = np.unravel_index(flat_indices, pulse_shape)
-
-        x_pulse = pulse_ref.x_matrix[row_indices, col_indices]
-        y_pulse = pulse_ref.y_matrix[row_indices, col_indices]
-
-        x_indices = np.searchsorted(x_matrix[0, :], x_pulse)
-        y_indices = np.searchsorted(y_matrix[:, 0], y_pulse)
-
-        phase_merged[y_indices, x_indices, :] = phase_ref[row_indices, col_indices, :]
-
-        # Process remaining pulses with calibration
-        for pulse_idx, pulse_offset in enumerate(pulses[1:], 1):
-            phase_offset = self._prepare_phase(pulse_offset.phase, pulse_offset.Sw_unknown)
-
-            # Determine calibration position for this pulse_offset
+    ) -> None:
+        """Merge the phase of one pulse with spatial interpolation calibration."""
+        center_freq_idx = self._n_omega // 2
+        y_indices, x_indices = self._merged_indices(pulse)
+        phase = self._prepare_phase(pulse.phase_packed, pulse.Sw_unknown_packed)
+
+        if self._pulse_ref is None:
+            # First pulse is used as reference
+            self._pulse_ref = pulse
+            self._phase_ref = phase
+        else:
+            # Determine calibration position for this pulse
             if calibration_index is not None:
-                # Use specified index from pulse_offset
+                # Use specified index from pulse
                 r0, c0 = calibration_index
-                calib_x = pulse_offset.x_matrix[r0, c0]
-                calib_y = pulse_offset.y_matrix[r0, c0]
+                calib_x = pulse.x_matrix[r0, c0]
+                calib_y = pulse.y_matrix[r0, c0]
             elif calibration_point is not None:
                 # Use specified spatial point
                 calib_x, calib_y = calibration_point
-                ix_closest = np.argmin(np.abs(pulse_offset.x_axis - calib_x))
-                iy_closest = np.argmin(np.abs(pulse_offset.y_axis - calib_y))
-                calib_x = pulse_offset.x_axis[ix_closest]
-                calib_y = pulse_offset.y_axis[iy_closest]
+                ix_closest = np.argmin(np.abs(pulse.x_axis - calib_x))
+                iy_closest = np.argmin(np.abs(pulse.y_axis - calib_y))
+                calib_x = pulse.x_axis[ix_closest]
+                calib_y = pulse.y_axis[iy_closest]
             else:
-                # Use center of pulse_offset
-                calib_x = pulse_offset.x_axis[pulse_offset.x_axis.size // 2]
-                calib_y = pulse_offset.y_axis[pulse_offset.y_axis.size // 2]
-
-            # Find phase offset using spatial interpolation
-            offset = self._calculate_phase_offset_interpolated(
-                pulse_ref,
-                phase_ref,
-                phase_merged,
-                pulse_offset,
-                phase_offset,
-                calib_x,
-                calib_y,
-                center_freq_idx,
-                x_matrix,
-                y_matrix,
-            )
-
-            # Fully vectorized application of offset and copy to merged array
-            pulse_shape = pulse_offset.x_matrix.shape
-            flat_indices = np.arange(pulse_offset.x_matrix.size)
-            row_indices, col_indices = np.unravel_index(flat_indices, pulse_shape)
-
-            x_pulse = pulse_offset.x_matrix[row_indices, col_indices]
-            y_pulse = pulse_offset.y_matrix[row_indices, col_indices]
-
-            x_indices = np.searchsorted(x_matrix[0, :], x_pulse)
-            y_indices = np.searchsorted(y_matrix[:, 0], y_pulse)
-
-            # Apply offset to all points and copy
-            phase_merged[y_indices, x_indices, :] = phase_offset[row_indices, col_indices, :] + offset
-
-        return phase_merged
+                # Use center of pulse
+                calib_x = pulse.x_axis[pulse.x_axis.size // 2]
+                calib_y = pulse.y_axis[pulse.y_axis.size // 2]
+
+            # Find phase offset using spatial interpolation and apply it
+            offset = self._calculate_phase_offset_interpolated(pulse, phase, calib_x, calib_y, center_freq_idx)
+            phase = phase + float(offset)
+
+        self._blocks.append(
+            {
+                "flat": np.ravel_multi_index((y_indices, x_indices), self._x_matrix.shape),
+                "Sw_unknown": pulse.Sw_unknown_packed,
+                "phase": phase,
+            }
+        )
+        self._phase_center[y_indices, x_indices] = phase[:, center_freq_idx]
 
     def _prepare_phase(self, phase: np.ndarray, intensity: np.ndarray) -> np.ndarray:
-        """Prepare phase array with optional 2D unwrapping."""
+        """Prepare per-fiber phase with optional unwrapping across fibers."""
         phase_prep = phase.copy()
 
         if self.unwrap_before_merge:
             from skimage.restoration import unwrap_phase
 
-            # Apply 2D unwrapping for each frequency
-            for freq_idx in range(phase.shape[2]):
+            # Apply unwrapping for each frequency
+            for freq_idx in range(phase.shape[1]):
                 # Only unwrap where we have valid intensity
-                mask = ~np.isnan(intensity[:, :, freq_idx]) & (intensity[:, :, freq_idx] > 0)
+                mask = ~np.isnan(intensity[:, freq_idx]) & (intensity[:, freq_idx] > 0)
                 if np.any(mask):
-                    phase_slice = phase_prep[:, :, freq_idx]
-                    phase_slice[mask] = unwrap_phase(phase_slice[mask].astype(np.float32))
-                    phase_prep[:, :, freq_idx] = phase_slice
+                    phase_prep[mask, freq_idx] = unwrap_phase(phase_prep[mask, freq_idx].astype(np.float32))
 
         return phase_prep
 
     def _calculate_phase_offset_interpolated(
         self,
-        pulse_ref: "SIFAST",
-        phase_ref: np.ndarray,
-        phase_merged: np.ndarray,
         pulse_offset: "SIFAST",
         phase_offset: np.ndarray,
         calib_x: float,
         calib_y: float,
         freq_idx: int,
-        x_matrix: np.ndarray,
-        y_matrix: np.ndarray,
     ) -> float:
         """
         Calculate phase offset using spatial interpolation.
@@ -263,78 +275,69 @@ class SpatialScanner:
         Uses k-nearest neighbors in the already merged data to estimate the phase
         at the calibration point, then calculates offset for the new pulse.
         """
-        # Get phase value from pulse_offset at calibration position
-        # Find nearest point in pulse_offset to calibration position
-        distances = np.sqrt((pulse_offset.x_matrix - calib_x) ** 2 + (pulse_offset.y_matrix - calib_y) ** 2)
-        min_idx = np.unravel_index(np.argmin(distances), distances.shape)
-        phase_offset_at_calib = phase_offset[min_idx[0], min_idx[1], freq_idx]
+        # Get phase value from pulse_offset at the fiber nearest to the calibration position
+        x_fibers = pulse_offset.x_axis[pulse_offset.col]
+        y_fibers = pulse_offset.y_axis[pulse_offset.row]
+        distances = np.hypot(x_fibers - calib_x, y_fibers - calib_y)
+        distances[np.isnan(phase_offset[:, freq_idx])] = np.inf
+        if not np.isfinite(np.min(distances, initial=np.inf)):
+            return 0.0
+        phase_offset_at_calib = phase_offset[np.argmin(distances), freq_idx]
 
         # Find k nearest neighbors in merged data to estimate phase at calibration point
-        valid_mask = ~np.isnan(phase_merged[:, :, freq_idx])
+        valid_mask = ~np.isnan(self._phase_center)
         if not np.any(valid_mask):
             # No valid points in merged data yet, use reference pulse
-            return self._calculate_from_reference_only(
-                pulse_ref, phase_ref, calib_x, calib_y, freq_idx, phase_offset_at_calib
-            )
+            return self._calculate_from_reference_only(calib_x, calib_y, freq_idx, phase_offset_at_calib)
 
         # Get valid points from merged data
-        valid_indices = np.where(valid_mask)
-        x_valid = x_matrix[valid_indices]
-        y_valid = y_matrix[valid_indices]
-        phase_valid = phase_merged[valid_indices[0], valid_indices[1], freq_idx]
-
-        # Find k nearest neighbors
-        points = np.column_stack([x_valid, y_valid])
-        tree = cKDTree(points)
-        k = min(self.n_neighbors, len(points))
-        distances, indices = tree.query([calib_x, calib_y], k=k)
-
-        if isinstance(distances, float):  # Only one point
-            distances = np.array([distances])
-            indices = np.array([indices])
-
-        # Calculate weighted average phase at calibration point
-        weights = 1 / (distances + 1e-10)
-        weights = weights / np.sum(weights)
-        phase_merged_at_calib = np.sum(phase_valid[indices] * weights)
+        phase_merged_at_calib = self._interpolate_nearest(
+            self._x_matrix[valid_mask], self._y_matrix[valid_mask], self._phase_center[valid_mask], calib_x, calib_y
+        )
 
         # Calculate offset
         return phase_merged_at_calib - phase_offset_at_calib
 
     def _calculate_from_reference_only(
         self,
-        pulse_ref: "SIFAST",
-        phase_ref: np.ndarray,
         calib_x: float,
         calib_y: float,
         freq_idx: int,
         phase_offset_at_calib: float,
     ) -> float:
         """Fallback calculation using only reference pulse."""
-        valid_mask = ~np.isnan(pulse_ref.time_interval)
+        pulse_ref = self._pulse_ref
+        valid_mask = ~np.isnan(pulse_ref.time_interval[pulse_ref.row, pulse_ref.col])
         if not np.any(valid_mask):
             return 0.0
 
-        x_valid = pulse_ref.x_matrix[valid_mask]
-        y_valid = pulse_ref.y_matrix[valid_mask]
-        phase_valid = phase_ref[valid_mask, freq_idx]
+        phase_ref_at_calib = self._interpolate_nearest(
+            pulse_ref.x_axis[pulse_ref.col][valid_mask],
+            pulse_ref.y_axis[pulse_ref.row][valid_mask],
+            self._phase_ref[valid_mask, freq_idx],
+            calib_x,
+            calib_y,
+        )
 
-        # Find nearest neighbors
+        return phase_ref_at_calib - phase_offset_at_calib
+
+    def _interpolate_nearest(
+        self, x_valid: np.ndarray, y_valid: np.ndarray, values: np.ndarray, x: float, y: float
+    ) -> float:
+        """Inverse-distance weighted average of the k nearest neighbors."""
         points = np.column_stack([x_valid, y_valid])
         tree = cKDTree(points)
         k = min(self.n_neighbors, len(points))
-        distances, indices = tree.query([calib_x, calib_y], k=k)
+        distances, indices = tree.query([x, y], k=k)
 
-        if isinstance(distances, float):
+        if isinstance(distances, float):  # Only one point
             distances = np.array([distances])
             indices = np.array([indices])
 
-        # Weighted average
+        # Calculate weighted average
         weights = 1 / (distances + 1e-10)
         weights = weights / np.sum(weights)
-        phase_ref_at_calib = np.sum(phase_valid[indices] * weights)
-
-        return phase_ref_at_calib - phase_offset_at_calib
+        return np.sum(values[indices] * weights)
 
     def _create_merged_instance(
         self,
@@ -343,12 +346,12 @@ class SpatialScanner:
         y_axis: np.ndarray,
         x_matrix: np.ndarray,
         y_matrix: np.ndarray,
-        row: list[int],
-        col: list[int],
+        row: np.ndarray,
+        col: np.ndarray,
         merged_data: dict,
         phase: np.ndarray,
     ) -> "SIFAST":
-        """Create merged SIFAST instance."""
+        """Create merged SIFAST instance from per-fiber data."""
         # Create new instance by copying reference
         merged = type(reference_pulse).__new__(type(reference_pulse))
 
@@ -360,6 +363,7 @@ class SpatialScanner:
             "wavelength_axis",
             "omega_axis",
             "t_axis",
+            "dtype",
             "wavelength",
             "rp",
             "SPEED_OF_LIGHT",
@@ -380,16 +384,11 @@ class SpatialScanner:
         merged.row = row
         merged.col = col
 
-        # Set data arrays
-        merged.Sw_unknown = merged_data["Sw_unknown"]
+        # Set data arrays, only cells measured by a fiber are stored
+        merged.Sw_unknown_packed = merged_data["Sw_unknown"]
+        merged.phase_packed = phase
         merged.time_interval = merged_data["time_interval"]
         merged.pulse_front = merged_data["pulse_front"]
-        merged.phase = phase
-
-        # Set other required attributes with NaN
-        merged.Sw_interference = np.full_like(merged.Sw_unknown, np.nan)
-        merged.phase_diff_with_sphere = np.full_like(merged.phase, np.nan)
-        merged.phase_diff = np.full_like(merged.phase, np.nan)
         merged.pulse_front_reference = np.full_like(merged.pulse_front, np.nan)
 
         # Update params to reflect merging
@@ -5,9 +5,11 @@ from typing import Any
 
 import numpy as np
 import numpy.typing as npt
+from scipy.interpolate import interp1d
 
 from ..core.pulse import PulseBase
 from ..io.readers import SpectrumReader
+from ..utils.math import unwrap_phase
 
 
 class SRSI(PulseBase):
@@ -20,9 +22,11 @@ class SRSI(PulseBase):
         wavelength_center: float,
         wavelength_width: float,
         n_omega: int,
-        n_fft: int,
+        n_fft: int | str,
         n_iteration: int,
         method: str = "linear",
+        dtype: str = "float64",
+        time_resolution: float = 2.0,
     ):
         """
         Initialize SRSI processor.
@@ -39,12 +43,16 @@ class SRSI(PulseBase):
             Wavelength range (nm)
         n_omega : int
             Number of frequency points
-        n_fft : int
-            FFT size
+        n_fft : int or str
+            FFT size, or 'auto' for the smallest size meeting ``time_resolution``
         n_iteration : int
             Number of phase retrieval iterations
         method : str
             Interpolation method
+        dtype : str
+            Working precision ('float64' or 'float32')
+        time_resolution : float
+            Largest time step (fs) when ``n_fft`` is 'auto'
         """
         super().__init__()
 
@@ -55,6 +63,12 @@ class SRSI(PulseBase):
         if method not in ["linear", "slinear", "quadratic", "cubic"]:
             raise ValueError(f"Invalid interpolation method: {method}")
 
+        if dtype not in ["float64", "float32"]:
+            raise ValueError(f"Invalid dtype: {dtype}")
+
+        if n_fft != "auto" and not isinstance(n_fft, int | np.integer):
+            raise ValueError("n_fft must be an integer or 'auto'")
+
         # Store parameters
         self.params = {
             "folder_path": str(folder_path),
@@ -65,14 +79,18 @@ class SRSI(PulseBase):
             "n_fft": n_fft,
             "n_iteration": n_iteration,
             "method": method,
+            "dtype": dtype,
+            "time_resolution": time_resolution,
         }
 
         # Initialize
+        self.dtype = np.dtype(dtype)
         self.omega_center = 2 * np.pi * self.SPEED_OF_LIGHT / wavelength_center
         self.n_omega = n_omega
         self.n_fft = n_fft
         self.row = [0]
         self.col = [0]
+        self._phase_on_cache: dict[tuple[Any, ...], npt.NDArray[np.float64]] = {}
 
         # Read and process data
         self._process_data(folder_path, mode_acquire, wavelength_center, wavelength_width, method, n_iteration)
@@ -111,8 +129,15 @@ class SRSI(PulseBase):
         # Ensure non-negative
         self.Sw_unknown[self.Sw_unknown < 0] = 0
 
+        # In auto mode, keep twice the spectral range so the cubic nonlinearity does not alias
+        interpolate_peak = self.n_fft == "auto"
+        if interpolate_peak:
+            self.n_fft = self.auto_n_fft(self.params["time_resolution"], n_min=2 * self.n_omega)
+
         # Perform FTSI
-        self.phase_diff, self.delay, Su = self.fourier_transform_spectral_interferometry(self.n_omega, self.n_fft)
+        self.phase_diff, self.delay, Su = self.fourier_transform_spectral_interferometry(
+            self.n_omega, self.n_fft, interpolate_peak=interpolate_peak
+        )
 
         if mode_acquire == "single":
             self.Sw_unknown = Su
@@ -122,7 +147,7 @@ class SRSI(PulseBase):
 
     def _retrieve_phase(self, n_iteration: int) -> None:
         """Iterative phase retrieval."""
-        phase = np.unwrap(self.phase_diff, axis=2)
+        phase = unwrap_phase(self.phase_diff, axis=2)
         phase = phase - phase[:, :, self.n_omega // 2]
 
         phase_diff_history = []
@@ -137,7 +162,7 @@ class SRSI(PulseBase):
             Ew_reference = self.Ft(Et_reference, self.n_omega, self.n_fft)
 
             # Extract phase
-            phase_reference = np.unwrap(-np.angle(Ew_reference), axis=2)
+            phase_reference = unwrap_phase(-np.angle(Ew_reference), axis=2)
             phase_reference = phase_reference - phase_reference[:, :, self.n_omega // 2]
 
             # Store difference
@@ -148,6 +173,49 @@ class SRSI(PulseBase):
 
         self.phase_diff_between_iteration = np.array(phase_diff_history).squeeze()
         self.phase = phase
+        self._phase_on_cache.clear()
+
+    def phase_on(
+        self, omega_axis: npt.NDArray[np.float64], method: str = "linear", dtype: str | np.dtype | None = None
+    ) -> npt.NDArray[np.float64]:
+        """
+        Retrieved phase interpolated onto another frequency axis.
+
+        Results are cached per axis, method and dtype, so applying one
+        reference to many measurements interpolates only once. The returned
+        array is read-only.
+
+        Parameters
+        ----------
+        omega_axis : array_like
+            Target angular frequency axis (rad/fs)
+        method : str
+            Interpolation method
+        dtype : str or dtype, optional
+            Output precision, defaults to the working precision
+
+        Returns
+        -------
+        array_like
+            Phase on ``omega_axis``, zero outside the measured range
+        """
+        dtype = np.dtype(dtype or self.dtype)
+        omega_axis = np.ascontiguousarray(omega_axis, dtype=np.float64)
+        key = (omega_axis.tobytes(), method, dtype.str)
+
+        # Looked up once, as pulses processed in parallel threads share the cache
+        phase = self._phase_on_cache.get(key)
+        if phase is None:
+            phase_interp = interp1d(
+                self.omega_axis, self.phase.squeeze(), fill_value=0, bounds_error=False, kind=method
+            )
+            phase = phase_interp(omega_axis).astype(dtype)
+            phase.setflags(write=False)
+            if len(self._phase_on_cache) >= 16:
+                self._phase_on_cache.pop(next(iter(self._phase_on_cache), None), None)
+            self._phase_on_cache[key] = phase
+
+        return phase
 
     @property
     def Et(self) -> npt.NDArray[np.complex128]:
@@ -0,0 +1,159 @@
+"""Dependency graph of cached processing stages."""
+
+import copy
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import PurePath
+from typing import Any
+
+# Parameter values compared by value, all others (arrays, pulses) by identity
+_PLAIN_TYPES = (str, int, float, complex, bool, type(None), PurePath)
+
+
+def same_value(a: Any, b: Any) -> bool:
+    """Whether two parameter values are equal."""
+    if a is b:
+        return True
+    return isinstance(a, _PLAIN_TYPES) and isinstance(b, _PLAIN_TYPES) and bool(a == b)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Processing stage with explicit inputs."""
+
+    name: str
+    params: tuple[str, ...]  # parameters the stage reads
+    depends: tuple[str, ...] = ()  # stages whose outputs the stage reads
+    cache_size: int = 4  # results kept for earlier inputs, 1 keeps only the current one
+
+
+@dataclass
+class StageResult:
+    """Outputs of one run of a stage and the inputs they were computed from."""
+
+    params: dict[str, Any]
+    upstream: tuple[int, ...]  # versions of the results of the upstream stages
+    version: int
+    outputs: dict[str, Any] = field(default_factory=dict)
+
+
+class StageGraph:
+    """
+    Runs stages on an object and caches their outputs.
+
+    The outputs of a stage are the attributes of the object it sets. A stage
+    is rerun only when one of its parameters or an upstream result changed;
+    results for earlier inputs are restored from the cache instead of being
+    recomputed, so switching a parameter back costs nothing.
+    """
+
+    def __init__(self, stages: Iterable[Stage], untracked: Iterable[str] = ()):
+        """
+        Initialize stage graph.
+
+        Parameters
+        ----------
+        stages : iterable of Stage
+            Stages in topological order, each after the stages it depends on
+        untracked : iterable of str
+            Attributes never recorded as stage outputs
+        """
+        self.stages = list(stages)
+        self.untracked = set(untracked)
+
+        seen = set()
+        for stage in self.stages:
+            missing = set(stage.depends) - seen
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on later or unknown stages: {', '.join(missing)}")
+            seen.add(stage.name)
+
+        self.results: dict[str, list[StageResult]] = {stage.name: [] for stage in self.stages}
+        self.current: dict[str, StageResult] = {}
+        self._owned: dict[str, set[str]] = {stage.name: set() for stage in self.stages}
+        self._next_version = 0
+
+    def copy(self) -> "StageGraph":
+        """Graph sharing the cached results, for a copy of the object the stages ran on."""
+        graph = copy.copy(self)
+        graph.results = {name: list(results) for name, results in self.results.items()}
+        graph.current = dict(self.current)
+        graph._owned = {name: set(owned) for name, owned in self._owned.items()}
+        return graph
+
+    def run(
+        self,
+        obj: Any,
+        params: dict[str, Any],
+        execute: Callable[[Stage, dict[str, Any]], None],
+        check: Callable[[], None] | None = None,
+    ) -> list[str]:
+        """
+        Bring the outputs of every stage up to date with the parameters.
+
+        Parameters
+        ----------
+        obj : object
+            Object the stages write their outputs to
+        params : dict
+            Parameters, missing ones are passed as None
+        execute : callable
+            Runs a stage with its parameters
+        check : callable, optional
+            Called before each rerun stage, raises to abandon the run
+
+        Returns
+        -------
+        list[str]
+            Stages that were rerun, not counting those restored from the cache
+        """
+        rerun = []
+        for stage in self.stages:
+            stage_params = {k: params.get(k) for k in stage.params}
+            upstream = tuple(self.current[name].version for name in stage.depends)
+
+            result = self._lookup(stage, stage_params, upstream)
+            if result is not None:
+                if result is not self.current.get(stage.name):
+                    # Attributes a stage set only for other inputs are removed
+                    for name in self._owned[stage.name] - result.outputs.keys():
+                        vars(obj).pop(name, None)
+                    vars(obj).update(result.outputs)
+                    self.current[stage.name] = result
+                continue
+
+            if check is not None:
+                check()
+            # Outputs of an earlier run that no other stage sets are removed, so none are left over
+            shared = set().union(*(owned for name, owned in self._owned.items() if name != stage.name))
+            for name in self._owned[stage.name] - shared:
+                vars(obj).pop(name, None)
+            # Holding the previous values keeps their ids from being reused
+            before = dict(vars(obj))
+            try:
+                execute(stage, stage_params)
+            except BaseException:
+                # The outputs are partly replaced, a later run must not take them as current
+                self.current.pop(stage.name, None)
+                raise
+
+            # Attributes the stage set, and those it set on earlier runs even when unchanged now
+            owned = self._owned[stage.name]
+            owned.update(k for k, v in vars(obj).items() if k not in before or before[k] is not v)
+            owned -= self.untracked
+            outputs = {k: v for k, v in vars(obj).items() if k in owned}
+            del before
+
+            result = StageResult(stage_params, upstream, self._next_version, outputs)
+            self._next_version += 1
+            self.results[stage.name] = [result, *self.results[stage.name]][: stage.cache_size]
+            self.current[stage.name] = result
+            rerun.append(stage.name)
+        return rerun
+
+    def _lookup(self, stage: Stage, params: dict[str, Any], upstream: tuple[int, ...]) -> StageResult | None:
+        """Cached result of a stage for the given inputs."""
+        for result in self.results[stage.name]:
+            if result.upstream == upstream and all(same_value(result.params[k], v) for k, v in params.items()):
+                return result
+        return None
@@ -0,0 +1,181 @@
+"""Parameter sweeps over one SIFAST measurement."""
+
+import copy
+import itertools
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .calibration import fit_reference_sphere
+from .sifast import SIFAST
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def sweep_metrics(pulse: SIFAST) -> dict[str, Any]:
+    """
+    Quality metrics of a processed pulse.
+
+    Parameters
+    ----------
+    pulse : SIFAST
+        Processed pulse
+
+    Returns
+    -------
+    dict
+        Number of fibers with signal, mean, spread and range of their delays
+        (fs), and the residual (fs), outliers and convergence of a reference
+        sphere fit to the delays
+    """
+    row, col = pulse.row, pulse.col
+    delays = pulse.time_interval[row, col]
+    valid = np.isfinite(delays)
+    metrics = {
+        "n_fibers": len(row),
+        "n_delays": int(np.sum(valid)),
+        "delay_mean_fs": np.mean(delays[valid]) if valid.any() else np.nan,
+        "delay_spread_fs": np.std(delays[valid]) if valid.any() else np.nan,
+        "delay_range_fs": np.ptp(delays[valid]) if valid.any() else np.nan,
+        "residual_rms_fs": np.nan,
+        "n_outliers": 0,
+        "converged": False,
+    }
+
+    # A calibration run has already fitted the sphere
+    fit = getattr(pulse, "reference_fit", None)
+    if fit is None and np.sum(valid) >= 4:
+        fit = fit_reference_sphere(pulse.x_matrix[row, col], pulse.y_matrix[row, col], delays, loss="huber")
+    if fit is not None:
+        metrics.update(residual_rms_fs=fit.residual_rms, n_outliers=fit.n_outliers, converged=fit.converged)
+    return metrics
+
+
+def _stage_order(parameter: str) -> int:
+    """Index of the first stage reading a parameter."""
+    for index, stage in enumerate(SIFAST.STAGES):
+        if parameter in stage.params:
+            return index
+    raise ValueError(f"Cannot sweep '{parameter}', it is not a processing parameter")
+
+
+def _sweep_points(
+    base: SIFAST,
+    points: list[dict[str, Any]],
+    metrics: Callable[[SIFAST], dict[str, Any]],
+    on_done: Callable[[], None],
+) -> list[dict[str, Any]]:
+    """Process consecutive grid points on a copy of the base pulse (runs in a worker thread)."""
+    # The copies share the raw data and the stage outputs of the base pulse
+    pulse = copy.copy(base)
+    rows = []
+    for point in points:
+        start = time.perf_counter()
+        try:
+            stages = pulse.update(**point)
+            row = {**point, **metrics(pulse), "n_stages": len(stages), "error": None}
+        except Exception as e:
+            row = {**point, "n_stages": 0, "error": f"{type(e).__name__}: {e}"}
+        row["time_ms"] = 1e3 * (time.perf_counter() - start)
+        rows.append(row)
+        on_done()
+    return rows
+
+
+def sweep_parameters(
+    grid: dict[str, Sequence[Any]],
+    pulse: SIFAST | None = None,
+    metrics: Callable[[SIFAST], dict[str, Any]] = sweep_metrics,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+    progress_callback: Callable[[int], None] | None = None,
+    **sifast_kwargs,
+) -> "pd.DataFrame":
+    """
+    Process one measurement for every combination of parameter values.
+
+    The measurement is read once and each grid point is processed with
+    ``SIFAST.update``, which reruns only the stages downstream of the
+    changed parameters. Points are ordered so that the parameters of the
+    earliest stages change least often, e.g. the spectra are resampled once
+    per ``wavelength_width`` while ``delay_min`` varies, and split into
+    contiguous blocks processed in parallel threads.
+
+    Parameters
+    ----------
+    grid : dict
+        Values of each swept parameter, e.g. ``{"delay_min": [500, 1000]}``
+    pulse : SIFAST, optional
+        Processed measurement to start from, built from ``sifast_kwargs`` if not given
+    metrics : callable
+        Quality metrics of a processed grid point
+    max_workers : int, optional
+        Number of threads (defaults to the CPU count, capped at the number of points)
+    executor : Executor, optional
+        Thread pool to use instead of a new one
+    progress_callback : callable, optional
+        Called with the progress in percent (0-100)
+    **sifast_kwargs
+        Arguments for :class:`SIFAST` when no pulse is given
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per grid point in the order of ``grid``: the parameter values,
+        the metrics, the number of rerun stages, the processing time (ms) and
+        the error of a failed point (None otherwise)
+    """
+    import pandas as pd
+
+    # Grid points as value indices, processed with the parameters of early stages varying slowest
+    keys = list(grid)
+    combinations = list(itertools.product(*(range(len(grid[k])) for k in keys)))
+    if not combinations:
+        raise ValueError("Parameter grid is empty")
+    slowest = sorted(range(len(keys)), key=lambda j: _stage_order(keys[j]))
+    order = sorted(range(len(combinations)), key=lambda i: [combinations[i][j] for j in slowest])
+    points = [{k: grid[k][index] for k, index in zip(keys, combinations[i], strict=True)} for i in order]
+
+    if pulse is None:
+        pulse = SIFAST(**{**sifast_kwargs, **points[0], "record_history": False})
+    elif sifast_kwargs:
+        raise ValueError("SIFAST arguments cannot be given together with a pulse")
+
+    lock = threading.Lock()
+    n_done = 0
+
+    def report_progress() -> None:
+        nonlocal n_done
+        with lock:
+            n_done += 1
+            if progress_callback is not None:
+                progress_callback(int(100 * n_done / len(points)))
+
+    n_blocks = max_workers or min(len(points), os.cpu_count() or 1)
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=n_blocks)
+
+    try:
+        bounds = np.linspace(0, len(points), n_blocks + 1).astype(int)
+        futures = [
+            executor.submit(_sweep_points, pulse, points[start:stop], metrics, report_progress)
+            for start, stop in itertools.pairwise(bounds)
+            if stop > start
+        ]
+        rows = [row for future in futures for row in future.result()]
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+    # Back to the order of the grid
+    table = [None] * len(rows)
+    for i, row in zip(order, rows, strict=True):
+        table[i] = row
+    return pd.DataFrame(table)
@@ -3,6 +3,15 @@
 import numpy as np
 import numpy.typing as npt
 
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+_PHASE_BACKENDS = ["numpy", "numexpr", "numba"]
+_phase_backend = "numexpr" if numexpr is not None else "numpy"
+_numba_wrap = None
+
 
 def rescale(x: npt.NDArray[np.float64], new_min: float = 0, new_max: float = 1) -> npt.NDArray[np.float64]:
     """
@@ -30,3 +39,236 @@ def rescale(x: npt.NDArray[np.float64], new_min: float = 0, new_max: float = 1)
         return np.full_like(x, new_min)
 
     return (x - old_min) / (old_max - old_min) * (new_max - new_min) + new_min
+
+
+def set_phase_backend(backend: str) -> None:
+    """
+    Select the implementation used by :func:`wrap_phase`.
+
+    Parameters
+    ----------
+    backend : str
+        'numpy', 'numexpr' (multi-threaded, default if installed) or 'numba'
+        (compiled on first use)
+    """
+    global _phase_backend
+    if backend not in _PHASE_BACKENDS:
+        raise ValueError(f"Invalid phase backend: {backend}. Must be one of {_PHASE_BACKENDS}")
+    if backend == "numexpr" and numexpr is None:
+        raise ImportError("numexpr is not installed")
+    if backend == "numba":
+        _get_numba_wrap()
+    _phase_backend = backend
+
+
+def _get_numba_wrap():
+    """Compile the numba wrap kernel on first use."""
+    global _numba_wrap
+    if _numba_wrap is None:
+        import numba
+
+        @numba.njit(parallel=True, cache=True)
+        def kernel(x, out):
+            for i in numba.prange(x.size):
+                value = x[i] + np.pi
+                out[i] = value - 2 * np.pi * np.floor(value / (2 * np.pi)) - np.pi
+
+        _numba_wrap = kernel
+    return _numba_wrap
+
+
+def wrap_phase(
+    phase: npt.NDArray[np.floating], out: npt.NDArray[np.floating] | None = None
+) -> npt.NDArray[np.floating]:
+    """
+    Wrap phase to [-pi, pi) with a real modulo.
+
+    Equivalent to ``np.angle(np.exp(1j * phase))`` up to the sign at exactly
+    +-pi, without complex temporaries. Pass ``out=phase`` to wrap in place.
+
+    Parameters
+    ----------
+    phase : array_like
+        Phase (rad)
+    out : array_like, optional
+        Output buffer, may be ``phase`` itself
+
+    Returns
+    -------
+    array_like
+        Wrapped phase
+    """
+    phase = np.asarray(phase)
+    if out is None:
+        out = np.empty_like(phase, dtype=np.result_type(phase, np.float32))
+
+    if _phase_backend == "numexpr":
+        # numexpr's float modulo may follow the sign of the dividend, so fold negatives explicitly
+        numexpr.evaluate(
+            "where((phase + pi) % tau < 0, (phase + pi) % tau + pi, (phase + pi) % tau - pi)",
+            local_dict={"phase": phase, "pi": np.pi, "tau": 2 * np.pi},
+            out=out,
+            casting="same_kind",
+        )
+    elif _phase_backend == "numba" and phase.flags.c_contiguous and out.flags.c_contiguous:
+        _get_numba_wrap()(phase.reshape(-1), out.reshape(-1))
+    else:
+        np.add(phase, np.pi, out=out)
+        np.mod(out, 2 * np.pi, out=out)
+        out -= np.pi
+
+    return out
+
+
+def unwrap_phase(
+    phase: npt.NDArray[np.floating], axis: int = -1, out: npt.NDArray[np.floating] | None = None
+) -> npt.NDArray[np.floating]:
+    """
+    Unwrap phase along an axis, same result as ``np.unwrap``.
+
+    Only one buffer for the phase steps is allocated; the correction is
+    accumulated into ``out`` in place. Pass ``out=phase`` to unwrap in place.
+
+    Parameters
+    ----------
+    phase : array_like
+        Wrapped phase (rad)
+    axis : int
+        Axis along which to unwrap
+    out : array_like, optional
+        Output buffer, may be ``phase`` itself
+
+    Returns
+    -------
+    array_like
+        Unwrapped phase
+    """
+    phase = np.asarray(phase)
+    if out is None:
+        out = phase.astype(np.result_type(phase, np.float32), copy=True)
+    elif out is not phase:
+        out[...] = phase
+
+    # Phase steps and their wrapped values
+    steps = np.diff(phase, axis=axis)
+    correction = wrap_phase(steps)
+    correction[(correction == -np.pi) & (steps > 0)] = np.pi
+    correction -= steps
+    correction[np.abs(steps) < np.pi] = 0
+
+    # Accumulate the correction into everything after the first sample
+    np.cumsum(correction, axis=axis, out=correction)
+    tail = [slice(None)] * out.ndim
+    tail[axis] = slice(1, None)
+    out[tuple(tail)] += correction
+
+    return out
+
+
+def fft_size(n_min: int, even: bool = True) -> int:
+    """
+    Smallest 5-smooth FFT length (2^a 3^b 5^c) not below ``n_min``.
+
+    Parameters
+    ----------
+    n_min : int
+        Minimum length
+    even : bool
+        Only consider even lengths (a >= 1)
+
+    Returns
+    -------
+    int
+        FFT length
+    """
+    n_min = max(int(n_min), 2 if even else 1)
+    best = None
+    power_5 = 1
+    while power_5 < 2 * n_min:
+        length = power_5
+        while length < 2 * n_min:
+            # Smallest power-of-two multiple reaching n_min
+            candidate = length * (2 if even else 1)
+            while candidate < n_min:
+                candidate *= 2
+            if best is None or candidate < best:
+                best = candidate
+            length *= 3
+        power_5 *= 5
+    return best
+
+
+def select_n_fft(n_omega: int, omega_step: float, time_resolution: float, n_min: int | None = None) -> int:
+    """
+    Smallest FFT length giving a time axis at least as fine as requested.
+
+    Zero-padding ``n_omega`` spectral points with spacing ``omega_step`` to
+    ``n_fft`` gives a time step of ``2 pi / (n_fft omega_step)`` on the FFT
+    sample axis of ``time_domain_signal``, and of ``2 pi / ((n_fft - 1)
+    omega_step)`` on the historical axis; the length is chosen for the
+    coarser of the two. The time range itself does not depend on ``n_fft``.
+    The length is 5-smooth and has the parity of ``n_omega`` so the spectrum
+    stays centered.
+
+    Parameters
+    ----------
+    n_omega : int
+        Number of frequency points
+    omega_step : float
+        Frequency axis spacing (rad/fs)
+    time_resolution : float
+        Largest acceptable time step (fs)
+    n_min : int, optional
+        Lower bound on the length, defaults to ``n_omega``
+
+    Returns
+    -------
+    int
+        FFT length
+    """
+    if time_resolution <= 0:
+        raise ValueError("time_resolution must be positive")
+
+    n_required = int(np.ceil(2 * np.pi / (abs(omega_step) * time_resolution))) + 1
+    n_required = max(n_required, n_omega, n_min or 0)
+    if n_omega % 2 == 0:
+        return fft_size(n_required, even=True)
+
+    # Odd spectra need an odd length, i.e. a = 0
+    n_fft = fft_size(n_required, even=False)
+    while n_fft % 2 == 0:
+        n_fft = fft_size(n_fft + 1, even=False)
+    return n_fft
+
+
+def interpolate_peaks(
+    samples: npt.NDArray[np.float64],
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Sub-sample position and height of peaks from three samples around each maximum.
+
+    A parabola is fitted to the logarithm of the samples, which is exact for
+    Gaussian peaks. Where a sample is not positive the parabola is fitted to
+    the samples themselves.
+
+    Parameters
+    ----------
+    samples : array_like
+        Magnitudes of shape (..., 3), the maximum in the middle
+
+    Returns
+    -------
+    offset : array_like
+        Peak positions in samples from the middle, within [-0.5, 0.5]
+    height : array_like
+        Interpolated peak values
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    positive = np.all(samples > 0, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(positive[..., np.newaxis], np.log(np.where(samples > 0, samples, 1)), samples)
+        left, middle, right = values[..., 0], values[..., 1], values[..., 2]
+        curvature = left - 2 * middle + right
+        offset = np.clip(np.where(curvature < 0, 0.5 * (left - right) / curvature, 0.0), -0.5, 0.5)
+    height = middle - 0.25 * (left - right) * offset
+    return offset, np.where(positive, np.exp(height), height)
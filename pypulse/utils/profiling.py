@@ -0,0 +1,170 @@
+"""Per-stage wall time, CPU time and memory instrumentation."""
+
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import numpy as np
+
+# tracemalloc and its peak are global to the process, so stages of concurrent
+# profilers (threads) share them: tracing runs while any traced stage runs, and
+# only a stage that ran alone gets a peak
+_trace_lock = threading.Lock()
+_trace_state = {"active": 0, "entries": 0, "started": False}
+
+
+@dataclass
+class StageTiming:
+    """Cost of one processing stage."""
+
+    stage: str
+    wall_time: float  # s
+    cpu_time: float  # s
+    peak_memory: int | None = None  # bytes allocated above the stage start, None untraced or overlapped
+    arrays: dict[str, list[int]] = field(default_factory=dict)  # shapes of the arrays the stage created
+    array_bytes: int = 0  # total size of these arrays
+    error: str | None = None  # exception raised by the stage
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+def _array_attributes(obj: Any) -> dict[str, np.ndarray]:
+    """Array attributes of an object."""
+    return {k: v for k, v in vars(obj).items() if isinstance(v, np.ndarray)}
+
+
+def _format_bytes(n_bytes: int | None) -> str:
+    """Human readable byte count."""
+    if n_bytes is None:
+        return "-"
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(n_bytes) < 1024:
+            return f"{n_bytes:.0f} {unit}" if unit == "B" else f"{n_bytes:.1f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} GiB"
+
+
+class StageProfiler:
+    """
+    Records the cost of named processing stages.
+
+    Each stage records its wall and CPU time, the peak memory allocated
+    while it ran (with ``tracemalloc``) and the shapes of the array
+    attributes it created or replaced on the profiled object. Stages are
+    recorded even when they raise, so a failed run shows where it stopped.
+    The peak memory of a stage that overlapped another traced stage, e.g. in
+    another thread, cannot be told apart and is recorded as None.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        """
+        Initialize profiler.
+
+        Parameters
+        ----------
+        trace_memory : bool
+            Record the peak allocation of each stage. Tracing slows down
+            allocation-heavy code, so timings are slightly pessimistic.
+        """
+        self.trace_memory = trace_memory
+        self.timings: list[StageTiming] = []
+
+    @contextmanager
+    def stage(self, name: str, obj: Any = None) -> Iterator[None]:
+        """
+        Profile the enclosed block as a stage.
+
+        Parameters
+        ----------
+        name : str
+            Stage name
+        obj : object, optional
+            Object whose new array attributes are recorded
+        """
+        before = {k: id(v) for k, v in _array_attributes(obj).items()} if obj is not None else {}
+
+        if self.trace_memory:
+            with _trace_lock:
+                alone = _trace_state["active"] == 0
+                if alone:
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start()
+                        _trace_state["started"] = True
+                    # The peak is only reset when no other stage is measuring it
+                    tracemalloc.reset_peak()
+                _trace_state["active"] += 1
+                _trace_state["entries"] += 1
+                entry = _trace_state["entries"]
+                start_memory = tracemalloc.get_traced_memory()[0]
+
+        error = None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+            peak_memory = None
+            if self.trace_memory:
+                with _trace_lock:
+                    if alone and _trace_state["entries"] == entry:
+                        peak_memory = max(tracemalloc.get_traced_memory()[1] - start_memory, 0)
+                    _trace_state["active"] -= 1
+                    if _trace_state["active"] == 0 and _trace_state["started"]:
+                        tracemalloc.stop()
+                        _trace_state["started"] = False
+
+            arrays = {}
+            if obj is not None:
+                arrays = {k: v for k, v in _array_attributes(obj).items() if before.get(k) != id(v)}
+
+            self.timings.append(
+                StageTiming(
+                    name,
+                    wall_time,
+                    cpu_time,
+                    peak_memory,
+                    {k: list(v.shape) for k, v in arrays.items()},
+                    sum(v.nbytes for v in arrays.values()),
+                    error,
+                )
+            )
+
+
+def format_timings(timings: list[StageTiming]) -> str:
+    """
+    Format stage timings as a fixed-width table.
+
+    Parameters
+    ----------
+    timings : list[StageTiming]
+        Recorded stages
+
+    Returns
+    -------
+    str
+        One line per stage and a total
+    """
+    lines = [f"{'stage':<20}{'wall ms':>10}{'cpu ms':>10}{'peak mem':>12}{'arrays':>12}"]
+    for t in timings:
+        line = (
+            f"{t.stage:<20}{1e3 * t.wall_time:>10.1f}{1e3 * t.cpu_time:>10.1f}"
+            f"{_format_bytes(t.peak_memory):>12}{_format_bytes(t.array_bytes):>12}"
+        )
+        if t.error is not None:
+            line += f"  failed: {t.error}"
+        lines.append(line)
+
+    wall = sum(t.wall_time for t in timings)
+    cpu = sum(t.cpu_time for t in timings)
+    lines.append(f"{'total':<20}{1e3 * wall:>10.1f}{1e3 * cpu:>10.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,355 @@
+"""Isosurface triangle meshes of the spatiotemporal field."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from ..core.packed import to_dense
+
+
+@dataclass
+class IsosurfaceMesh:
+    """Triangle mesh in physical coordinates."""
+
+    vertices: npt.NDArray[np.float64]  # (n_vertices, 3) x (mm), y (mm), t (fs)
+    faces: npt.NDArray[np.int32]  # (n_faces, 3) vertex indices
+
+    @property
+    def x(self) -> npt.NDArray[np.float64]:
+        return self.vertices[:, 0]
+
+    @property
+    def y(self) -> npt.NDArray[np.float64]:
+        return self.vertices[:, 1]
+
+    @property
+    def z(self) -> npt.NDArray[np.float64]:
+        return self.vertices[:, 2]
+
+    @property
+    def n_faces(self) -> int:
+        return len(self.faces)
+
+    def to_plotly(self) -> dict[str, npt.NDArray]:
+        """Vertex and face arrays of a plotly ``Mesh3d`` trace."""
+        i, j, k = self.faces.T
+        return {"x": self.x, "y": self.y, "z": self.z, "i": i, "j": j, "k": k}
+
+
+@dataclass
+class VolumeLevel:
+    """Volume on a (ny, nx, nt) grid, one level of a level-of-detail pyramid."""
+
+    values: npt.NDArray[np.float64]
+    x_axis: npt.NDArray[np.float64]
+    y_axis: npt.NDArray[np.float64]
+    t_axis: npt.NDArray[np.float64]
+
+    def downsample(self, min_axis_size: int) -> "VolumeLevel | None":
+        """
+        Keep every second sample along the axes longer than ``2 * min_axis_size``.
+
+        Parameters
+        ----------
+        min_axis_size : int
+            Shorter axes are kept whole
+
+        Returns
+        -------
+        VolumeLevel or None
+            Coarser level, None if no axis is long enough
+        """
+        steps = [2 if n >= 2 * min_axis_size else 1 for n in self.values.shape]
+        if steps == [1, 1, 1]:
+            return None
+        step_y, step_x, step_t = steps
+        return VolumeLevel(
+            self.values[::step_y, ::step_x, ::step_t],
+            self.x_axis[::step_x],
+            self.y_axis[::step_y],
+            self.t_axis[::step_t],
+        )
+
+
+def decimate_mesh(
+    vertices: npt.NDArray[np.float64], faces: npt.NDArray[np.int32], max_faces: int
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int32]]:
+    """
+    Reduce a triangle mesh by vertex clustering.
+
+    The bounding box is divided into cells and the vertices of each cell are
+    merged at their mean, dropping the triangles that collapse. Cells are
+    enlarged until the mesh has at most ``max_faces`` triangles.
+
+    Parameters
+    ----------
+    vertices : ndarray
+        Vertex coordinates, shape (n_vertices, 3)
+    faces : ndarray
+        Vertex indices of the triangles, shape (n_faces, 3)
+    max_faces : int
+        Maximum number of triangles
+
+    Returns
+    -------
+    tuple
+        Decimated vertices and faces
+    """
+    if len(faces) <= max_faces:
+        return vertices, faces
+
+    # Each axis is normalized to the box, the time axis has other units
+    low = vertices.min(axis=0)
+    extent = np.ptp(vertices, axis=0)
+    extent[extent == 0] = 1
+    normalized = (vertices - low) / extent
+
+    resolution = max(int(np.sqrt(max_faces / 4)), 2)
+    while True:
+        cells = np.minimum(normalized * resolution, resolution - 1).astype(np.int64)
+        cell_index = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+        _, cluster, counts = np.unique(cell_index, return_inverse=True, return_counts=True)
+        merged = np.column_stack([np.bincount(cluster, weights=vertices[:, k]) for k in range(3)])
+        merged /= counts[:, np.newaxis]
+
+        new_faces = cluster[faces]
+        collapsed = (
+            (new_faces[:, 0] == new_faces[:, 1])
+            | (new_faces[:, 1] == new_faces[:, 2])
+            | (new_faces[:, 0] == new_faces[:, 2])
+        )
+        new_faces = new_faces[~collapsed]
+        # Two triangles collapsing onto the same vertices are kept once
+        n = np.int64(len(counts))
+        ordered = np.sort(new_faces, axis=1)
+        _, unique = np.unique((ordered[:, 0] * n + ordered[:, 1]) * n + ordered[:, 2], return_index=True)
+        new_faces = new_faces[np.sort(unique)]
+
+        if len(new_faces) <= max_faces or resolution <= 2:
+            break
+        resolution = max(int(resolution * np.sqrt(max_faces / len(new_faces)) * 0.95), 2)
+
+    # Drop the vertices no triangle uses
+    used, new_faces = np.unique(new_faces, return_inverse=True)
+    return merged[used], new_faces.reshape(-1, 3).astype(np.int32)
+
+
+class IsosurfaceMeshEngine:
+    """
+    Extracts and caches isosurface meshes of a SIFAST field.
+
+    The time-domain field is evaluated once. The level-of-detail pyramid of
+    the last time range and frequency scale is kept, so changing only the
+    isovalue costs one marching-cubes pass per level, and meshes are cached
+    per ``(t_min, t_max, frequency_scale, isovalue)`` and level. A coarse
+    level gives a quick preview of large merged scans while the full
+    resolution mesh is extracted. Methods may be called from several threads.
+    """
+
+    def __init__(
+        self,
+        sifast_instance,
+        max_faces: int = 100_000,
+        cache_size: int = 32,
+        preview_size: int = 32**3,
+        min_axis_size: int = 8,
+    ):
+        """
+        Initialize mesh engine.
+
+        Parameters
+        ----------
+        sifast_instance : SIFAST
+            Processed pulse
+        max_faces : int
+            Meshes with more triangles are decimated
+        cache_size : int
+            Number of cached meshes
+        preview_size : int
+            Maximum number of voxels of the coarsest pyramid level
+        min_axis_size : int
+            Axes are no longer subsampled below this length
+        """
+        self.sifast = sifast_instance
+        self.max_faces = max_faces
+        self.cache_size = cache_size
+        self.preview_size = preview_size
+        self.min_axis_size = min_axis_size
+
+        self._field = None
+        self._amplitude_range = None
+        self._pyramid_key = None
+        self._pyramid = None
+        self._meshes: OrderedDict[tuple[float, float, float, float, int], IsosurfaceMesh] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def field(self) -> npt.NDArray[np.complex128]:
+        """Time-domain field of each fiber, shape (n_fibers, n_fft)."""
+        with self._lock:
+            if self._field is None:
+                self._field = self.sifast.Et_packed
+                # Rescaling uses the whole grid, cells without a fiber have zero field
+                amplitude = np.abs(self._field)
+                low = 0.0 if len(self._field) < np.prod(self.sifast.shape) else amplitude.min()
+                self._amplitude_range = (low, amplitude.max())
+            return self._field
+
+    def _volume(self, t_min: float, t_max: float, frequency_scale: float) -> VolumeLevel:
+        """Full resolution volume of a time range."""
+        field = self.field
+        t_axis = self.sifast.t_axis
+        t_mask = (t_axis > t_min) & (t_axis < t_max)
+        window = field[:, t_mask]
+        low, high = self._amplitude_range
+        if frequency_scale != 0:
+            phase = frequency_scale * (t_axis[t_mask] * self.sifast.omega_center + np.angle(window))
+            values = (np.abs(window) - low) / (high - low) * np.cos(phase) if high > low else np.zeros(window.shape)
+        else:
+            values = (np.abs(window) ** 2 - low**2) / (high**2 - low**2) if high > low else np.zeros(window.shape)
+        # Only a grid with empty cells has a fill value, and then low is zero
+        values = to_dense(values, self.sifast.row, self.sifast.col, self.sifast.shape, fill_value=0)
+        return VolumeLevel(values, self.sifast.x_axis, self.sifast.y_axis, t_axis[t_mask])
+
+    def pyramid(self, t_min: float, t_max: float, frequency_scale: float) -> list[VolumeLevel]:
+        """
+        Level-of-detail pyramid of the volume of a time range.
+
+        Level 0 is the full resolution volume. Each further level keeps every
+        second sample along the axes longer than ``2 * min_axis_size``, down to
+        a level of at most ``preview_size`` voxels. The pyramid of the last
+        time range and frequency scale is kept, so isovalue changes reuse it.
+
+        Parameters
+        ----------
+        t_min, t_max : float
+            Time range
+        frequency_scale : float
+            Frequency scaling factor
+
+        Returns
+        -------
+        list[VolumeLevel]
+            Volumes from the finest to the coarsest
+        """
+        key = (t_min, t_max, frequency_scale)
+        with self._lock:
+            if self._pyramid_key == key:
+                return self._pyramid
+
+        levels = [self._volume(t_min, t_max, frequency_scale)]
+        while levels[-1].values.size > self.preview_size:
+            # Subsampling rather than averaging keeps the carrier of frequency-scaled volumes
+            coarse = levels[-1].downsample(self.min_axis_size)
+            if coarse is None:
+                break
+            levels.append(coarse)
+
+        with self._lock:
+            self._pyramid_key, self._pyramid = key, levels
+        return levels
+
+    def volume(
+        self, t_min: float, t_max: float, frequency_scale: float
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        Rescaled field on the (ny, nx, nt) grid of a time range.
+
+        The values are the intensity rescaled to [0, 1] or, with a frequency
+        scale, the rescaled amplitude times the cosine of the scaled phase.
+
+        Parameters
+        ----------
+        t_min, t_max : float
+            Time range
+        frequency_scale : float
+            Frequency scaling factor
+
+        Returns
+        -------
+        tuple
+            Volume and its time axis
+        """
+        volume = self.pyramid(t_min, t_max, frequency_scale)[0]
+        return volume.values, volume.t_axis
+
+    def has_mesh(self, t_min: float, t_max: float, frequency_scale: float, isovalue: float, level: int = 0) -> bool:
+        """Whether the mesh of a pyramid level is cached."""
+        with self._lock:
+            return (t_min, t_max, frequency_scale, isovalue, level) in self._meshes
+
+    def mesh(
+        self,
+        t_min: float,
+        t_max: float,
+        frequency_scale: float,
+        isovalue: float,
+        level: int = 0,
+        check: Callable[[], None] | None = None,
+    ) -> IsosurfaceMesh:
+        """
+        Isosurface mesh, from the cache when available.
+
+        Parameters
+        ----------
+        t_min, t_max : float
+            Time range
+        frequency_scale : float
+            Frequency scaling factor
+        isovalue : float
+            Isosurface value
+        level : int
+            Pyramid level, 0 for full resolution and -1 for the coarsest
+        check : callable, optional
+            Called between the stages, raises to abandon the extraction
+
+        Returns
+        -------
+        IsosurfaceMesh
+            Mesh with at most ``max_faces`` triangles, empty if the isovalue
+            is outside the values of the volume
+        """
+        if level >= 0 and self.has_mesh(t_min, t_max, frequency_scale, isovalue, level):
+            key = (t_min, t_max, frequency_scale, isovalue, level)
+            with self._lock:
+                self._meshes.move_to_end(key)
+                return self._meshes[key]
+
+        levels = self.pyramid(t_min, t_max, frequency_scale)
+        level = range(len(levels))[level]
+        key = (t_min, t_max, frequency_scale, isovalue, level)
+        with self._lock:
+            if key in self._meshes:
+                self._meshes.move_to_end(key)
+                return self._meshes[key]
+        if check is not None:
+            check()
+
+        volume = levels[level]
+        values = volume.values
+        mesh = IsosurfaceMesh(np.empty((0, 3)), np.empty((0, 3), dtype=np.int32))
+        if min(values.shape) >= 2 and np.nanmin(values) < isovalue < np.nanmax(values):
+            from skimage.measure import marching_cubes
+
+            vertices, faces, _, _ = marching_cubes(np.nan_to_num(values), level=isovalue)
+            if check is not None:
+                check()
+
+            # Vertices are in fractional grid indices of (y, x, t)
+            vertices = np.column_stack(
+                [
+                    np.interp(vertices[:, column], np.arange(len(axis)), axis)
+                    for column, axis in [(1, volume.x_axis), (0, volume.y_axis), (2, volume.t_axis)]
+                ]
+            )
+            mesh = IsosurfaceMesh(*decimate_mesh(vertices, faces.astype(np.int32), self.max_faces))
+
+        with self._lock:
+            self._meshes[key] = mesh
+            while len(self._meshes) > self.cache_size:
+                self._meshes.popitem(last=False)
+        return mesh
@@ -1,30 +1,39 @@
 """Visualization utilities for SIFAST data."""
 
+import importlib
+import importlib.util
 from typing import Any
 
 import numpy as np
 import numpy.typing as npt
-import plotly.io as pio
-from matplotlib import colors
 
-from ..utils.math import rescale
+from .mesh import IsosurfaceMesh, IsosurfaceMeshEngine
 
-# Check for Mayavi availability
-try:
-    import mayavi.core.ui.api
-    import mayavi.mlab
+# Backend packages, imported when a plot is requested as Mayavi loads VTK and Qt
+_BACKEND_MODULES = {"MAYAVI_AVAILABLE": "mayavi", "PLOTLY_AVAILABLE": "plotly"}
 
-    MAYAVI_AVAILABLE = True
-except ImportError:
-    MAYAVI_AVAILABLE = False
 
-# Check for Plotly availability
-try:
-    import plotly.graph_objects as go
+def __getattr__(name: str) -> bool:
+    """Whether a backend is installed, checked without importing it."""
+    if name in _BACKEND_MODULES:
+        return importlib.util.find_spec(_BACKEND_MODULES[name]) is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+
+def _mlab():
+    """The ``mayavi.mlab`` module."""
+    try:
+        return importlib.import_module("mayavi.mlab")
+    except ImportError as e:
+        raise ImportError("Mayavi is required for 3D plotting with the 'mayavi' backend.") from e
+
+
+def _graph_objects():
+    """The ``plotly.graph_objects`` module."""
+    try:
+        return importlib.import_module("plotly.graph_objects")
+    except ImportError as e:
+        raise ImportError("Plotly is required for 3D plotting with the 'plotly' backend.") from e
 
 
 class SIFASTVisualizer:
@@ -44,12 +53,14 @@ class SIFASTVisualizer:
         """
         self.sifast = sifast_instance
         self.backend = backend.lower()
+        # Meshes are cached across plot_isosurface calls
+        self.mesh_engine = IsosurfaceMeshEngine(sifast_instance)
 
-        if self.backend == "mayavi" and not MAYAVI_AVAILABLE:
+        if self.backend == "mayavi" and importlib.util.find_spec("mayavi") is None:
             raise ImportError(
                 "Mayavi is selected as backend, but it's not installed. Please install Mayavi to use this backend."
             )
-        if self.backend == "plotly" and not PLOTLY_AVAILABLE:
+        if self.backend == "plotly" and importlib.util.find_spec("plotly") is None:
             raise ImportError(
                 "Plotly is selected as backend, but it's not installed. Please install Plotly to use this backend."
             )
@@ -62,12 +73,11 @@ class SIFASTVisualizer:
         scene_model: Any | None = None,
     ) -> None:
         """Create 3D scatter plot using Mayavi."""
-        if not MAYAVI_AVAILABLE:
-            raise ImportError("Mayavi is required for 3D plotting with the 'mayavi' backend.")
+        mlab = _mlab()
         # Set up Mayavi
         if scene_model is None:
-            fig = mayavi.mlab.figure(bgcolor=(1, 1, 1), fgcolor=(0, 0, 0))
-            active_mlab = mayavi.mlab
+            fig = mlab.figure(bgcolor=(1, 1, 1), fgcolor=(0, 0, 0))
+            active_mlab = mlab
             target_scene = fig
         else:
             active_mlab = scene_model.mlab
@@ -115,7 +125,7 @@ class SIFASTVisualizer:
             target_scene.scene.reset_zoom()
 
         if scene_model is None:
-            mayavi.mlab.show()
+            mlab.show()
 
     def _plot_scatter_plotly(
         self,
@@ -123,8 +133,7 @@ class SIFASTVisualizer:
         scene_model: Any | None = None,
     ) -> None:
         """Create 3D scatter plot using Plotly."""
-        if not PLOTLY_AVAILABLE:
-            raise ImportError("Plotly is required for 3D plotting with the 'plotly' backend.")
+        go = _graph_objects()
 
         x_flat = self.sifast.x_matrix.flatten()
         y_flat = self.sifast.y_matrix.flatten()
@@ -180,89 +189,39 @@ class SIFASTVisualizer:
         else:
             raise ValueError(f"Unsupported backend: {self.backend}")
 
-    def _prepare_isosurface_data(
-        self,
-        t_min: float,
-        t_max: float,
-        frequency_scale: float,
-        indexing: str,
-    ):
-        """Helper to prepare data for isosurface plotting."""
-        Et = self.sifast.Et
-        if indexing == "xy":
-            if self.backend == "mayavi":
-                Et = np.transpose(Et, (1, 0, 2))
-        elif indexing == "ij":
-            if self.backend == "plotly":
-                Et = np.transpose(Et, (1, 0, 2))
-
-        # Process data
-        if frequency_scale != 0:
-            values = np.real(
-                rescale(np.abs(Et))
-                * np.exp(
-                    1j * frequency_scale * self.sifast.t_axis[np.newaxis, np.newaxis, :] * self.sifast.omega_center
-                )
-                * np.exp(1j * frequency_scale * np.angle(Et))
-            )
-        else:
-            values = rescale(np.abs(Et) ** 2)
-
-        # Select time range
-        t_mask = (self.sifast.t_axis > t_min) & (self.sifast.t_axis < t_max)
-        values_plot = values[:, :, t_mask]
-        t_axis_plot = self.sifast.t_axis[t_mask]
-
-        return values_plot, t_axis_plot
-
     def _plot_isosurface_mayavi(
         self,
-        values_plot: npt.NDArray[np.float64],
-        t_axis_plot: npt.NDArray[np.float64],
-        isovalue: float,
+        mesh: IsosurfaceMesh,
         scene_model: Any | None = None,
         **kwargs,
     ) -> None:
-        """Create 3D isosurface plot using Mayavi."""
-        if not MAYAVI_AVAILABLE:
-            raise ImportError("Mayavi is required for 3D plotting with the 'mayavi' backend.")
+        """Render an isosurface mesh using Mayavi."""
+        mlab = _mlab()
 
         opacity = kwargs.pop("opacity", 1)
 
         if scene_model is None:
-            fig = mayavi.mlab.figure(bgcolor=(1, 1, 1), fgcolor=(0, 0, 0))
-            active_mlab = mayavi.mlab
+            fig = mlab.figure(bgcolor=(1, 1, 1), fgcolor=(0, 0, 0))
+            active_mlab = mlab
             target_scene = fig
         else:
             active_mlab = scene_model.mlab
             target_scene = scene_model.mayavi_scene
 
-        # Create meshgrid
-        x_plot, y_plot, z_plot = np.meshgrid(self.sifast.x_axis, self.sifast.y_axis, t_axis_plot, indexing="ij")
-
-        # Initial isosurface for scaling
-        iso_temp = active_mlab.contour3d(
-            x_plot, y_plot, z_plot, values_plot, contours=[isovalue], color=colors.to_rgb("lightblue"), opacity=0.5
-        )
-
-        # Get scaling
-        axes = active_mlab.axes(iso_temp)
-        axes_range = axes.axes.bounds
-        iso_temp.remove()
-        axes.remove()
-
+        # Scaling from the mesh bounds
+        axes_range = np.column_stack([mesh.vertices.min(axis=0), mesh.vertices.max(axis=0)]).ravel()
         x_range = axes_range[1] - axes_range[0]
         z_range = axes_range[5] - axes_range[4]
         zoom_factor = 1.618 if kwargs.get("zoom", None) is None else kwargs["zoom"]
         scale_factor_z = x_range / z_range * zoom_factor if z_range != 0 else 1.0
 
-        # Rescale z-axis
-        z_plot_scaled = t_axis_plot * scale_factor_z
-        x_plot, y_plot, z_plot = np.meshgrid(self.sifast.x_axis, self.sifast.y_axis, z_plot_scaled, indexing="ij")
-
-        # Final isosurface
-        isosurface = active_mlab.contour3d(
-            x_plot, y_plot, z_plot, values_plot, contours=[isovalue], color=colors.to_rgb("lightblue"), opacity=opacity
+        isosurface = active_mlab.triangular_mesh(
+            mesh.x,
+            mesh.y,
+            mesh.z * scale_factor_z,
+            mesh.faces,
+            color=(0.678, 0.847, 0.902),  # lightblue
+            opacity=opacity,
         )
 
         # Add outline and axes
@@ -282,38 +241,27 @@ class SIFASTVisualizer:
             target_scene.scene.reset_zoom()
 
         if scene_model is None:
-            mayavi.mlab.show()
+            mlab.show()
 
     def _plot_isosurface_plotly(
         self,
-        values_plot: npt.NDArray[np.float64],  # Should be (nx, ny, nt)
-        t_axis_plot: npt.NDArray[np.float64],
-        isovalue: float,
+        mesh: IsosurfaceMesh,
         scene_model: Any | None = None,
         **kwargs,
     ) -> None:
-        """Create 3D isosurface plot using Plotly."""
-        if not PLOTLY_AVAILABLE:
-            raise ImportError("Plotly is required for 3D plotting with the 'plotly' backend.")
+        """Render an isosurface mesh using Plotly."""
+        go = _graph_objects()
 
         opacity = kwargs.pop("opacity", 1)
 
-        x_plot, y_plot, z_plot = np.meshgrid(self.sifast.x_axis, self.sifast.y_axis, t_axis_plot)
-
         fig = go.Figure(
-            data=go.Isosurface(
-                x=x_plot.flatten(),
-                y=y_plot.flatten(),
-                z=z_plot.flatten(),
-                value=values_plot.flatten(),
-                isomin=isovalue,
-                isomax=isovalue,
-                surface_count=1,
+            data=go.Mesh3d(
+                **mesh.to_plotly(),
+                intensity=mesh.z,
                 opacity=opacity,
                 colorscale=kwargs.get("colorscale", "Viridis"),
                 showscale=True,  # Show color bar
-                colorbar=dict(title="Value"),
-                caps=dict(x_show=False, y_show=False, z_show=False),
+                colorbar=dict(title="t (fs)"),
             )
         )
 
@@ -357,19 +305,20 @@ class SIFASTVisualizer:
         isovalue : float
             Isosurface value
         indexing : str
-            Coordinate indexing ('xy' or 'ij'). 'xy' means input Et is (ny, nx, nt).
-            'ij' means input Et is (nx, ny, nt).
-            Internal processing assumes (nx, ny, nt).
+            Coordinate indexing ('xy' or 'ij'), kept for compatibility. The
+            mesh is extracted in physical coordinates, so both give the same plot.
         scene_model : optional
             Mayavi scene model (only used if backend is 'mayavi')
         **kwargs
             Additional options (e.g., opacity, color, colorscale, aspectratio for plotly)
         """
-        values_plot, t_axis_plot = self._prepare_isosurface_data(t_min, t_max, frequency_scale, indexing)
+        mesh = self.mesh_engine.mesh(t_min, t_max, frequency_scale, isovalue)
+        if mesh.n_faces == 0:
+            raise ValueError(f"Isovalue {isovalue} is outside the field values in the time range")
 
         if self.backend == "mayavi":
-            self._plot_isosurface_mayavi(values_plot, t_axis_plot, isovalue, scene_model, **kwargs)
+            self._plot_isosurface_mayavi(mesh, scene_model, **kwargs)
         elif self.backend == "plotly":
-            self._plot_isosurface_plotly(values_plot, t_axis_plot, isovalue, scene_model, **kwargs)
+            self._plot_isosurface_plotly(mesh, scene_model, **kwargs)
         else:
             raise ValueError(f"Unsupported backend: {self.backend}")
@@ -0,0 +1,74 @@
+"""Regression tests of the reference sphere fit."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from pypulse.fiber.registry import register_fiber_array
+from pypulse.processing.calibration import fit_reference_sphere, sphere_model
+from pypulse.processing.sifast import SIFAST
+
+ROOT = Path(__file__).resolve().parents[1]
+FIBER_ARRAY_ID = "Fiber_array_14x14_1.1"
+
+
+def _fiber_grid() -> tuple[np.ndarray, np.ndarray]:
+    axis = (np.arange(14) - 6.5) * 1.1
+    return np.meshgrid(axis, axis)
+
+
+def test_fit_recovers_sphere_with_outliers():
+    x, y = _fiber_grid()
+    rng = np.random.default_rng(0)
+    t = sphere_model(x, y, 1.0, -2.0, 500.0, 3000.0) + rng.normal(0, 0.5, x.shape)
+    t.flat[rng.choice(t.size, 8, replace=False)] += 500
+
+    fit = fit_reference_sphere(x, y, t, loss="huber")
+
+    assert fit.converged and fit.n_iterations <= 10 and not fit.at_bound
+    np.testing.assert_allclose([fit.x0, fit.y0, fit.L, fit.tau0], [1.0, -2.0, 500.0, 3000.0], atol=0.1, rtol=0.01)
+    assert fit.n_outliers >= 8
+
+
+def test_fit_of_inverted_front_converges_at_flattest_sphere():
+    x, y = _fiber_grid()
+    t = 3000.0 - 4.0 * (x**2 + y**2) + 5.0 * x
+
+    fit = fit_reference_sphere(x, y, t)
+
+    assert fit.converged and fit.at_bound and fit.L > 0
+    assert fit.reference_parameters == fit_reference_sphere(x, y, t, max_iterations=500).reference_parameters
+
+
+def test_calibration_measurement_converges():
+    # The delays of this folder are an almost flat, slightly inverted front, which the
+    # former unbounded least-squares fit matched with L = 41 km at a residual RMS of 143.6 fs
+    with open(ROOT / "config" / "fiber_array" / f"{FIBER_ARRAY_ID}.json") as f:
+        register_fiber_array(FIBER_ARRAY_ID, json.load(f), auto_save=False)
+    pulse = SIFAST(
+        folder_path=ROOT / "data" / "SIFAST" / "20241212" / "l=1" / "low resolution",
+        mode_input="read",
+        mode_acquire="triple",
+        gate_noise_intensity=200.0,
+        wavelength_center=793.0,
+        wavelength_width=100.0,
+        n_omega=2048,
+        n_fft=65536,
+        mode_fiber_position="calibration",
+        fiber_array_id=FIBER_ARRAY_ID,
+        delay_min=3000,
+        as_calibration=True,
+        record_history=False,
+    )
+    fit = pulse.reference_fit
+
+    assert fit.converged and fit.n_iterations < 20 and fit.at_bound
+    assert 0 < fit.L and fit.residual_rms <= 143.6
+    np.testing.assert_allclose([fit.x0, fit.y0, fit.tau0], [229.0, -193.8, 3018.0], atol=1.0)
+    # The result does not depend on where the iteration is cut off
+    row, col = pulse.row, pulse.col
+    refit = fit_reference_sphere(
+        pulse.x_matrix[row, col], pulse.y_matrix[row, col], pulse.time_interval[row, col], max_iterations=500
+    )
+    assert refit.reference_parameters == fit.reference_parameters
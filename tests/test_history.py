@@ -0,0 +1,72 @@
+"""Tests of the JSON Lines processing history."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pypulse.io.history import (
+    HISTORY_FILENAME,
+    INDEX_FILENAME,
+    MARKDOWN_FILENAME,
+    ProcessingHistory,
+    format_markdown_entry,
+)
+
+
+def _legacy_entry(entry_id: int, status: str = "SUCCESS") -> dict:
+    return {
+        "entry_id": entry_id,
+        "timestamp": "2024-12-12T10:00:00",
+        "status": status,
+        "message": "done" if status == "SUCCESS" else "Traceback: failed",
+        "params": {"n_fft": 65536, "delay_min": 3000.0 + entry_id},
+        "timings": None,
+    }
+
+
+def test_markdown_history_is_read_without_writing(tmp_path):
+    (tmp_path / MARKDOWN_FILENAME).write_text(
+        "".join(format_markdown_entry(_legacy_entry(k, status)) for k, status in [(1, "SUCCESS"), (3, "FAILURE")])
+    )
+    history = ProcessingHistory(tmp_path)
+
+    assert len(history) == 3
+    assert history.get(3)["status"] == "FAILURE" and history.get(3)["message"] == "Traceback: failed"
+    assert history.last("SUCCESS")["params"]["delay_min"] == 3001.0
+    assert [entry["entry_id"] for entry in history.entries(reverse=True)] == [3, 1]
+    assert not (tmp_path / HISTORY_FILENAME).exists() and not (tmp_path / INDEX_FILENAME).exists()
+
+    # The first append imports the Markdown entries
+    assert history.append("SUCCESS", {"n_fft": 4096}) == 4
+    assert [entry["entry_id"] for entry in history.entries()] == [1, 3, 4]
+    assert history.get(1) == {**_legacy_entry(1), "results": None}
+
+
+def test_interrupted_append_is_repaired(tmp_path):
+    history = ProcessingHistory(tmp_path)
+    for k in range(3):
+        history.append("SUCCESS", {"k": k})
+
+    # A crash after writing part of a line, before its index slot
+    with open(tmp_path / HISTORY_FILENAME, "ab") as f:
+        f.write(b'{"entry_id": 4, "status"')
+    assert history.append("FAILURE", {"k": 3}, "error") == 4
+
+    # A crash between the history line and its index slot
+    with open(tmp_path / INDEX_FILENAME, "r+b") as f:
+        f.truncate(3 * 8)
+    assert history.append("SUCCESS", {"k": 4}) == 5
+
+    assert [entry["params"]["k"] for entry in history.entries()] == [0, 1, 2, 3, 4]
+    assert history.get(4)["status"] == "FAILURE"
+    assert len((tmp_path / HISTORY_FILENAME).read_text().splitlines()) == 5
+
+
+def test_concurrent_appends_get_distinct_ids(tmp_path):
+    def append(k: int) -> int:
+        return ProcessingHistory(tmp_path).append("SUCCESS", {"k": k})
+
+    with ThreadPoolExecutor(8) as executor:
+        ids = list(executor.map(append, range(64)))
+
+    history = ProcessingHistory(tmp_path)
+    assert sorted(ids) == list(range(1, 65)) and len(history) == 64
+    assert all(history.get(entry_id)["params"]["k"] == k for k, entry_id in enumerate(ids))
@@ -0,0 +1,32 @@
+"""Tests of the live processing pipeline."""
+
+import numpy as np
+
+from pypulse.processing.live import FrameSource, LivePipeline
+
+
+class _FailingSource(FrameSource):
+    """Source whose camera fails on the first read."""
+
+    wavelength = np.linspace(740.0, 840.0, 16)
+    image_shape = (4, 16)
+
+    def read_into(self, buffers) -> bool:
+        raise OSError("camera disconnected")
+
+
+def test_acquisition_error_is_reported():
+    results = []
+    pipeline = LivePipeline(_FailingSource("triple"), result_callback=results.append).start()
+
+    try:
+        pipeline.join()
+    except OSError as e:
+        assert str(e) == "camera disconnected"
+    else:
+        raise AssertionError("join() did not re-raise the acquisition error")
+
+    assert len(results) == 1 and results[0].pulse is None and "camera disconnected" in results[0].error
+    assert pipeline.stats.frames_acquired == 0
+    assert pipeline.stats.acquisition_error == results[0].error
+    pipeline.stop()  # raised only once
@@ -0,0 +1,49 @@
+"""Tests of the scan position discovery."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from pypulse.io.history import ProcessingHistory
+from pypulse.processing.scan import SCAN_POSITIONS_FILE, discover_scan_positions
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _scan_folder(tmp_path: Path, logged_offsets: list[list[tuple[float, float]]]) -> Path:
+    for k, offsets in enumerate(logged_offsets):
+        folder = tmp_path / str(k)
+        folder.mkdir()
+        (folder / "inter.h5").touch()
+        for dx, dy in offsets:
+            ProcessingHistory(folder).append("SUCCESS", {"dx": dx, "dy": dy})
+    return tmp_path
+
+
+def test_offsets_are_taken_from_agreeing_runs(tmp_path):
+    positions = discover_scan_positions(_scan_folder(tmp_path, [[(0.0, 0.0)], [(0.5, 0.0), (0.5, 0.0)]]))
+
+    assert [(p.dx, p.dy) for p in positions] == [(0.0, 0.0), (0.5, 0.0)]
+
+
+def test_disagreeing_runs_need_positions_file(tmp_path):
+    # A later single measurement run with the default offsets
+    scan_folder = _scan_folder(tmp_path, [[(0.0, 0.0)], [(0.5, 0.0), (0.0, 0.0)]])
+
+    try:
+        discover_scan_positions(scan_folder)
+    except ValueError as e:
+        assert SCAN_POSITIONS_FILE in str(e)
+    else:
+        raise AssertionError("Ambiguous offsets were accepted")
+
+    (scan_folder / SCAN_POSITIONS_FILE).write_text(json.dumps({"1": [0.5, 0.0]}))
+    assert [(p.dx, p.dy) for p in discover_scan_positions(scan_folder)] == [(0.0, 0.0), (0.5, 0.0)]
+
+
+def test_bundled_scan_positions():
+    positions = discover_scan_positions(ROOT / "data" / "SIFAST" / "20241212" / "l=1" / "high resolution")
+
+    np.testing.assert_allclose([p.dy for p in positions], 0.11 * np.arange(10))
+    assert all(p.dx == 0 for p in positions)